@@ -1,8 +1,15 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from viewer.ui.main_window import MainWindow
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        # Headless scripted-orbit run: python main.py --benchmark model.fbx [--frames N ...]
+        from viewer.ui.benchmark import main as benchmark_main
+
+        sys.exit(benchmark_main(sys.argv[2:]))
+
+    from PyQt5.QtWidgets import QApplication
+    from viewer.ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
     mainWindow = MainWindow()
     mainWindow.show()
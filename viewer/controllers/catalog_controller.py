@@ -1,10 +1,17 @@
 import os
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-from viewer.services.catalog_db import get_favorite_paths, set_asset_favorite
+import numpy as np
+
+from viewer.services.catalog_db import get_favorite_paths, search_assets, set_asset_favorite
+from viewer.services.catalog_snapshot import CatalogSnapshot
 
 
 class CatalogController:
+    def __init__(self):
+        # Columns of the current model list; rebuilt when the list or the root changes.
+        self.snapshot: Optional[CatalogSnapshot] = None
+
     def top_category(self, file_path: str, root_directory: str) -> str:
         if not root_directory:
             return "Без категории"
@@ -18,32 +25,60 @@ class CatalogController:
         return "Корень"
 
     def categories_for_models(self, model_files: Sequence[str], root_directory: str) -> List[str]:
-        categories = [self.top_category(path, root_directory) for path in model_files]
-        return sorted(set(categories), key=lambda x: x.lower())
+        return list(self._snapshot_for(model_files, root_directory).category_names)
 
-    def filter_models(
+    def sync_snapshot(
         self,
         model_files: Sequence[str],
         root_directory: str,
+        favorite_paths: Set[str],
+        asset_categories_map: Dict[str, Set[int]],
+        categories_version: int = 0,
+    ) -> CatalogSnapshot:
+        snapshot = self._snapshot_for(model_files, root_directory)
+        if snapshot.favorites_source is not favorite_paths:
+            snapshot.set_favorites(favorite_paths)
+        if snapshot.categories_source is not asset_categories_map or snapshot.categories_version != categories_version:
+            snapshot.set_asset_categories(asset_categories_map, categories_version)
+        return snapshot
+
+    def _snapshot_for(self, model_files: Sequence[str], root_directory: str) -> CatalogSnapshot:
+        # The window replaces model_files on every listing change, so identity is the version.
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.source is not model_files or snapshot.root != root_directory:
+            snapshot = CatalogSnapshot.build(model_files, root_directory, self.top_category)
+            self.snapshot = snapshot
+        return snapshot
+
+    def filter_rows(
+        self,
+        snapshot: CatalogSnapshot,
         search_text: str,
         selected_category: str,
         only_favorites: bool,
-        favorite_paths: Set[str],
-    ) -> List[str]:
+        search_db_path: Optional[str] = None,
+    ):
+        # Text always matches as a substring of the relpath. With search_db_path (the catalog is
+        # indexed for the snapshot root) full-text hits come first in rank order, followed by the
+        # substring-only matches, so an index that is not ready yet only changes order and extras.
         needle = (search_text or "").strip().lower()
-        filtered: List[str] = []
-        for file_path in model_files:
-            rel = os.path.relpath(file_path, root_directory).lower() if root_directory else file_path.lower()
-            norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
-            category = self.top_category(file_path, root_directory)
-            if needle and needle not in rel:
-                continue
-            if selected_category and selected_category != "all" and category != selected_category:
-                continue
-            if only_favorites and norm not in favorite_paths:
-                continue
-            filtered.append(file_path)
-        return filtered
+        ranked = None
+        if needle and search_db_path and snapshot.root:
+            try:
+                ranked = search_assets(needle, snapshot.root, db_path=search_db_path)
+            except Exception:
+                ranked = None
+        mask = np.ones(len(snapshot), dtype=bool)
+        if selected_category and selected_category != "all":
+            mask &= snapshot.top_category_mask(selected_category)
+        if only_favorites:
+            mask &= snapshot.favorite
+        substring_rows = np.flatnonzero(mask & snapshot.search_mask(needle))
+        if ranked is None:
+            return substring_rows
+        rows = snapshot.rows_for_norms(ranked)
+        rows = rows[mask[rows]]
+        return np.concatenate([rows, substring_rows[~np.isin(substring_rows, rows)]])
 
     def load_favorites(self, root_directory: str, db_path: str) -> Set[str]:
         return set(get_favorite_paths(root=root_directory, db_path=db_path))
@@ -52,6 +87,7 @@ class CatalogController:
         norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
         is_favorite = norm in favorite_paths
         set_asset_favorite(file_path, not is_favorite, db_path=db_path)
+        self._sync_favorite(norm, not is_favorite, favorite_paths)
         if is_favorite:
             favorite_paths.discard(norm)
             return False
@@ -62,29 +98,34 @@ class CatalogController:
         norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
         desired = bool(is_favorite)
         set_asset_favorite(file_path, desired, db_path=db_path)
+        self._sync_favorite(norm, desired, favorite_paths)
         if desired:
             favorite_paths.add(norm)
         else:
             favorite_paths.discard(norm)
         return desired
 
+    def _sync_favorite(self, norm: str, is_favorite: bool, favorite_paths: Set[str]):
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.favorites_source is favorite_paths:
+            snapshot.set_favorite(norm, is_favorite)
+
     def build_dock_items(
         self,
-        filtered_model_files: Sequence[str],
-        root_directory: str,
-        favorite_paths: Set[str],
+        snapshot: CatalogSnapshot,
+        rows,
         preview_map_raw: Dict[str, str],
         preview_root: str,
-        asset_categories_map: Optional[Dict[str, Set[int]]] = None,
     ) -> Tuple[List[Tuple[str, str, bool, int]], Dict[str, str]]:
         items: List[Tuple[str, str, bool, int]] = []
         preview_map: Dict[str, str] = {}
-        for file_path in filtered_model_files:
-            norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
-            rel_display = os.path.relpath(file_path, root_directory) if root_directory else file_path
-            is_favorite = norm in favorite_paths
-            category_count = len(asset_categories_map.get(norm, set())) if asset_categories_map else 0
-            items.append((file_path, rel_display, is_favorite, int(category_count)))
+        paths, rels, norms = snapshot.paths, snapshot.rels, snapshot.norms
+        favorite = snapshot.favorite[rows].tolist()
+        category_count = snapshot.category_count[rows].tolist()
+        for row, is_favorite, count in zip(rows.tolist(), favorite, category_count):
+            file_path = paths[row]
+            norm = norms[row]
+            items.append((file_path, rels[row], is_favorite, int(count)))
             preview_path = preview_map_raw.get(norm)
             if preview_path and os.path.isfile(preview_path):
                 pnorm = os.path.normcase(os.path.normpath(os.path.abspath(preview_path)))
@@ -13,7 +13,16 @@ class CatalogIndexController(QObject):
         self._thread = None
         self._worker = None
 
-    def start(self, directory: str, model_extensions, db_path: str, scanned_paths=None):
+    def start(
+        self,
+        directory: str,
+        model_extensions,
+        db_path: str,
+        scanned_paths=None,
+        scanned_items=None,
+        event_retention=None,
+        crawl_result=None,
+    ):
         self.scanStarted.emit(directory)
         thread = QThread(self)
         worker = CatalogIndexWorker(
@@ -21,6 +30,9 @@ class CatalogIndexController(QObject):
             model_extensions,
             db_path,
             scanned_paths=scanned_paths,
+            scanned_items=scanned_items,
+            event_retention=event_retention,
+            crawl_result=crawl_result,
         )
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
@@ -19,6 +19,9 @@ class CatalogLogController:
         self.refresh_catalog_events()
         self.sync_catalog_dialog_state()
         self.append_index_status()
+        if w.search_input.text().strip():
+            # The search can switch from substring matching to the fresh full-text index.
+            w._apply_model_filters(keep_selection=True)
 
     def on_index_scan_failed(self, error_text: str):
         w = self.w
@@ -28,6 +31,21 @@ class CatalogLogController:
         self.sync_catalog_dialog_state()
         self.append_index_status()
 
+    def event_retention(self):
+        # "events" section of profiles.yaml; a relative jsonl_path sits next to the catalog file.
+        w = self.w
+        cfg = (w.profile_config or {}).get("events") or {}
+        try:
+            days = int(cfg.get("retention_days") or 0)
+        except (TypeError, ValueError):
+            days = 0
+        export_path = ""
+        if cfg.get("log_jsonl") and cfg.get("jsonl_path"):
+            export_path = str(cfg.get("jsonl_path"))
+            if not os.path.isabs(export_path):
+                export_path = os.path.join(os.path.dirname(os.path.abspath(w.catalog_db_path)), export_path)
+        return {"retention_days": days, "export_path": export_path}
+
     def refresh_catalog_events(self):
         w = self.w
         if w.catalog_dialog_events_list is None:
@@ -208,6 +208,14 @@ class CatalogUiController:
         self.apply_model_filters(keep_selection=True)
         w._set_status_text(f"Категории очищены: {cleared} моделей")
 
+    def _search_db_path(self):
+        # The full-text index answers only once the catalog scan of this directory has finished.
+        w = self.w
+        summary = w._last_index_summary
+        if not summary or summary.get("error"):
+            return None
+        return w.catalog_db_path
+
     def sync_filters_to_dock(self):
         w = self.w
         if w.catalog_panel is None:
@@ -225,16 +233,23 @@ class CatalogUiController:
         prev_path = ""
         if keep_selection:
             prev_path = w._current_selected_path()
-        filtered = w.catalog_controller.filter_models(
+        snapshot = w.catalog_controller.sync_snapshot(
             model_files=w.model_files,
             root_directory=w.current_directory,
+            favorite_paths=w.favorite_paths,
+            asset_categories_map=w.virtual_catalog_controller.asset_categories_map,
+            categories_version=w.virtual_catalog_controller.asset_map_version,
+        )
+        rows = w.catalog_controller.filter_rows(
+            snapshot,
             search_text=w.search_input.text(),
             selected_category=w.category_combo.currentData(),
             only_favorites=w.only_favorites_checkbox.isChecked(),
-            favorite_paths=w.favorite_paths,
+            search_db_path=self._search_db_path(),
         )
-        filtered = w.virtual_catalog_controller.apply_filters(filtered)
-        w.filtered_model_files = filtered
+        rows = w.virtual_catalog_controller.filter_rows(rows, snapshot)
+        w.filtered_rows = rows
+        w.filtered_model_files = snapshot.paths_for(rows)
         w._fill_model_list()
 
         if keep_selection and prev_path:
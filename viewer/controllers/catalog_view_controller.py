@@ -4,7 +4,8 @@ from PyQt5.QtCore import QSize, Qt
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtWidgets import QTreeWidgetItem
 
-from viewer.services.catalog_db import get_preview_paths_for_assets
+from viewer.services.catalog_db import get_geometry_stats_map, get_preview_paths_for_assets
+from viewer.services.catalog_snapshot import CatalogSnapshot
 from viewer.services.preview_cache import get_preview_cache_dir
 
 
@@ -53,12 +54,14 @@ class CatalogViewController:
         w.model_list.clear()
         w._model_item_by_path = {}
         category_roots = {}
-        for file_path in w.filtered_model_files:
-            rel_path = os.path.relpath(file_path, w.current_directory)
+        snapshot, rows = self._filtered_view()
+        favorite = snapshot.favorite[rows].tolist()
+        for row, is_favorite in zip(rows.tolist(), favorite):
+            file_path = snapshot.paths[row]
             display_name = os.path.basename(file_path)
-            norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
-            category = self.top_category(file_path)
-            if norm in w.favorite_paths:
+            norm = snapshot.norms[row]
+            category = snapshot.category_name(row)
+            if is_favorite:
                 display_name = f"★ {display_name}"
             cat_item = category_roots.get(category)
             if cat_item is None:
@@ -69,7 +72,7 @@ class CatalogViewController:
 
             item = QTreeWidgetItem([display_name])
             item.setData(0, Qt.UserRole, file_path)
-            item.setToolTip(0, rel_path)
+            item.setToolTip(0, snapshot.rels[row])
             item.setSizeHint(0, QSize(0, w._thumb_size + 10))
             preview_path = preview_map.get(norm)
             if preview_path and os.path.isfile(preview_path):
@@ -101,15 +104,27 @@ class CatalogViewController:
                 kind="thumb",
             )
         preview_root = os.path.normcase(os.path.normpath(get_preview_cache_dir()))
+        snapshot, rows = self._filtered_view()
         items, preview_map = w.catalog_controller.build_dock_items(
-            filtered_model_files=w.filtered_model_files,
-            root_directory=w.current_directory,
-            favorite_paths=w.favorite_paths,
+            snapshot,
+            rows,
             preview_map_raw=preview_map_raw,
             preview_root=preview_root,
-            asset_categories_map=w.virtual_catalog_controller.asset_categories_map,
         )
-        w.catalog_panel.set_items(items, preview_map)
+        stats_map = get_geometry_stats_map(w.filtered_model_files, db_path=w.catalog_db_path)
+        w.catalog_panel.set_items(items, preview_map, stats_map=stats_map)
+
+    def _filtered_view(self):
+        # Snapshot rows behind filtered_model_files; lists set without rows get a throwaway snapshot.
+        w = self.w
+        snapshot = w.catalog_controller.snapshot
+        rows = w.filtered_rows
+        if snapshot is None or rows is None or len(rows) != len(w.filtered_model_files):
+            snapshot = CatalogSnapshot.build(w.filtered_model_files, w.current_directory, w.catalog_controller.top_category)
+            snapshot.set_favorites(w.favorite_paths)
+            snapshot.set_asset_categories(w.virtual_catalog_controller.asset_categories_map)
+            rows = snapshot.all_rows()
+        return snapshot, rows
 
     def current_selected_path(self):
         w = self.w
@@ -0,0 +1,160 @@
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, pyqtSignal
+
+from viewer.services.fs_watch import DirectoryWatchState, is_network_path
+from viewer.ui.workers import CatalogWatchWorker
+
+
+class CatalogWatchController(QObject):
+    # Keeps the catalog of the open directory current: native change notifications where the
+    # filesystem delivers them, adaptive polling on network shares or when watches run out.
+    changesApplied = pyqtSignal(str, object, object)
+    watchFailed = pyqtSignal(str)
+
+    DEBOUNCE_MS = 800
+    POLL_MIN_MS = 5000
+    POLL_MAX_MS = 120000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.directory = ""
+        self.db_path = ""
+        self.mode = ""
+        self._state = None
+        self._generation = 0
+        self._thread = None
+        self._worker = None
+        self._pending_dirs = set()
+        self._poll_due = False
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._flush)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setSingleShot(True)
+        self._poll_timer.timeout.connect(self._on_poll_timeout)
+        self._poll_interval = self.POLL_MIN_MS
+
+    @property
+    def active(self) -> bool:
+        return self._state is not None
+
+    def start(self, directory: str, model_extensions, db_path: str, mode: str = "auto"):
+        self.stop()
+        if not directory:
+            return
+        if mode == "auto":
+            mode = "poll" if is_network_path(directory) else "native"
+        self.directory = directory
+        self.db_path = db_path
+        self.mode = mode
+        self._state = DirectoryWatchState(directory, model_extensions)
+        self._run_worker(load=True)
+
+    def stop(self):
+        # A running worker finishes on its own; its result is dropped by the generation check.
+        self._generation += 1
+        self._state = None
+        self._pending_dirs.clear()
+        self._poll_due = False
+        self._debounce.stop()
+        self._poll_timer.stop()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _on_directory_changed(self, path: str):
+        if self._state is None:
+            return
+        self._pending_dirs.add(path)
+        # Editors and copy tools touch a folder many times in a row; wait until it settles.
+        self._debounce.start()
+
+    def _on_poll_timeout(self):
+        if self._state is None:
+            return
+        self._poll_due = True
+        self._flush()
+
+    def _flush(self):
+        if self._state is None or self._thread is not None:
+            return
+        if self._pending_dirs:
+            dirs = sorted(self._pending_dirs)
+            self._pending_dirs.clear()
+            self._run_worker(dir_paths=dirs)
+        elif self._poll_due:
+            self._poll_due = False
+            self._run_worker(dir_paths=None)
+
+    def _run_worker(self, dir_paths=None, load: bool = False):
+        generation = self._generation
+        thread = QThread(self)
+        worker = CatalogWatchWorker(self._state, self.db_path, dir_paths=dir_paths, load=load)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(lambda changes, stats: self._on_worker_finished(generation, load, changes, stats))
+        worker.failed.connect(lambda error_text: self._on_worker_failed(generation, error_text))
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self._on_thread_finished(thread))
+        self._thread = thread
+        self._worker = worker
+        thread.start()
+
+    def _on_thread_finished(self, thread):
+        if self._thread is thread:
+            self._thread = None
+            self._worker = None
+        if self._state is not None and (self._pending_dirs or self._poll_due):
+            self._flush()
+
+    def _on_worker_finished(self, generation: int, load: bool, changes, stats):
+        if generation != self._generation or self._state is None:
+            return
+        if load:
+            self._watch_paths(self._state.directories())
+        else:
+            if changes.removed_dirs:
+                watched = set(self._watcher.directories())
+                stale = [p for p in changes.removed_dirs if p in watched]
+                if stale:
+                    self._watcher.removePaths(stale)
+            if changes.added_dirs:
+                self._watch_paths(changes.added_dirs)
+            if changes.has_files():
+                self.changesApplied.emit(self.directory, changes, stats)
+        if self.mode == "poll":
+            # Back off while the share is quiet, come back to the short interval after a change.
+            if load or changes.has_files():
+                self._poll_interval = self.POLL_MIN_MS
+            else:
+                self._poll_interval = min(self.POLL_MAX_MS, self._poll_interval * 2)
+            self._poll_timer.start(self._poll_interval)
+        elif not self._poll_timer.isActive():
+            # Folder notifications miss files rewritten in place; a slow poll picks those up.
+            self._poll_timer.start(self.POLL_MAX_MS)
+
+    def _on_worker_failed(self, generation: int, error_text: str):
+        if generation != self._generation:
+            return
+        self.watchFailed.emit(error_text)
+        if self.mode == "poll" and self._state is not None:
+            self._poll_interval = self.POLL_MAX_MS
+            self._poll_timer.start(self._poll_interval)
+
+    def _watch_paths(self, paths):
+        if self.mode != "native" or not paths:
+            return
+        failed = self._watcher.addPaths(list(paths))
+        if failed:
+            # Out of inotify watches (or unsupported share): the whole tree falls back to polling.
+            watched = self._watcher.directories()
+            if watched:
+                self._watcher.removePaths(watched)
+            self.mode = "poll"
+            self._poll_interval = self.POLL_MIN_MS
+            self._poll_timer.start(self._poll_interval)
@@ -7,6 +7,7 @@ class DirectoryScanController(QObject):
     scanStarted = pyqtSignal(str)
     scanFinished = pyqtSignal(int, str, object, bool)
     scanFailed = pyqtSignal(int, str)
+    scanProgress = pyqtSignal(int, str, int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -18,17 +19,18 @@ class DirectoryScanController(QObject):
     def request_id(self) -> int:
         return self._request_id
 
-    def start(self, directory: str, model_extensions, auto_select_first: bool):
+    def start(self, directory: str, model_extensions, auto_select_first: bool, db_path: str = None):
         self._request_id += 1
         request_id = self._request_id
         self.scanStarted.emit(directory)
 
         thread = QThread(self)
-        worker = DirectoryScanWorker(request_id, directory, model_extensions)
+        worker = DirectoryScanWorker(request_id, directory, model_extensions, db_path=db_path)
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
-        worker.finished.connect(lambda rid, d, files: self.scanFinished.emit(rid, d, files, bool(auto_select_first)))
+        worker.finished.connect(lambda rid, d, result: self.scanFinished.emit(rid, d, result, bool(auto_select_first)))
         worker.failed.connect(self.scanFailed)
+        worker.progress.connect(self.scanProgress)
         worker.finished.connect(thread.quit)
         worker.failed.connect(thread.quit)
         thread.finished.connect(worker.deleteLater)
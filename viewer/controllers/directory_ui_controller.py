@@ -3,6 +3,8 @@ import os
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
 from viewer.loaders.model_loader import clear_payload_cache
+from viewer.utils.environment_map import clear_environment_cache
+from viewer.utils.texture_cache import clear_texture_cache
 from viewer.utils.texture_utils import clear_texture_scan_cache
 
 
@@ -31,6 +33,10 @@ class DirectoryUiController:
         w = self.w
         if w.current_directory:
             clear_payload_cache()
+            clear_texture_cache()
+            clear_environment_cache()
+            w.gl_widget.release_unused_environment_textures()
+            w.render_settings_controller.clear_environments()
             self.set_directory(w.current_directory)
 
     def set_directory(self, directory, auto_select_first=True):
@@ -42,6 +48,7 @@ class DirectoryUiController:
         w.open_catalog_panel_button.setToolTip(f"Каталог: {directory}")
         w.model_files = []
         w.filtered_model_files = []
+        w.filtered_rows = None
         w._model_item_by_path = {}
         w.current_file_path = ""
         w._selected_model_path = ""
@@ -50,6 +57,7 @@ class DirectoryUiController:
         w._sync_filters_to_dock()
         w._refresh_validation_data()
         w.virtual_catalog_controller.clear_asset_map()
+        w.catalog_watch_controller.stop()
         w._set_status_text("Scanning models...")
         self.start_directory_scan(directory, auto_select_first=auto_select_first)
         w.batch_controller.restore_state(w.current_directory, w._thumb_size)
@@ -60,16 +68,23 @@ class DirectoryUiController:
             directory=directory,
             model_extensions=w.model_extensions,
             auto_select_first=bool(auto_select_first),
+            db_path=w.catalog_db_path,
         )
 
-    def on_directory_scan_finished(self, request_id: int, directory: str, files, auto_select_first: bool):
+    def on_directory_scan_progress(self, request_id: int, directory: str, count: int):
+        w = self.w
+        if request_id != w.directory_scan_controller.request_id or directory != w.current_directory:
+            return
+        w._set_status_text(f"Scanning models... {count}")
+
+    def on_directory_scan_finished(self, request_id: int, directory: str, result, auto_select_first: bool):
         w = self.w
         if request_id != w.directory_scan_controller.request_id:
             return
         if directory != w.current_directory:
             return
 
-        w.model_files = list(files or [])
+        w.model_files = result.paths()
         w._populate_category_filter()
         w.category_combo.blockSignals(True)
         try:
@@ -79,7 +94,8 @@ class DirectoryUiController:
         w._refresh_favorites_from_db()
         w._refresh_asset_category_map()
         w._apply_model_filters(keep_selection=False)
-        w._start_index_scan(directory, scanned_paths=w.model_files)
+        w._start_index_scan(directory, crawl_result=result)
+        w.catalog_watch_controller.start(directory, w.model_extensions, w.catalog_db_path)
 
         if not w.filtered_model_files:
             w.current_file_path = ""
@@ -98,12 +114,40 @@ class DirectoryUiController:
 
         w._set_status_text(f"Found models: {len(w.filtered_model_files)}")
 
+    def on_catalog_watch_changes(self, directory: str, changes, stats):
+        w = self.w
+        if directory != w.current_directory:
+            return
+        for dir_path in set(os.path.dirname(p) for p in changes.touched_paths()):
+            clear_texture_scan_cache(dir_path)
+        for norm in list(changes.modified) + list(changes.deleted):
+            w._preview_icon_cache.pop(norm, None)
+        if changes.created or changes.deleted:
+            known = {os.path.normcase(os.path.normpath(p)): p for p in w.model_files}
+            for norm in changes.deleted:
+                known.pop(norm, None)
+            for norm, item in changes.created.items():
+                known[norm] = item["path"]
+            w.model_files = sorted(known.values(), key=lambda p: os.path.relpath(p, directory).lower())
+            w._populate_category_filter()
+            w._refresh_favorites_from_db()
+            w._refresh_asset_category_map()
+        w._apply_model_filters(keep_selection=True)
+        w._refresh_catalog_events()
+        w._set_status_text(
+            f"Catalog updated: +{stats.get('new', 0)} ~{stats.get('updated', 0)} -{stats.get('removed', 0)}"
+        )
+
+    def on_catalog_watch_failed(self, error_text: str):
+        self.w._set_status_text(f"Catalog watch failed: {error_text}")
+
     def on_directory_scan_failed(self, request_id: int, error_text: str):
         w = self.w
         if request_id != w.directory_scan_controller.request_id:
             return
         w.model_files = []
         w.filtered_model_files = []
+        w.filtered_rows = None
         w._model_item_by_path = {}
         w.model_list.clear()
         w._refresh_catalog_dock_items(preview_map_raw={})
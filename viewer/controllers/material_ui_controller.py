@@ -11,6 +11,8 @@ from viewer.services.texture_sets import (
     profile_by_key,
 )
 from viewer.services.pipeline_validation import evaluate_pipeline_coverage
+from viewer.utils.environment_map import clear_environment_cache
+from viewer.utils.texture_cache import clear_texture_cache
 from viewer.utils.texture_utils import clear_texture_scan_cache
 
 
@@ -198,6 +200,32 @@ class MaterialUiController:
         self.refresh_overlay_data()
         w._refresh_validation_data()
 
+    def select_material_from_pick(self, pick):
+        w = self.w
+        if not pick:
+            w.statusBar().showMessage("Под курсором нет геометрии.", 2000)
+            return
+        if pick.get("instance_group", -1) >= 0:
+            # Instance groups share the global texture set; there is no material to select.
+            name = pick.get("material_name") or "instances"
+            w.statusBar().showMessage(f"Инстанс: {name} (группа {pick['instance_group']}, копия {pick['instance']})", 3000)
+            return
+        submeshes = w.gl_widget.submeshes or []
+        sub = submeshes[pick["submesh"]] if 0 <= pick["submesh"] < len(submeshes) else {}
+        uid = str(sub.get("material_uid") or "").strip()
+        name = str(sub.get("material_name") or "").strip() or "material"
+        if not uid:
+            # Same fallback key as material_targets_from_submeshes.
+            obj = str(sub.get("object_name") or "").strip()
+            uid = f"{name}::{obj}" if obj else name
+        combo = w.material_target_combo
+        idx = combo.findData(uid) if combo is not None else -1
+        if idx < 0:
+            w.statusBar().showMessage(f"Материал: {name}", 3000)
+            return
+        combo.setCurrentIndex(idx)
+        w.statusBar().showMessage(f"Выбран материал: {name} (submesh {pick['submesh']})", 3000)
+
     def collect_effective_texture_channels(self, material_uid: str = ""):
         return self.w.material_controller.collect_effective_texture_channels(self.w.gl_widget, material_uid=material_uid)
 
@@ -353,6 +381,10 @@ class MaterialUiController:
             return
         clear_texture_scan_cache(os.path.dirname(file_path))
         clear_payload_cache()
+        clear_texture_cache()
+        clear_environment_cache()
+        w.gl_widget.release_unused_environment_textures()
+        w.render_settings_controller.clear_environments()
         w.material_controller.clear_texture_overrides(
             file_path=file_path,
             db_path=w.catalog_db_path,
@@ -364,8 +396,15 @@ class MaterialUiController:
         w = self.w
         active_path = file_path or w.current_file_path or w._current_selected_path() or ""
         debug = w.gl_widget.last_debug_info or {}
-        vertices = int(w.gl_widget.vertices.shape[0]) if getattr(w.gl_widget.vertices, "ndim", 0) == 2 else 0
-        triangles = int(w.gl_widget.indices.size // 3) if w.gl_widget.indices.size else 0
+        stats = w.gl_widget.mesh_stats
+        if stats is not None:
+            vertices = int(stats.vertex_count)
+            triangles = int(stats.total_triangles)
+        else:
+            vertices = int(w.gl_widget.vertices.shape[0]) if getattr(w.gl_widget.vertices, "ndim", 0) == 2 else 0
+            triangles = int(w.gl_widget.indices.size // 3) if w.gl_widget.indices.size else 0
+            triangles += int(debug.get("instanced_triangles", 0) or 0)
+        instance_groups = int(debug.get("instance_groups", 0) or 0)
         submeshes = len(w.gl_widget.submeshes or [])
         objects = int(debug.get("object_count", 0) or 0)
         materials = int(debug.get("material_count", 0) or 0)
@@ -417,6 +456,16 @@ class MaterialUiController:
             _line("Model", os.path.basename(active_path) if active_path else "-", "info"),
             _line("Vertices / Triangles", f"{vertices:,} / {triangles:,}", "info"),
             _line("Objects / Submeshes / Materials", f"{objects} / {submeshes} / {materials}", "info"),
+        ]
+        if stats is not None and (stats.vertex_count or stats.instance_count):
+            source = stats.to_catalog_dict()
+            size = " x ".join(f"{v:.3g}" for v in source["size"])
+            lines.append(_line("Size / Surface area", f"{size} / {source['surface_area']:.4g}", "info"))
+        if instance_groups:
+            lines.append(
+                _line("Instanced geometries / Instances", f"{instance_groups} / {int(debug.get('instance_count', 0) or 0):,}", "info")
+            )
+        lines += [
             _line("Catalog categories", str(category_count), "ok" if category_count > 0 else "warn"),
             _line("Material target", material_label, "info"),
             _line("UV vertices / Texture candidates", f"{uv_count:,} / {tex_candidates}", "info"),
@@ -441,6 +490,11 @@ class MaterialUiController:
                 f"{w.gl_widget.alpha_render_mode} | base alpha: {'on' if w.gl_widget.use_base_alpha_in_blend else 'off'} | blend: {w.gl_widget.alpha_blend_opacity:.2f}",
                 "warn" if w.gl_widget.alpha_render_mode == "blend" else "info",
             ),
+            _line(
+                "Render path",
+                w.gl_widget.render_path_status or w.gl_widget.render_path,
+                "ok" if w.gl_widget.render_path == "core" else "warn",
+            ),
             _line(
                 "Projection / Shadows",
                 f"{projection} / {shadow_state}",
@@ -1,3 +1,6 @@
+import os
+import time
+
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QShortcut
 
@@ -60,6 +63,14 @@ class NavigationUiController:
         w.shortcut_overlay.setContext(Qt.WindowShortcut)
         w.shortcut_overlay.activated.connect(w._toggle_overlay_action)
 
+        w.shortcut_profiler = QShortcut(Qt.Key_F2, w)
+        w.shortcut_profiler.setContext(Qt.WindowShortcut)
+        w.shortcut_profiler.activated.connect(w._toggle_profiler_action)
+
+        w.shortcut_profiler_dump = QShortcut(Qt.SHIFT + Qt.Key_F2, w)
+        w.shortcut_profiler_dump.setContext(Qt.WindowShortcut)
+        w.shortcut_profiler_dump.activated.connect(w._dump_render_profile_action)
+
     def reset_view_action(self):
         w = self.w
         w.gl_widget.reset_view()
@@ -83,3 +94,35 @@ class NavigationUiController:
         visible = w.gl_widget.toggle_overlay()
         state = "ON" if visible else "OFF"
         w.statusBar().showMessage(f"Overlay: {state}", 1500)
+
+    def toggle_profiler_action(self):
+        w = self.w
+        enabled = not w.gl_widget.render_profiler.enabled
+        w.gl_widget.set_profiler_enabled(enabled)
+        if enabled and not w.gl_widget.overlay_visible:
+            w.gl_widget.set_overlay_visible(True)
+        state = "ON" if enabled else "OFF"
+        w.statusBar().showMessage(f"Render profiler: {state}", 1500)
+
+    def dump_render_profile_action(self):
+        w = self.w
+        if not w.gl_widget.render_profiler.enabled:
+            w.statusBar().showMessage("Render profiler выключен (F2).", 2500)
+            return
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        out_path = os.path.join(root, "logs", f"render_profile_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            w.gl_widget.dump_render_profile(out_path)
+        except OSError as exc:
+            w.statusBar().showMessage(f"Не удалось сохранить профиль: {exc}", 4000)
+            return
+        w.statusBar().showMessage(f"Профиль рендера сохранен: {out_path}", 4000)
+
+    def on_viewport_measure_changed(self, distance, point_count: int):
+        w = self.w
+        if distance is not None:
+            w.statusBar().showMessage(f"Расстояние: {distance:.4f} (единицы файла)", 6000)
+        elif point_count:
+            w.statusBar().showMessage("Точка A задана. Ctrl+Alt+клик — точка B.", 4000)
+        else:
+            w.statusBar().showMessage("Под курсором нет геометрии.", 2000)
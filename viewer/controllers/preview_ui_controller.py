@@ -4,12 +4,14 @@ from PyQt5.QtCore import QSize, Qt, QTimer
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtWidgets import QApplication
 
+from viewer.services.catalog_db import set_asset_geometry_stats, set_asset_search_terms
 from viewer.services.preview_cache import build_preview_path_for_model, save_viewport_preview
 
 
 class PreviewUiController:
     def __init__(self, window):
         self.w = window
+        self._geometry_stats_stored = set()
 
     def start_preview_batch(self):
         w = self.w
@@ -75,6 +77,7 @@ class PreviewUiController:
 
         w.current_file_path = file_path
         w._selected_model_path = file_path
+        self.store_geometry_stats(file_path, payload)
         w._restore_texture_overrides_for_file(file_path)
         w._update_favorite_button_for_current()
         w._populate_material_controls(w.gl_widget.last_texture_sets)
@@ -93,6 +96,31 @@ class PreviewUiController:
             print("[FBX DEBUG]", w.gl_widget.last_debug_info or {})
             print("[FBX DEBUG] selected_texture:", w.gl_widget.last_texture_path or "<none>")
 
+    def store_geometry_stats(self, file_path: str, payload):
+        w = self.w
+        stats = getattr(payload, "mesh_stats", None)
+        if stats is None or not file_path:
+            return
+        norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
+        cache_hit = bool((payload.debug_info or {}).get("cache_hit"))
+        # Fresh loads always refresh the row; cached payloads are written once per session.
+        if cache_hit and norm in self._geometry_stats_stored:
+            return
+        try:
+            set_asset_geometry_stats(
+                file_path,
+                stats.total_triangles,
+                stats.uv_sets,
+                stats.to_catalog_dict(),
+                db_path=w.catalog_db_path,
+            )
+            materials, textures = _payload_search_terms(payload)
+            set_asset_search_terms(file_path, materials, textures, db_path=w.catalog_db_path)
+            self._geometry_stats_stored.add(norm)
+        except Exception:
+            # Catalog metrics are optional; viewing must not fail on DB errors.
+            pass
+
     def on_model_load_failed(self, request_id: int, row: int, file_path: str, error_text: str):
         w = self.w
         if request_id != w.model_session_controller.request_id:
@@ -211,3 +239,20 @@ class PreviewUiController:
         for item in w._model_item_by_path.values():
             item.setSizeHint(0, QSize(0, w._thumb_size + 10))
         w._refresh_catalog_dock_items()
+
+
+def _payload_search_terms(payload):
+    # Material names and texture file names of a loaded model, for the catalog search index.
+    materials = set()
+    textures = set()
+    for submesh in payload.submeshes or []:
+        name = str(submesh.get("material_name") or "").strip()
+        if name and name != "default":
+            materials.add(name)
+        for value in (submesh.get("texture_paths") or {}).values():
+            if isinstance(value, str) and value:
+                textures.add(os.path.basename(value))
+    for path in payload.texture_candidates or []:
+        if path:
+            textures.add(os.path.basename(path))
+    return sorted(materials), sorted(textures)
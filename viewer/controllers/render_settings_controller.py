@@ -1,13 +1,28 @@
-from PyQt5.QtCore import Qt
+import os
+
+from PyQt5.QtCore import QThread, Qt
 from PyQt5.QtGui import QColor
-from PyQt5.QtWidgets import QColorDialog
+from PyQt5.QtWidgets import QColorDialog, QFileDialog
 
 from viewer.ui.theme import apply_ui_theme
+from viewer.ui.workers import EnvironmentLoadWorker
+from viewer.utils.environment_map import environment_key
+
+
+_MAX_RECENT_ENVIRONMENTS = 8
+# Loaded environments kept in memory, least recently used dropped first.
+_MAX_CACHED_ENVIRONMENTS = 4
 
 
 class RenderSettingsController:
     def __init__(self, window):
         self.w = window
+        # Precomputed environments by EnvironmentLighting.key (file version), so the combo
+        # switches without reloading and an HDRI edited on disk is loaded again.
+        self._environments = {}
+        self._environment_request_id = 0
+        self._environment_thread = None
+        self._environment_worker = None
 
     def on_alpha_cutoff_changed(self, value: int):
         w = self.w
@@ -137,6 +152,128 @@ class RenderSettingsController:
         if w._settings_ready:
             w.settings.setValue("view/ambient_slider", int(value))
 
+    def choose_environment_map(self):
+        w = self.w
+        current = w.environment_combo.currentData() or ""
+        base_dir = os.path.dirname(current) if current else (w.current_directory or os.getcwd())
+        file_path, _ = QFileDialog.getOpenFileName(
+            w,
+            "Выберите HDRI",
+            base_dir,
+            "HDRI (*.hdr *.exr);;Images (*.png *.jpg *.jpeg *.tga *.bmp *.tif *.tiff);;All files (*.*)",
+        )
+        if not file_path:
+            return
+        self._select_environment_item(file_path)
+
+    def restore_environment(self, recent_paths, current_path: str):
+        w = self.w
+        w.environment_combo.blockSignals(True)
+        try:
+            for path in recent_paths or []:
+                path = str(path or "")
+                if path and os.path.isfile(path) and w.environment_combo.findData(path) < 0:
+                    w.environment_combo.addItem(os.path.basename(path), path)
+        finally:
+            w.environment_combo.blockSignals(False)
+        if current_path and os.path.isfile(current_path):
+            self._select_environment_item(current_path)
+
+    def on_environment_changed(self):
+        w = self.w
+        path = w.environment_combo.currentData() or ""
+        if w._settings_ready:
+            w.settings.setValue("view/environment_path", path)
+        if not path:
+            self._environment_request_id += 1
+            w.gl_widget.set_environment(None)
+            return
+        key = environment_key(path)
+        lighting = self._environments.pop(key, None) if key else None
+        if lighting is not None:
+            self._environments[key] = lighting
+            self._environment_request_id += 1
+            w.gl_widget.set_environment(lighting)
+            return
+        self._start_environment_load(path)
+
+    def on_environment_loaded(self, request_id: int, lighting):
+        w = self.w
+        if lighting is None:
+            return
+        self._environments.pop(lighting.key, None)
+        self._environments[lighting.key] = lighting
+        for stale in list(self._environments)[:-_MAX_CACHED_ENVIRONMENTS]:
+            del self._environments[stale]
+        if request_id != self._environment_request_id:
+            return
+        w.gl_widget.set_environment(lighting)
+        w.statusBar().showMessage(f"Окружение: {os.path.basename(lighting.path)}", 3000)
+
+    def clear_environments(self):
+        self._environments = {}
+
+    def on_environment_failed(self, request_id: int, error_text: str):
+        w = self.w
+        if request_id != self._environment_request_id:
+            return
+        w.statusBar().showMessage(f"Не удалось загрузить HDRI: {error_text}", 5000)
+
+    def on_environment_intensity_changed(self, value: int):
+        w = self.w
+        intensity = value / 100.0
+        w.environment_intensity_label.setText(f"{intensity:.2f}")
+        w.gl_widget.set_environment_intensity(intensity)
+        if w._settings_ready:
+            w.settings.setValue("view/environment_intensity", int(value))
+
+    def on_environment_rotation_changed(self, value: int):
+        w = self.w
+        w.environment_rotation_label.setText(f"{int(value)}°")
+        w.gl_widget.set_environment_rotation(float(value))
+        if w._settings_ready:
+            w.settings.setValue("view/environment_rotation", int(value))
+
+    def _select_environment_item(self, path: str):
+        w = self.w
+        index = w.environment_combo.findData(path)
+        if index < 0:
+            w.environment_combo.blockSignals(True)
+            w.environment_combo.addItem(os.path.basename(path), path)
+            # Oldest entries fall off; index 0 is the "none" item.
+            while w.environment_combo.count() > _MAX_RECENT_ENVIRONMENTS + 1:
+                w.environment_combo.removeItem(1)
+            w.environment_combo.blockSignals(False)
+            index = w.environment_combo.findData(path)
+            recent = [w.environment_combo.itemData(i) for i in range(1, w.environment_combo.count())]
+            if w._settings_ready:
+                w.settings.setValue("view/environment_recent", recent)
+        if w.environment_combo.currentIndex() == index:
+            self.on_environment_changed()
+        else:
+            w.environment_combo.setCurrentIndex(index)
+
+    def _start_environment_load(self, path: str):
+        w = self.w
+        self._environment_request_id += 1
+        request_id = self._environment_request_id
+        w.statusBar().showMessage(f"Подготовка HDRI: {os.path.basename(path)}...")
+
+        thread = QThread(w)
+        worker = EnvironmentLoadWorker(request_id, path)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.loaded.connect(w._on_environment_loaded)
+        worker.failed.connect(w._on_environment_failed)
+        worker.loaded.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._environment_thread = thread
+        self._environment_worker = worker
+        thread.start()
+
     def on_key_light_changed(self, value: int):
         w = self.w
         intensity = value / 10.0
@@ -312,6 +449,8 @@ class RenderSettingsController:
     def reset_light_settings(self):
         w = self.w
         w.ambient_slider.setValue(8)
+        w.environment_intensity_slider.setValue(100)
+        w.environment_rotation_slider.setValue(0)
         w.key_light_slider.setValue(180)
         w.fill_light_slider.setValue(100)
         w.key_azimuth_slider.setValue(42)
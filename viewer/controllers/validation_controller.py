@@ -60,7 +60,11 @@ class ValidationController:
             if candidate_path not in bucket:
                 bucket.append(candidate_path)
         debug = w.gl_widget.last_debug_info or {}
-        triangles = int(w.gl_widget.indices.size // 3) if w.gl_widget.indices.size else 0
+        stats = w.gl_widget.mesh_stats
+        if stats is not None:
+            triangles = int(stats.total_triangles)
+        else:
+            triangles = int(w.gl_widget.indices.size // 3) if w.gl_widget.indices.size else 0
 
         w.pipeline_coverage_rows = evaluate_pipeline_coverage(
             w.profile_config,
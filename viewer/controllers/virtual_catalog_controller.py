@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, Set
 
 from viewer.services.catalog_db import (
     clear_asset_categories,
@@ -21,6 +21,8 @@ class VirtualCatalogController:
         self.categories = []
         self.children_by_parent = {}
         self.asset_categories_map: Dict[str, Set[int]] = {}
+        # Bumped on every change to asset_categories_map, so snapshots know to re-read it.
+        self.asset_map_version = 0
 
     @staticmethod
     def _norm_path(path: str) -> str:
@@ -59,9 +61,11 @@ class VirtualCatalogController:
 
     def refresh_asset_map(self, model_files: Iterable[str], db_path: str):
         self.asset_categories_map = get_asset_categories_map(model_files, db_path=db_path)
+        self.asset_map_version += 1
 
     def clear_asset_map(self):
         self.asset_categories_map = {}
+        self.asset_map_version += 1
 
     def descendants(self, category_id: int):
         cid = int(category_id or 0)
@@ -77,26 +81,15 @@ class VirtualCatalogController:
             stack.extend(self.children_by_parent.get(cur, []))
         return out
 
-    def apply_filters(self, file_paths: List[str]) -> List[str]:
-        filtered = list(file_paths or [])
-
+    def filter_rows(self, rows, snapshot):
+        # rows/snapshot come from CatalogController.filter_rows; the snapshot carries the
+        # category bitsets of asset_categories_map (see CatalogController.sync_snapshot).
         if self.only_uncategorized:
-            kept = []
-            for file_path in filtered:
-                cats = self.asset_categories_map.get(self._norm_path(file_path)) or set()
-                if not cats:
-                    kept.append(file_path)
-            filtered = kept
-
+            rows = rows[snapshot.uncategorized_mask()[rows]]
         if self.filter_enabled and self.selected_category_id > 0:
             allowed = self.descendants(self.selected_category_id)
-            kept = []
-            for file_path in filtered:
-                cats = self.asset_categories_map.get(self._norm_path(file_path)) or set()
-                if any(int(cat) in allowed for cat in cats):
-                    kept.append(file_path)
-            filtered = kept
-        return filtered
+            rows = rows[snapshot.any_category_mask(allowed)[rows]]
+        return rows
 
     def category_count_for_path(self, file_path: str) -> int:
         if not file_path:
@@ -126,6 +119,7 @@ class VirtualCatalogController:
         norm = self._norm_path(file_path)
         bucket = self.asset_categories_map.setdefault(norm, set())
         bucket.add(cid)
+        self.asset_map_version += 1
         return True
 
     def assign_paths(self, file_paths: Iterable[str], category_id: int, db_path: str) -> int:
@@ -143,6 +137,7 @@ class VirtualCatalogController:
             return
         clear_asset_categories(file_path, db_path=db_path)
         self.asset_categories_map[self._norm_path(file_path)] = set()
+        self.asset_map_version += 1
 
     def clear_categories_for_paths(self, file_paths: Iterable[str], db_path: str) -> int:
         cleared = 0
@@ -164,3 +159,4 @@ class VirtualCatalogController:
         bucket = set(self.asset_categories_map.get(norm) or set())
         bucket.discard(cid)
         self.asset_categories_map[norm] = bucket
+        self.asset_map_version += 1
@@ -12,6 +12,8 @@ from viewer.utils.geometry_utils import (
     NORMALS_POLICY_AUTO,
     NORMALS_POLICY_IMPORT,
     NORMALS_POLICY_RECOMPUTE_HARD,
+    compute_mesh_stats,
+    normalization_matrix,
     process_mesh_data,
 )
 from viewer.utils.texture_utils import (
@@ -37,9 +39,11 @@ except ImportError:
     fbx = None
 
 
-_PAYLOAD_CACHE_VERSION = "v10"
+_PAYLOAD_CACHE_VERSION = "v12"
 _PAYLOAD_CACHE_DIR = os.path.join(".cache", "payload_cache")
 _SMOOTH_FALLBACK_MAX_POLYGONS = 250000
+# Scene geometries referenced by at least this many nodes are kept once and drawn instanced.
+_INSTANCING_MIN_COPIES = 4
 
 
 @dataclass
@@ -52,6 +56,11 @@ class MeshPayload:
     texture_sets: dict = field(default_factory=dict)
     submeshes: list = field(default_factory=list)
     debug_info: dict = field(default_factory=dict)
+    # [{"name", "vertices", "indices", "normals", "texcoords", "transforms" (K, 4, 4), "texture_paths"}]
+    # Geometry here is in its local space and is not part of vertices/indices above.
+    instance_groups: list = field(default_factory=list)
+    # MeshStats computed once at load time and cached with the payload.
+    mesh_stats: object = None
 
 
 def _payload_cache_path(file_path: str, fast_mode: bool, normals_policy: str, hard_angle_deg: float) -> str:
@@ -69,7 +78,13 @@ def _payload_cache_path(file_path: str, fast_mode: bool, normals_policy: str, ha
             f"|{texture_stamp}|{str(normals_policy or NORMALS_POLICY_AUTO)}|{float(hard_angle_deg or 0.0):.3f}|{_PAYLOAD_CACHE_VERSION}"
         )
     key = hashlib.sha1(identity.encode("utf-8")).hexdigest()
-    return os.path.join(_PAYLOAD_CACHE_DIR, f"{key}.pkl")
+    return os.path.join(_PAYLOAD_CACHE_DIR, f"{_payload_cache_prefix(file_path)}_{key}.pkl")
+
+
+def _payload_cache_prefix(file_path: str) -> str:
+    # Entries of one model share a prefix, so they can be dropped without knowing the old stat.
+    norm = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
+    return hashlib.sha1(norm.encode("utf-8", errors="ignore")).hexdigest()[:16]
 
 
 def _texture_dirs_stamp(file_path: str) -> str:
@@ -105,6 +120,27 @@ def clear_payload_cache() -> int:
     return removed
 
 
+def invalidate_payload_cache(file_paths) -> int:
+    prefixes = tuple(f"{_payload_cache_prefix(path)}_" for path in file_paths or () if path)
+    cache_dir = os.path.abspath(_PAYLOAD_CACHE_DIR)
+    if not prefixes or not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.startswith(prefixes):
+            continue
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
 def _try_load_payload_cache(file_path: str, fast_mode: bool, normals_policy: str, hard_angle_deg: float):
     cache_path = _payload_cache_path(
         file_path,
@@ -174,6 +210,15 @@ def load_model_payload(
         )
 
     payload.debug_info = dict(payload.debug_info or {})
+    payload.mesh_stats = compute_mesh_stats(
+        payload.vertices,
+        payload.indices,
+        texcoords=payload.texcoords,
+        submeshes=payload.submeshes,
+        instance_groups=payload.instance_groups,
+        source_center=payload.debug_info.get("normalize_center") or (0.0, 0.0, 0.0),
+        source_scale=payload.debug_info.get("normalize_scale") or 1.0,
+    )
     payload.debug_info["cache_hit"] = False
     payload.debug_info["timing_cache_io_sec"] = round(float(time.perf_counter() - t0), 4)
     _try_save_payload_cache(
@@ -194,11 +239,11 @@ def _load_trimesh_payload(
 ) -> MeshPayload:
     scene_or_mesh = trimesh.load(file_path)
     if isinstance(scene_or_mesh, trimesh.Scene):
-        meshes = _extract_scene_meshes(scene_or_mesh)
-        if not meshes:
+        meshes, instanced = _extract_scene_meshes(scene_or_mesh)
+        if not meshes and not instanced:
             raise RuntimeError("Scene does not contain mesh geometry.")
 
-        loader_name = "trimesh_scene_single" if len(meshes) == 1 else "trimesh_scene_multi"
+        loader_name = "trimesh_scene_single" if len(meshes) + len(instanced) == 1 else "trimesh_scene_multi"
         combined_vertices, combined_indices, combined_normals, combined_texcoords = _combine_scene_meshes(meshes)
         vertices, indices, normals, texcoords, normal_meta = process_mesh_data(
             combined_vertices,
@@ -214,6 +259,9 @@ def _load_trimesh_payload(
         )
         if texcoords.ndim != 2 or texcoords.shape[1] != 2 or texcoords.shape[0] != vertices.shape[0]:
             texcoords = np.array([], dtype=np.float32)
+        if not meshes or vertices.size == 0:
+            # Instances only: take the normalization from their placed bounds instead.
+            normal_meta["normalize_center"], normal_meta["normalize_scale"] = _instanced_normalization(instanced)
 
         model_hint = os.path.splitext(os.path.basename(file_path))[0]
         texture_candidates = find_texture_candidates(file_path)
@@ -224,6 +272,15 @@ def _load_trimesh_payload(
             exact_base = _force_basecolor_match(texture_candidates, model_stem)
             if exact_base:
                 texture_sets[CHANNEL_BASECOLOR] = exact_base
+        scene_texture_paths = _select_texture_paths(texture_sets, hint_names=[model_hint, "scene"])
+        instance_groups = _build_instance_groups(
+            instanced,
+            scene_texture_paths,
+            normalization_matrix(normal_meta["normalize_center"], normal_meta["normalize_scale"]),
+            fast_mode=fast_mode,
+            normals_policy=normals_policy,
+            hard_angle_deg=hard_angle_deg,
+        )
         return MeshPayload(
             vertices=vertices,
             indices=indices,
@@ -237,15 +294,19 @@ def _load_trimesh_payload(
                     "object_name": "scene",
                     "material_name": "default",
                     "material_uid": "default:scene",
-                    "texture_paths": _select_texture_paths(texture_sets, hint_names=[model_hint, "scene"]),
+                    "texture_paths": scene_texture_paths,
                 }
             ],
             debug_info={
                 "loader": loader_name,
                 "uv_count": int(texcoords.shape[0]) if texcoords.ndim == 2 else 0,
                 "texture_candidates_count": len(texture_candidates),
+                "instance_groups": len(instance_groups),
+                "instance_count": int(sum(g["transforms"].shape[0] for g in instance_groups)),
+                "instanced_triangles": int(sum((g["indices"].size // 3) * g["transforms"].shape[0] for g in instance_groups)),
                 **normal_meta,
             },
+            instance_groups=instance_groups,
         )
 
     texcoords = _extract_trimesh_uv(scene_or_mesh)
@@ -294,10 +355,90 @@ def _load_trimesh_payload(
     )
 
 
-def _extract_scene_meshes(scene: trimesh.Scene):
-    # dump(concatenate=False) applies node transforms to geometry instances.
-    transformed = scene.dump(concatenate=False)
-    return [mesh for mesh in transformed if isinstance(mesh, trimesh.Trimesh)]
+def _extract_scene_meshes(scene: trimesh.Scene, min_copies: int = _INSTANCING_MIN_COPIES):
+    # Geometries used by few nodes are baked with their node transform (like scene.dump);
+    # heavily repeated ones are returned once with all their node transforms.
+    transforms_by_geometry = {}
+    for node_name in scene.graph.nodes_geometry:
+        transform, geometry_name = scene.graph[node_name]
+        if not isinstance(scene.geometry.get(geometry_name), trimesh.Trimesh):
+            continue
+        transforms_by_geometry.setdefault(geometry_name, []).append(np.asarray(transform, dtype=np.float64))
+
+    baked = []
+    instanced = []
+    for geometry_name, transforms in transforms_by_geometry.items():
+        geometry = scene.geometry[geometry_name]
+        if min_copies > 0 and len(transforms) >= min_copies:
+            instanced.append((str(geometry_name), geometry, np.stack(transforms).astype(np.float32)))
+            continue
+        for transform in transforms:
+            mesh = geometry.copy()
+            mesh.apply_transform(transform)
+            baked.append(mesh)
+    return baked, instanced
+
+
+def _instanced_normalization(instanced):
+    points = []
+    for _name, geometry, transforms in instanced:
+        local = np.asarray(geometry.vertices, dtype=np.float64).reshape(-1, 3)
+        if local.size == 0:
+            continue
+        lo = local.min(axis=0)
+        hi = local.max(axis=0)
+        corners = np.array([[hi[a] if (c >> a) & 1 else lo[a] for a in range(3)] + [1.0] for c in range(8)])
+        points.append(np.einsum("kij,cj->kci", np.asarray(transforms, dtype=np.float64), corners)[..., :3].reshape(-1, 3))
+    if not points:
+        return [0.0, 0.0, 0.0], 1.0
+    points = np.concatenate(points, axis=0)
+    center = points.mean(axis=0)
+    extent = float(np.max(np.linalg.norm(points - center, axis=1)))
+    return [float(v) for v in center], (extent if extent > 0 else 1.0)
+
+
+def _build_instance_groups(
+    instanced,
+    texture_paths,
+    scene_normalization=None,
+    fast_mode=False,
+    normals_policy=NORMALS_POLICY_AUTO,
+    hard_angle_deg=60.0,
+):
+    # Local geometry keeps its own space; the scene normalization goes into the transforms
+    # so instances land where the baked (normalized) geometry expects them.
+    normalize = np.identity(4) if scene_normalization is None else np.asarray(scene_normalization, dtype=np.float64)
+    groups = []
+    for geometry_name, geometry, transforms in instanced:
+        vertex_normals = np.asarray(getattr(geometry, "vertex_normals", []), dtype=np.float32)
+        vertices, indices, normals, texcoords = process_mesh_data(
+            geometry.vertices,
+            geometry.faces,
+            vertex_normals,
+            recompute_normals=not fast_mode,
+            normals_policy=normals_policy,
+            hard_angle_deg=hard_angle_deg,
+            fast_mode=fast_mode,
+            texcoords=_extract_trimesh_uv(geometry),
+            return_texcoords=True,
+            normalize=False,
+        )
+        if vertices.size == 0 or indices.size == 0:
+            continue
+        if texcoords.ndim != 2 or texcoords.shape[0] != vertices.shape[0]:
+            texcoords = np.array([], dtype=np.float32)
+        groups.append(
+            {
+                "name": geometry_name,
+                "vertices": vertices,
+                "indices": np.asarray(indices, dtype=np.uint32),
+                "normals": normals,
+                "texcoords": texcoords,
+                "transforms": np.ascontiguousarray(np.matmul(normalize, transforms), dtype=np.float32),
+                "texture_paths": dict(texture_paths or {}),
+            }
+        )
+    return groups
 
 
 def _combine_scene_meshes(meshes):
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from viewer.services.catalog_db import (
+    CatalogStore,
+    get_asset_categories_map,
+    get_asset_category_map,
+    get_catalog_store,
+    get_geometry_stats_map,
+    get_preview_paths_for_assets,
+    scan_and_index_directory,
+    set_asset_geometry_stats,
+    set_asset_preview,
+)
+
+
+_MODEL_EXTENSIONS = (".fbx", ".obj", ".glb", ".gltf")
+
+
+def make_synthetic_tree(root: str, count: int, per_dir: int = 500):
+    # Empty model files spread over nested folders, like a large asset share.
+    paths = []
+    for i in range(int(count)):
+        folder = os.path.join(root, f"lib_{i // (per_dir * 20):03d}", f"set_{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"asset_{i:06d}{_MODEL_EXTENSIONS[i % len(_MODEL_EXTENSIONS)]}")
+        with open(path, "wb") as fh:
+            fh.write(b"\0" * (i % 7))
+        paths.append(path)
+    return paths
+
+
+def _timed(label, fn, results):
+    t0 = time.perf_counter()
+    stats = fn()
+    elapsed = time.perf_counter() - t0
+    results.append({"step": label, "sec": round(elapsed, 3), "stats": stats})
+    print(f"[catalog-benchmark] {label}: {elapsed:.2f} s {stats}")
+    return stats
+
+
+def run_scan_benchmark(work_dir: str, count: int, churn: float = 0.01, lookup_budget_ms: float = 2000.0):
+    tree = os.path.join(work_dir, "tree")
+    db_path = os.path.join(work_dir, "catalog.db")
+    results = []
+    t0 = time.perf_counter()
+    paths = make_synthetic_tree(tree, count)
+    print(f"[catalog-benchmark] created {len(paths)} files in {time.perf_counter() - t0:.2f} s")
+
+    def scan():
+        summary = scan_and_index_directory(tree, _MODEL_EXTENSIONS, db_path=db_path)
+        return {k: summary[k] for k in ("seen", "new", "updated", "removed")}
+
+    _timed("initial scan", scan, results)
+    _timed("rescan unchanged", scan, results)
+
+    step = max(1, int(round(1.0 / max(churn, 1e-6))))
+    for path in paths[::step]:
+        with open(path, "ab") as fh:
+            fh.write(b"\1")
+    for path in paths[step // 2 :: step]:
+        os.remove(path)
+    _timed(f"rescan with {churn:.0%} modified + {churn:.0%} removed", scan, results)
+
+    # Previews and geometry stats for the modified (still existing) files, so those lookups
+    # have rows to find; removed files keep their asset rows.
+    seeded = paths[::step]
+    for path in seeded:
+        set_asset_preview(path, path + ".png", 64, 64, db_path=db_path)
+        set_asset_geometry_stats(path, 12, 1, {}, db_path=db_path)
+
+    # Per-path lookups for a whole folder: these used to bind one variable per path.
+    failures = []
+    for label, lookup, expected in (
+        ("previews", get_preview_paths_for_assets, len(seeded)),
+        ("primary categories", get_asset_category_map, len(paths)),
+        ("categories", get_asset_categories_map, len(paths)),
+        ("geometry stats", get_geometry_stats_map, len(seeded)),
+    ):
+        step_label = f"lookup {label} for {len(paths)} paths"
+        stats = _timed(step_label, lambda fn=lookup: {"rows": len(fn(paths, db_path=db_path))}, results)
+        elapsed_ms = results[-1]["sec"] * 1000.0
+        if stats["rows"] != expected:
+            failures.append(f"{step_label}: {stats['rows']} rows, expected {expected}")
+        if lookup_budget_ms and elapsed_ms > lookup_budget_ms:
+            failures.append(f"{step_label}: {elapsed_ms:.0f} ms over the {lookup_budget_ms:g} ms budget")
+
+    conn = get_catalog_store(db_path).connection()
+    counts = {
+        table: int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+        for table in ("assets", "geometries", "events")
+    }
+    return {
+        "files": len(paths),
+        "db_size_bytes": os.path.getsize(db_path),
+        "rows": counts,
+        "steps": results,
+        "failures": failures,
+    }
+
+
+def run_startup_benchmark(work_dir: str, size_mb: int, runs: int = 20):
+    # Opening an already migrated catalog must not depend on its size: it is a connection
+    # plus a user_version read. The file is padded with blobs to the requested size.
+    db_path = os.path.join(work_dir, "startup.db")
+    store = CatalogStore(db_path)
+    store.ensure_schema()
+    t0 = time.perf_counter()
+    with store.transaction() as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS bench_padding (data BLOB)")
+    chunk_mb = 16
+    while os.path.getsize(db_path) < size_mb * 1024 * 1024:
+        with store.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO bench_padding(data) VALUES(zeroblob(?))",
+                ((1024 * 1024,) for _ in range(chunk_mb)),
+            )
+    with store.transaction() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    store.close()
+    print(f"[catalog-benchmark] padded catalog to {os.path.getsize(db_path) / 2**20:.0f} MB in {time.perf_counter() - t0:.2f} s")
+
+    timings = []
+    for _ in range(max(1, int(runs))):
+        # A new store behaves like a fresh process: new connection, schema state unknown.
+        fresh = CatalogStore(db_path)
+        t1 = time.perf_counter()
+        fresh.ensure_schema()
+        timings.append((time.perf_counter() - t1) * 1000.0)
+        fresh.close()
+    timings.sort()
+    report = {
+        "db_size_bytes": os.path.getsize(db_path),
+        "runs": len(timings),
+        "median_ms": round(timings[len(timings) // 2], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+    print(f"[catalog-benchmark] startup on migrated catalog: median {report['median_ms']} ms, max {report['max_ms']} ms")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalog indexing benchmark on a synthetic asset tree.")
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--churn", type=float, default=0.01, help="share of files modified and removed before the last rescan")
+    parser.add_argument("--work-dir", default="", help="where to build the tree (default: a temp dir, removed afterwards)")
+    parser.add_argument("--json", default="", help="also write the report here")
+    parser.add_argument("--startup", action="store_true", help="measure catalog startup on a large migrated file instead")
+    parser.add_argument("--db-mb", type=int, default=1024, help="catalog size for --startup")
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="median startup budget for --startup")
+    parser.add_argument("--lookup-budget-ms", type=float, default=2000.0, help="budget per folder lookup (0 disables)")
+    args = parser.parse_args(argv)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="catalog_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        if args.startup:
+            report = run_startup_benchmark(work_dir, args.db_mb)
+        else:
+            report = run_scan_benchmark(work_dir, args.files, churn=args.churn, lookup_budget_ms=args.lookup_budget_ms)
+    finally:
+        get_catalog_store(os.path.join(work_dir, "catalog.db")).close()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+    if args.startup:
+        ok = report["median_ms"] < args.budget_ms
+        print(f"[catalog-benchmark] startup budget {args.budget_ms} ms: {'ok' if ok else 'exceeded'}")
+        return 0 if ok else 1
+    print(json.dumps(report["rows"]))
+    for failure in report["failures"]:
+        print(f"[catalog-benchmark] FAILED {failure}")
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import json
 import os
+import re
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 
@@ -14,118 +17,413 @@ def get_default_db_path():
     return os.path.join(root, "catalog.db")
 
 
+_SCHEMA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "docs", "schema_v1.sql"))
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-32000;",
+    "PRAGMA mmap_size=268435456;",
+)
+_SEARCH_COLUMNS = "name, path, categories, materials, textures"
+# bm25 weights per search column: a hit in the file name outranks one in a texture name.
+_SEARCH_WEIGHTS = "8.0, 2.0, 4.0, 3.0, 1.0"
+# Space-separated names of every category the asset belongs to (primary and linked).
+_SEARCH_CATEGORIES_SQL = """
+    COALESCE((
+        SELECT group_concat(c.name, ' ') FROM categories c
+        WHERE c.id IN (SELECT l.category_id FROM asset_category_links l WHERE l.asset_id = {asset_id})
+           OR c.id = (SELECT a2.category_id FROM assets a2 WHERE a2.id = {asset_id})
+    ), '')
+"""
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+class _PooledConnection:
+    # Lives in a thread-local slot; the connection closes when its thread goes away.
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __del__(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class CatalogStore:
+    # One store per database file: a connection per thread (kept open between calls, so
+    # sqlite's statement cache is reused) and the schema applied once per process.
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        # Every reader goes through here, so the file is migrated before any query touches it;
+        # after the first call per process this is a flag check.
+        if not self._schema_ready:
+            self.ensure_schema()
+        return self._thread_connection()
+
+    def _thread_connection(self):
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = _PooledConnection(self._connect())
+            self._local.slot = slot
+        return slot.conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def ensure_schema(self):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            # An up-to-date file costs one header read here; migrations run only when behind.
+            conn = self._thread_connection()
+            _migrate(conn)
+            _repair_search_index(conn)
+            self._schema_ready = True
+
+    def close(self):
+        # Closes the calling thread's connection; other threads close theirs on exit.
+        slot = getattr(self._local, "slot", None)
+        self._local.slot = None
+        if slot is not None:
+            slot.conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0, cached_statements=256, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.create_function("viewer_norm_path", 1, _norm_path, deterministic=True)
+        conn.create_function("viewer_dir_path", 1, _dir_path, deterministic=True)
+        return conn
+
+
+def get_catalog_store(db_path=None) -> CatalogStore:
+    key = os.path.abspath(db_path or get_default_db_path())
+    store = _STORES.get(key)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.get(key)
+            if store is None:
+                store = CatalogStore(key)
+                _STORES[key] = store
+    return store
+
+
 def init_catalog_db(db_path=None):
-    db_path = db_path or get_default_db_path()
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    schema_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "docs", "schema_v1.sql"))
-    if not os.path.isfile(schema_path):
-        raise RuntimeError(f"Schema file not found: {schema_path}")
+    # Cheap after the first call for a given file: the schema runs once per process.
+    store = get_catalog_store(db_path)
+    store.ensure_schema()
+    return store.db_path
+
+
+def _migrate(conn):
+    # Upgrades the file to _SCHEMA_VERSION one step at a time; each step runs in its own
+    # transaction together with the user_version bump, so a failed step leaves no trace.
+    version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+    if version >= _SCHEMA_VERSION:
+        return version
+    conn.execute("PRAGMA journal_mode=WAL;")
+    for target, step in _MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated the file while this one waited for the lock.
+            current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            if current < target:
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        version = max(version, target)
+    return version
+
+
+def _sql_statements(script):
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def _migrate_base_schema(conn):
+    if not os.path.isfile(_SCHEMA_PATH):
+        raise RuntimeError(f"Schema file not found: {_SCHEMA_PATH}")
+    with open(_SCHEMA_PATH, "r", encoding="utf-8") as f:
+        schema_sql = f.read()
+    # Statement by statement: executescript would commit the surrounding transaction.
+    for statement in _sql_statements(schema_sql):
+        conn.execute(statement)
+
+
+def _migrate_category_links(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS asset_category_links (
+            id INTEGER PRIMARY KEY,
+            asset_id INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            UNIQUE(asset_id, category_id),
+            FOREIGN KEY(asset_id) REFERENCES assets(id) ON DELETE CASCADE,
+            FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_category_id ON assets(category_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_categories_parent_id ON categories(parent_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_asset_category_links_asset ON asset_category_links(asset_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_asset_category_links_category ON asset_category_links(category_id)")
+
+
+def _migrate_scan_tables(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_asset_id ON events(asset_id, id)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catalog_dirs (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            ext_key TEXT NOT NULL,
+            files_json TEXT NOT NULL,
+            subdirs_json TEXT NOT NULL,
+            scanned_at TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    has_geometry_key = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_geometries_asset_file'"
+    ).fetchone()
+    if has_geometry_key is None:
+        # Older catalogs could hold duplicate geometry rows; keep the first before adding the key.
+        conn.execute(
+            "DELETE FROM geometries WHERE id NOT IN (SELECT MIN(id) FROM geometries GROUP BY asset_id, file_path)"
+        )
+        conn.execute("CREATE UNIQUE INDEX idx_geometries_asset_file ON geometries(asset_id, file_path)")
+
+
+def _migrate_search_index(conn):
+    # Search documents: one row per asset, path relative to the root it was indexed under.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS asset_search_docs (
+            asset_id INTEGER PRIMARY KEY,
+            root TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            path TEXT NOT NULL DEFAULT '',
+            categories TEXT NOT NULL DEFAULT '',
+            materials TEXT NOT NULL DEFAULT '',
+            textures TEXT NOT NULL DEFAULT '',
+            FOREIGN KEY(asset_id) REFERENCES assets(id) ON DELETE CASCADE
+        )
+        """
+    )
+    _create_search_table(conn)
 
-    conn = sqlite3.connect(db_path)
+
+def _create_search_table(conn):
+    # FTS index over asset_search_docs plus the triggers that keep it in sync; False when
+    # sqlite has no FTS5. The docs table is filled either way, so the index can be rebuilt later.
     try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
-        with open(schema_path, "r", encoding="utf-8") as f:
-            conn.executescript(f.read())
         conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS asset_category_links (
-                id INTEGER PRIMARY KEY,
-                asset_id INTEGER NOT NULL,
-                category_id INTEGER NOT NULL,
-                created_at TEXT NOT NULL,
-                UNIQUE(asset_id, category_id),
-                FOREIGN KEY(asset_id) REFERENCES assets(id) ON DELETE CASCADE,
-                FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS asset_search USING fts5(
+                {_SEARCH_COLUMNS},
+                content='asset_search_docs',
+                content_rowid='asset_id',
+                tokenize='unicode61',
+                prefix='2 3'
             )
             """
         )
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_category_id ON assets(category_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_categories_parent_id ON categories(parent_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_asset_category_links_asset ON asset_category_links(asset_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_asset_category_links_category ON asset_category_links(category_id)")
+    except sqlite3.OperationalError:
+        # sqlite built without FTS5: search falls back to substring matching in the UI.
+        return False
+    new_values = ", ".join(f"new.{c}" for c in _SEARCH_COLUMNS.split(", "))
+    old_values = ", ".join(f"old.{c}" for c in _SEARCH_COLUMNS.split(", "))
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS asset_search_docs_ai AFTER INSERT ON asset_search_docs BEGIN
+            INSERT INTO asset_search(rowid, {_SEARCH_COLUMNS}) VALUES (new.asset_id, {new_values});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS asset_search_docs_ad AFTER DELETE ON asset_search_docs BEGIN
+            INSERT INTO asset_search(asset_search, rowid, {_SEARCH_COLUMNS}) VALUES ('delete', old.asset_id, {old_values});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS asset_search_docs_au AFTER UPDATE ON asset_search_docs BEGIN
+            INSERT INTO asset_search(asset_search, rowid, {_SEARCH_COLUMNS}) VALUES ('delete', old.asset_id, {old_values});
+            INSERT INTO asset_search(rowid, {_SEARCH_COLUMNS}) VALUES (new.asset_id, {new_values});
+        END
+        """
+    )
+    return True
+
+
+def _repair_search_index(conn):
+    # A catalog migrated by an sqlite without FTS5 has the docs but no asset_search; once FTS5
+    # is available the index is created here and rebuilt from the docs.
+    found = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='asset_search'").fetchone()
+    if found is not None:
+        return False
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        created = _create_search_table(conn)
+        if created:
+            conn.execute("INSERT INTO asset_search(asset_search) VALUES('rebuild')")
         conn.commit()
-    finally:
-        conn.close()
-    return db_path
+    except BaseException:
+        conn.rollback()
+        raise
+    return created
+
+
+def _migrate_event_log(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_previews_asset_kind ON previews(asset_id, kind)")
+    # Latest event per asset, kept by a trigger: "was the last event a removal?" without
+    # touching events, and it survives compaction of the events it was derived from.
+    has_last_event = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='asset_last_event'"
+    ).fetchone()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS asset_last_event (
+            asset_id INTEGER PRIMARY KEY,
+            event_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_last_event_ai AFTER INSERT ON events
+        WHEN new.asset_id IS NOT NULL BEGIN
+            INSERT OR REPLACE INTO asset_last_event(asset_id, event_id, event_type, created_at)
+            VALUES (new.asset_id, new.id, new.event_type, new.created_at);
+        END
+        """
+    )
+    if has_last_event is None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO asset_last_event(asset_id, event_id, event_type, created_at)
+            SELECT e.asset_id, e.id, e.event_type, e.created_at
+            FROM events e
+            JOIN (SELECT asset_id, MAX(id) AS id FROM events WHERE asset_id IS NOT NULL GROUP BY asset_id) m
+                ON m.id = e.id
+            """
+        )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_daily (
+            day TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY(day, event_type)
+        ) WITHOUT ROWID
+        """
+    )
 
 
-def scan_and_index_directory(directory, model_extensions, db_path=None, scanned_paths=None):
+def _migrate_norm_paths(conn):
+    # assets.norm_path is the normcase(normpath(abspath)) key every consumer compares by;
+    # dir_id points at its folder. Both are written by the indexer, older catalogs are filled here.
+    conn.execute("CREATE TABLE IF NOT EXISTS asset_dirs (id INTEGER PRIMARY KEY, norm_path TEXT NOT NULL UNIQUE)")
+    asset_columns = {row[1] for row in conn.execute("PRAGMA table_info(assets)").fetchall()}
+    if "norm_path" not in asset_columns:
+        conn.execute("ALTER TABLE assets ADD COLUMN norm_path TEXT NULL")
+        conn.execute("ALTER TABLE assets ADD COLUMN dir_id INTEGER NULL REFERENCES asset_dirs(id)")
+        conn.execute("UPDATE assets SET norm_path = viewer_norm_path(source_path)")
+        conn.execute("INSERT OR IGNORE INTO asset_dirs(norm_path) SELECT DISTINCT viewer_dir_path(norm_path) FROM assets")
+        conn.execute(
+            "UPDATE assets SET dir_id = (SELECT d.id FROM asset_dirs d WHERE d.norm_path = viewer_dir_path(assets.norm_path))"
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_norm_path ON assets(norm_path)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_dir_id ON assets(dir_id)")
+
+
+# Ordered (user_version, step) pairs; new schema changes are appended, never edited in place.
+# Catalogs created before versioning report user_version 0 while already holding most of
+# these objects, so every step has to be safe to replay on top of its own result.
+_MIGRATIONS = (
+    (1, _migrate_base_schema),
+    (2, _migrate_category_links),
+    (3, _migrate_scan_tables),
+    (4, _migrate_search_index),
+    (5, _migrate_event_log),
+    (6, _migrate_norm_paths),
+)
+_SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def scan_and_index_directory(directory, model_extensions, db_path=None, scanned_paths=None, scanned_items=None):
+    # scanned_items: crawl results keyed by normalized path (see viewer.services.fs_crawler),
+    # indexed as-is; scanned_paths are stat'ed here; with neither the tree is crawled in full.
     db_path = init_catalog_db(db_path)
     root = os.path.normcase(os.path.normpath(os.path.abspath(directory)))
     now = _utc_now_iso()
     t0 = time.perf_counter()
 
-    scanned = {}
-    if scanned_paths is None:
-        iter_paths = []
-        for cur_root, _, names in os.walk(root):
-            for name in names:
-                if not name.lower().endswith(model_extensions):
-                    continue
-                iter_paths.append(os.path.abspath(os.path.join(cur_root, name)))
-    else:
-        iter_paths = [os.path.abspath(p) for p in scanned_paths if p]
-
     root_prefix = root + os.sep
-    for full_path in iter_paths:
-        name = os.path.basename(full_path)
-        if not name.lower().endswith(model_extensions):
-            continue
-        norm = os.path.normcase(os.path.normpath(full_path))
-        if norm != root and not norm.startswith(root_prefix):
-            continue
-        try:
-            st = os.stat(full_path)
-        except OSError:
-            continue
-        scanned[norm] = {
-            "path": full_path,
-            "name": name,
-            "size": int(st.st_size),
-            "mtime": float(st.st_mtime),
-            "ext": os.path.splitext(name)[1].lower().lstrip("."),
-        }
-
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
-        existing = _load_existing_assets(conn, root)
-        stats = {"new": 0, "updated": 0, "removed": 0, "seen": len(scanned)}
-
-        for norm_path, item in scanned.items():
-            row = existing.get(norm_path)
-            if row is None:
-                asset_id = _insert_asset(conn, item["name"], item["path"], now)
-                _upsert_geometry(conn, asset_id, item, now)
-                _insert_event(conn, asset_id, "new_asset", {"path": item["path"], "size": item["size"], "mtime": item["mtime"]}, now)
-                stats["new"] += 1
+    scanned = {}
+    if scanned_items is not None:
+        for norm, item in scanned_items.items():
+            if norm == root or norm.startswith(root_prefix):
+                scanned[norm] = item
+    elif scanned_paths is not None:
+        for full_path in (os.path.abspath(p) for p in scanned_paths if p):
+            name = os.path.basename(full_path)
+            if not name.lower().endswith(model_extensions):
                 continue
-
-            changed = (row["size_bytes"] is None or row["mtime"] is None or int(row["size_bytes"]) != item["size"] or abs(float(row["mtime"]) - item["mtime"]) > 1e-6)
-            if changed:
-                conn.execute("UPDATE assets SET name=?, updated_at=?, last_seen_at=? WHERE id=?", (item["name"], now, now, row["asset_id"]))
-                _upsert_geometry(conn, row["asset_id"], item, now)
-                _insert_event(conn, row["asset_id"], "updated_asset", {"path": item["path"], "size": item["size"], "mtime": item["mtime"]}, now)
-                stats["updated"] += 1
-            else:
-                conn.execute("UPDATE assets SET last_seen_at=? WHERE id=?", (now, row["asset_id"]))
-
-        scanned_paths = set(scanned.keys())
-        for norm_path, row in existing.items():
-            if norm_path in scanned_paths:
+            norm = os.path.normcase(os.path.normpath(full_path))
+            if norm != root and not norm.startswith(root_prefix):
                 continue
-            # Log removal only once until file appears again.
-            last_event = conn.execute(
-                "SELECT event_type FROM events WHERE asset_id=? ORDER BY id DESC LIMIT 1",
-                (row["asset_id"],),
-            ).fetchone()
-            if last_event is None or last_event["event_type"] != "removed_asset":
-                _insert_event(conn, row["asset_id"], "removed_asset", {"path": row["source_path"]}, now)
-                stats["removed"] += 1
-            conn.execute("UPDATE assets SET updated_at=?, last_seen_at=? WHERE id=?", (now, now, row["asset_id"]))
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            scanned[norm] = {
+                "path": full_path,
+                "name": name,
+                "size": int(st.st_size),
+                "mtime": float(st.st_mtime),
+                "ext": os.path.splitext(name)[1].lower().lstrip("."),
+            }
+    else:
+        from viewer.services.fs_crawler import crawl_directory
+
+        scanned = crawl_directory(directory, model_extensions, db_path=db_path, incremental=False).items
 
+    with get_catalog_store(db_path).transaction() as conn:
+        stats = _apply_scan(conn, root, scanned, now)
         _insert_event(
             conn,
             None,
@@ -140,31 +438,165 @@ def scan_and_index_directory(directory, model_extensions, db_path=None, scanned_
             now,
         )
 
-        conn.commit()
-    finally:
-        conn.close()
-
     stats["duration_sec"] = round(time.perf_counter() - t0, 3)
     stats["root"] = root
     return stats
 
 
+def index_file_changes(changed_items, removed_paths, db_path=None, root=None):
+    # Incremental counterpart of scan_and_index_directory for watcher batches: only the
+    # touched files are written, stats derived from the old file contents are dropped.
+    db_path = init_catalog_db(db_path)
+    root_norm = _norm_path(root) if root else ""
+    now = _utc_now_iso()
+    stats = {"new": 0, "updated": 0, "removed": 0}
+    with get_catalog_store(db_path).transaction() as conn:
+        for item in (changed_items or {}).values():
+            row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (item["path"],)).fetchone()
+            if row is None:
+                asset_id = _insert_asset(conn, item["name"], item["path"], now)
+                event_type = "new_asset"
+                stats["new"] += 1
+            else:
+                asset_id = int(row["id"])
+                conn.execute(
+                    "UPDATE assets SET name=?, updated_at=?, last_seen_at=? WHERE id=?",
+                    (item["name"], now, now, asset_id),
+                )
+                event_type = "updated_asset"
+                stats["updated"] += 1
+            _upsert_geometry(conn, asset_id, item, now)
+            conn.execute(
+                "UPDATE geometries SET polycount=NULL, uv_sets=NULL, bbox_json=NULL WHERE asset_id=? AND file_path=?",
+                (asset_id, item["path"]),
+            )
+            if root_norm:
+                _upsert_search_doc(conn, asset_id, root_norm, item["path"])
+            _insert_event(conn, asset_id, event_type, {"path": item["path"], "size": item["size"], "mtime": item["mtime"]}, now)
+
+        for source_path in removed_paths or ():
+            row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (os.path.abspath(source_path),)).fetchone()
+            if row is None:
+                continue
+            asset_id = int(row["id"])
+            last_event = conn.execute(
+                "SELECT event_type FROM asset_last_event WHERE asset_id=?",
+                (asset_id,),
+            ).fetchone()
+            if last_event is not None and last_event["event_type"] == "removed_asset":
+                continue
+            _insert_event(conn, asset_id, "removed_asset", {"path": os.path.abspath(source_path)}, now)
+            conn.execute("UPDATE assets SET updated_at=?, last_seen_at=? WHERE id=?", (now, now, asset_id))
+            stats["removed"] += 1
+    return stats
+
+
+def clear_asset_previews(source_paths, db_path=None):
+    # Forgets previews of the given models and returns their image paths for deletion.
+    db_path = db_path or get_default_db_path()
+    if not os.path.isfile(db_path) or not source_paths:
+        return []
+    normalized = [_norm_path(p) for p in source_paths if p]
+    if not normalized:
+        return []
+    with get_catalog_store(db_path).transaction() as conn, _path_lookup(conn, normalized) as lookup:
+        rows = conn.execute(
+            f"""
+            SELECT p.id, p.file_path
+            FROM {lookup} l
+            JOIN assets a ON a.norm_path = l.path
+            JOIN previews p ON p.asset_id = a.id
+            """
+        ).fetchall()
+        conn.executemany("DELETE FROM previews WHERE id=?", ((int(r["id"]),) for r in rows))
+    return [r["file_path"] for r in rows if r["file_path"]]
+
+
+def get_directory_cache(root, db_path=None):
+    # Per-directory listings from the last crawl under root, keyed by normalized directory path.
+    db_path = db_path or get_default_db_path()
+    if not os.path.isfile(db_path):
+        return {}
+    root_norm = _norm_path(root)
+    conn = get_catalog_store(init_catalog_db(db_path)).connection()
+    where, params = _under_root("path", root_norm)
+    rows = conn.execute(
+        f"SELECT path, mtime, ext_key, files_json, subdirs_json FROM catalog_dirs WHERE {where}",
+        params,
+    ).fetchall()
+    out = {}
+    for row in rows:
+        try:
+            files = json.loads(row["files_json"] or "[]")
+            subdirs = json.loads(row["subdirs_json"] or "[]")
+        except ValueError:
+            continue
+        out[row["path"]] = {
+            "mtime": float(row["mtime"]),
+            "ext_key": row["ext_key"] or "",
+            "files": files,
+            "subdirs": subdirs,
+        }
+    return out
+
+
+def save_directory_cache(root, entries, db_path=None, removed=None):
+    # Upserts directory listings. Without removed, every cached listing under root is replaced;
+    # with it, only those directories are dropped, so unchanged rows are never rewritten.
+    db_path = init_catalog_db(db_path)
+    root_norm = _norm_path(root)
+    now = _utc_now_iso()
+    with get_catalog_store(db_path).transaction() as conn:
+        if removed is None:
+            where, params = _under_root("path", root_norm)
+            conn.execute(f"DELETE FROM catalog_dirs WHERE {where}", params)
+        else:
+            conn.executemany("DELETE FROM catalog_dirs WHERE path = ?", ((norm,) for norm in removed))
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO catalog_dirs(path, mtime, ext_key, files_json, subdirs_json, scanned_at)
+            VALUES(?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    norm,
+                    float(entry["mtime"]),
+                    entry.get("ext_key", ""),
+                    json.dumps(entry.get("files") or [], ensure_ascii=False),
+                    json.dumps(entry.get("subdirs") or [], ensure_ascii=False),
+                    now,
+                )
+                for norm, entry in entries.items()
+            ),
+        )
+
+
 def get_recent_events(limit=50, db_path=None, root=None):
     db_path = db_path or get_default_db_path()
     if not os.path.isfile(db_path):
         return []
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        params = []
-        where = ""
-        if root:
-            root_norm = os.path.normcase(os.path.normpath(os.path.abspath(root)))
-            where = "WHERE a.source_path = ? OR a.source_path LIKE ?"
-            params.extend([root_norm, root_norm + os.sep + "%"])
-
+    conn = get_catalog_store(db_path).connection()
+    params = []
+    if root:
+        # Driven from the assets under root, each reaching its events through
+        # idx_events_asset_id, instead of walking the whole log newest-first.
+        where, params = _under_root("a.norm_path", _norm_path(root))
         query = f"""
+            SELECT
+                e.id,
+                e.event_type,
+                e.payload_json,
+                e.created_at,
+                a.source_path
+            FROM assets a
+            JOIN events e ON e.asset_id = a.id
+            WHERE {where}
+            ORDER BY e.id DESC
+            LIMIT ?
+        """
+    else:
+        query = """
             SELECT
                 e.id,
                 e.event_type,
@@ -173,14 +605,11 @@ def get_recent_events(limit=50, db_path=None, root=None):
                 a.source_path
             FROM events e
             LEFT JOIN assets a ON a.id = e.asset_id
-            {where}
             ORDER BY e.id DESC
             LIMIT ?
         """
-        params.append(int(limit))
-        rows = conn.execute(query, params).fetchall()
-    finally:
-        conn.close()
+    params.append(int(limit))
+    rows = conn.execute(query, params).fetchall()
 
     out = []
     for r in rows:
@@ -196,24 +625,97 @@ def get_recent_events(limit=50, db_path=None, root=None):
     return out
 
 
+def compact_events(retention_days, db_path=None, export_path=None):
+    # Retention job: events older than retention_days are rolled into per-day counts
+    # (event_daily) and deleted; with export_path they are first appended there as JSONL.
+    db_path = db_path or get_default_db_path()
+    days = int(retention_days or 0)
+    stats = {"removed": 0, "exported": 0, "cutoff": ""}
+    if days <= 0 or not os.path.isfile(db_path):
+        return stats
+    cutoff = datetime.fromtimestamp(time.time() - days * 86400, timezone.utc).isoformat()
+    stats["cutoff"] = cutoff
+    with get_catalog_store(init_catalog_db(db_path)).transaction() as conn:
+        if conn.execute("SELECT 1 FROM events WHERE created_at < ? LIMIT 1", (cutoff,)).fetchone() is None:
+            return stats
+        if export_path:
+            os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+            rows = conn.execute(
+                """
+                SELECT e.id, e.asset_id, a.source_path, e.event_type, e.payload_json, e.created_at
+                FROM events e
+                LEFT JOIN assets a ON a.id = e.asset_id
+                WHERE e.created_at < ?
+                ORDER BY e.id
+                """,
+                (cutoff,),
+            )
+            with open(export_path, "a", encoding="utf-8") as fh:
+                for r in rows:
+                    try:
+                        payload = json.loads(r["payload_json"]) if r["payload_json"] else None
+                    except ValueError:
+                        payload = r["payload_json"]
+                    record = {
+                        "id": int(r["id"]),
+                        "asset_id": r["asset_id"],
+                        "source_path": r["source_path"] or "",
+                        "event_type": r["event_type"] or "",
+                        "payload": payload,
+                        "created_at": r["created_at"] or "",
+                    }
+                    fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    stats["exported"] += 1
+        conn.execute(
+            """
+            INSERT INTO event_daily(day, event_type, count)
+            SELECT substr(created_at, 1, 10), event_type, COUNT(*)
+            FROM events
+            WHERE created_at < ?
+            GROUP BY 1, 2
+            ON CONFLICT(day, event_type) DO UPDATE SET count = count + excluded.count
+            """,
+            (cutoff,),
+        )
+        stats["removed"] = conn.execute("DELETE FROM events WHERE created_at < ?", (cutoff,)).rowcount
+    return stats
+
+
+def get_event_daily_counts(db_path=None, since_day=None):
+    # Per-day event counts: compacted days from event_daily plus the days still in events.
+    db_path = db_path or get_default_db_path()
+    if not os.path.isfile(db_path):
+        return []
+    conn = get_catalog_store(init_catalog_db(db_path)).connection()
+    rows = conn.execute(
+        """
+        SELECT day, event_type, SUM(count) AS count FROM (
+            SELECT day, event_type, count FROM event_daily
+            UNION ALL
+            SELECT substr(created_at, 1, 10), event_type, COUNT(*) FROM events GROUP BY 1, 2
+        )
+        WHERE day >= ?
+        GROUP BY day, event_type
+        ORDER BY day, event_type
+        """,
+        (str(since_day or ""),),
+    ).fetchall()
+    return [{"day": r["day"], "event_type": r["event_type"], "count": int(r["count"])} for r in rows]
+
+
 def get_favorite_paths(root=None, db_path=None):
     db_path = db_path or get_default_db_path()
     if not os.path.isfile(db_path):
         return set()
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        params = []
-        where = "WHERE a.favorite = 1"
-        if root:
-            root_norm = os.path.normcase(os.path.normpath(os.path.abspath(root)))
-            where += " AND (a.source_path = ? OR a.source_path LIKE ?)"
-            params.extend([root_norm, root_norm + os.sep + "%"])
-        rows = conn.execute(f"SELECT a.source_path FROM assets a {where}", params).fetchall()
-    finally:
-        conn.close()
-    return {os.path.normcase(os.path.normpath(os.path.abspath(r["source_path"]))) for r in rows}
+    conn = get_catalog_store(db_path).connection()
+    params = []
+    where = "WHERE a.favorite = 1"
+    if root:
+        root_where, params = _under_root("a.norm_path", _norm_path(root))
+        where += f" AND {root_where}"
+    rows = conn.execute(f"SELECT a.norm_path FROM assets a {where}", params).fetchall()
+    return {r["norm_path"] for r in rows}
 
 
 def set_asset_favorite(source_path, favorite, db_path=None):
@@ -229,20 +731,10 @@ def set_asset_favorite(source_path, favorite, db_path=None):
         size_bytes = None
         mtime = None
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (source_path,)).fetchone()
         if row is None:
-            cur = conn.execute(
-                """
-                INSERT INTO assets(name, source_path, favorite, created_at, updated_at, last_seen_at)
-                VALUES(?, ?, ?, ?, ?, ?)
-                """,
-                (os.path.basename(source_path), source_path, int(bool(favorite)), now, now, now),
-            )
-            asset_id = int(cur.lastrowid)
+            asset_id = _insert_asset(conn, os.path.basename(source_path), source_path, now, favorite=favorite)
         else:
             asset_id = int(row["id"])
             conn.execute(
@@ -251,24 +743,17 @@ def set_asset_favorite(source_path, favorite, db_path=None):
             )
 
         if size_bytes is not None and mtime is not None:
-            g = conn.execute(
-                "SELECT id FROM geometries WHERE asset_id=? AND file_path=? LIMIT 1",
-                (asset_id, source_path),
-            ).fetchone()
-            ext = os.path.splitext(source_path)[1].lower().lstrip(".")
-            if g is None:
-                conn.execute(
-                    """
-                    INSERT INTO geometries(asset_id, file_path, format, size_bytes, mtime, hash_fast, created_at)
-                    VALUES(?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (asset_id, source_path, ext, size_bytes, mtime, f"{size_bytes}:{mtime:.6f}", now),
-                )
-            else:
-                conn.execute(
-                    "UPDATE geometries SET format=?, size_bytes=?, mtime=?, hash_fast=? WHERE id=?",
-                    (ext, size_bytes, mtime, f"{size_bytes}:{mtime:.6f}", int(g["id"])),
-                )
+            _upsert_geometry(
+                conn,
+                asset_id,
+                {
+                    "path": source_path,
+                    "ext": os.path.splitext(source_path)[1].lower().lstrip("."),
+                    "size": size_bytes,
+                    "mtime": mtime,
+                },
+                now,
+            )
 
         _insert_event(
             conn,
@@ -277,9 +762,6 @@ def set_asset_favorite(source_path, favorite, db_path=None):
             {"path": source_path, "favorite": bool(favorite), "norm": norm},
             now,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def get_preview_paths_for_assets(source_paths, db_path=None, kind="thumb"):
@@ -287,32 +769,29 @@ def get_preview_paths_for_assets(source_paths, db_path=None, kind="thumb"):
     if not os.path.isfile(db_path) or not source_paths:
         return {}
 
-    normalized = [os.path.abspath(p) for p in source_paths if p]
+    normalized = [_norm_path(p) for p in source_paths if p]
     if not normalized:
         return {}
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        placeholders = ",".join(["?"] * len(normalized))
-        query = f"""
-            SELECT a.source_path, p.file_path
-            FROM assets a
+    with get_catalog_store(db_path).transaction() as conn, _path_lookup(conn, normalized) as lookup:
+        rows = conn.execute(
+            f"""
+            SELECT a.norm_path, p.file_path
+            FROM {lookup} l
+            JOIN assets a ON a.norm_path = l.path
             JOIN previews p ON p.asset_id = a.id
-            WHERE p.kind = ? AND a.source_path IN ({placeholders})
+            WHERE p.kind = ?
             ORDER BY p.id DESC
-        """
-        rows = conn.execute(query, [kind] + normalized).fetchall()
-    finally:
-        conn.close()
+            """,
+            (kind,),
+        ).fetchall()
 
     out = {}
     for row in rows:
-        source_path = row["source_path"] or ""
+        norm = row["norm_path"] or ""
         preview_path = row["file_path"] or ""
-        if not source_path or not preview_path:
+        if not norm or not preview_path:
             continue
-        norm = os.path.normcase(os.path.normpath(os.path.abspath(source_path)))
         if norm not in out:
             out[norm] = preview_path
     return out
@@ -323,20 +802,10 @@ def set_asset_preview(source_path, preview_path, width=None, height=None, kind="
     source_path = os.path.abspath(source_path)
     now = _utc_now_iso()
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (source_path,)).fetchone()
         if row is None:
-            cur = conn.execute(
-                """
-                INSERT INTO assets(name, source_path, created_at, updated_at, last_seen_at)
-                VALUES(?, ?, ?, ?, ?)
-                """,
-                (os.path.basename(source_path), source_path, now, now, now),
-            )
-            asset_id = int(cur.lastrowid)
+            asset_id = _insert_asset(conn, os.path.basename(source_path), source_path, now)
         else:
             asset_id = int(row["id"])
             conn.execute(
@@ -352,9 +821,78 @@ def set_asset_preview(source_path, preview_path, width=None, height=None, kind="
             """,
             (asset_id, kind, preview_path, width, height, now),
         )
-        conn.commit()
-    finally:
-        conn.close()
+
+
+def set_asset_geometry_stats(source_path, polycount, uv_sets, bbox, db_path=None):
+    # Stores loader MeshStats (see viewer.utils.geometry_utils) on the asset's geometry row.
+    db_path = init_catalog_db(db_path)
+    source_path = os.path.abspath(source_path)
+    now = _utc_now_iso()
+    try:
+        st = os.stat(source_path)
+        size_bytes = int(st.st_size)
+        mtime = float(st.st_mtime)
+    except OSError:
+        return
+
+    with get_catalog_store(db_path).transaction() as conn:
+        asset_id = _ensure_asset_id(conn, source_path, now)
+        _upsert_geometry(
+            conn,
+            asset_id,
+            {
+                "path": source_path,
+                "ext": os.path.splitext(source_path)[1].lower().lstrip("."),
+                "size": size_bytes,
+                "mtime": mtime,
+            },
+            now,
+        )
+        conn.execute(
+            "UPDATE geometries SET polycount=?, uv_sets=?, bbox_json=? WHERE asset_id=? AND file_path=?",
+            (
+                int(polycount),
+                int(uv_sets),
+                json.dumps(bbox or {}, ensure_ascii=False),
+                asset_id,
+                source_path,
+            ),
+        )
+
+
+def get_geometry_stats_map(source_paths, db_path=None):
+    db_path = db_path or get_default_db_path()
+    if not os.path.isfile(db_path) or not source_paths:
+        return {}
+    normalized = [_norm_path(p) for p in source_paths if p]
+    if not normalized:
+        return {}
+    with get_catalog_store(db_path).transaction() as conn, _path_lookup(conn, normalized) as lookup:
+        rows = conn.execute(
+            f"""
+            SELECT a.norm_path, g.polycount, g.uv_sets, g.bbox_json, g.mtime
+            FROM {lookup} l
+            JOIN assets a ON a.norm_path = l.path
+            JOIN geometries g ON g.asset_id = a.id AND g.file_path = a.source_path
+            WHERE g.polycount IS NOT NULL
+            """
+        ).fetchall()
+    out = {}
+    for row in rows:
+        norm = row["norm_path"] or ""
+        if not norm:
+            continue
+        try:
+            bbox = json.loads(row["bbox_json"] or "{}")
+        except ValueError:
+            bbox = {}
+        out[norm] = {
+            "polycount": int(row["polycount"]),
+            "uv_sets": int(row["uv_sets"] or 0),
+            "bbox": bbox,
+            "mtime": row["mtime"],
+        }
+    return out
 
 
 def get_asset_texture_overrides(source_path, db_path=None):
@@ -363,21 +901,17 @@ def get_asset_texture_overrides(source_path, db_path=None):
         return {}
     source_path = os.path.abspath(source_path)
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        row = conn.execute(
-            """
-            SELECT o.overrides_json
-            FROM assets a
-            JOIN asset_texture_overrides o ON o.asset_id = a.id
-            WHERE a.source_path = ?
-            LIMIT 1
-            """,
-            (source_path,),
-        ).fetchone()
-    finally:
-        conn.close()
+    conn = get_catalog_store(db_path).connection()
+    row = conn.execute(
+        """
+        SELECT o.overrides_json
+        FROM assets a
+        JOIN asset_texture_overrides o ON o.asset_id = a.id
+        WHERE a.source_path = ?
+        LIMIT 1
+        """,
+        (source_path,),
+    ).fetchone()
 
     if row is None or not row["overrides_json"]:
         return {}
@@ -396,10 +930,7 @@ def set_asset_texture_overrides(source_path, overrides, db_path=None):
     payload = overrides if isinstance(overrides, dict) else {}
     now = _utc_now_iso()
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         asset_id = _ensure_asset_id(conn, source_path, now)
         if payload:
             conn.execute(
@@ -428,23 +959,16 @@ def set_asset_texture_overrides(source_path, overrides, db_path=None):
                 {"path": source_path},
                 now,
             )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def get_categories_tree(db_path=None):
     db_path = db_path or get_default_db_path()
     if not os.path.isfile(db_path):
         return []
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        rows = conn.execute(
-            "SELECT id, name, parent_id FROM categories ORDER BY COALESCE(parent_id, 0), lower(name)"
-        ).fetchall()
-    finally:
-        conn.close()
+    conn = get_catalog_store(db_path).connection()
+    rows = conn.execute(
+        "SELECT id, name, parent_id FROM categories ORDER BY COALESCE(parent_id, 0), lower(name)"
+    ).fetchall()
     return [
         {
             "id": int(r["id"]),
@@ -461,28 +985,23 @@ def create_category(name: str, parent_id=None, db_path=None):
     if not text:
         raise RuntimeError("Category name is empty")
     now = _utc_now_iso()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     try:
-        conn.execute("PRAGMA foreign_keys=ON;")
-        cur = conn.execute(
-            "INSERT INTO categories(name, parent_id) VALUES(?, ?)",
-            (text, int(parent_id) if parent_id else None),
-        )
-        category_id = int(cur.lastrowid)
-        _insert_event(
-            conn,
-            None,
-            "category_created",
-            {"category_id": category_id, "name": text, "parent_id": (int(parent_id) if parent_id else None)},
-            now,
-        )
-        conn.commit()
-        return category_id
+        with get_catalog_store(db_path).transaction() as conn:
+            cur = conn.execute(
+                "INSERT INTO categories(name, parent_id) VALUES(?, ?)",
+                (text, int(parent_id) if parent_id else None),
+            )
+            category_id = int(cur.lastrowid)
+            _insert_event(
+                conn,
+                None,
+                "category_created",
+                {"category_id": category_id, "name": text, "parent_id": (int(parent_id) if parent_id else None)},
+                now,
+            )
+            return category_id
     except sqlite3.IntegrityError as exc:
         raise RuntimeError(f"Category already exists: {text}") from exc
-    finally:
-        conn.close()
 
 
 def rename_category(category_id: int, new_name: str, db_path=None):
@@ -492,36 +1011,29 @@ def rename_category(category_id: int, new_name: str, db_path=None):
     if not text:
         raise RuntimeError("Category name is empty")
     now = _utc_now_iso()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     try:
-        conn.execute("PRAGMA foreign_keys=ON;")
-        row = conn.execute("SELECT id, parent_id, name FROM categories WHERE id=?", (cid,)).fetchone()
-        if row is None:
-            raise RuntimeError("Category not found")
-        conn.execute("UPDATE categories SET name=? WHERE id=?", (text, cid))
-        _insert_event(
-            conn,
-            None,
-            "category_renamed",
-            {"category_id": cid, "old_name": str(row["name"] or ""), "new_name": text, "parent_id": row["parent_id"]},
-            now,
-        )
-        conn.commit()
+        with get_catalog_store(db_path).transaction() as conn:
+            row = conn.execute("SELECT id, parent_id, name FROM categories WHERE id=?", (cid,)).fetchone()
+            if row is None:
+                raise RuntimeError("Category not found")
+            conn.execute("UPDATE categories SET name=? WHERE id=?", (text, cid))
+            _refresh_search_categories(conn, _category_asset_ids(conn, [cid]))
+            _insert_event(
+                conn,
+                None,
+                "category_renamed",
+                {"category_id": cid, "old_name": str(row["name"] or ""), "new_name": text, "parent_id": row["parent_id"]},
+                now,
+            )
     except sqlite3.IntegrityError as exc:
         raise RuntimeError(f"Category already exists: {text}") from exc
-    finally:
-        conn.close()
 
 
 def delete_category(category_id: int, db_path=None):
     db_path = init_catalog_db(db_path)
     cid = int(category_id)
     now = _utc_now_iso()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         rows = conn.execute("SELECT id, parent_id, name FROM categories").fetchall()
         if not rows:
             return
@@ -541,8 +1053,10 @@ def delete_category(category_id: int, db_path=None):
             to_delete.append(cur)
             stack.extend(children.get(cur, []))
         placeholders = ",".join(["?"] * len(to_delete))
+        affected = _category_asset_ids(conn, to_delete)
         conn.execute(f"UPDATE assets SET category_id=NULL WHERE category_id IN ({placeholders})", to_delete)
         conn.execute(f"DELETE FROM categories WHERE id IN ({placeholders})", to_delete)
+        _refresh_search_categories(conn, affected)
         _insert_event(
             conn,
             None,
@@ -550,9 +1064,6 @@ def delete_category(category_id: int, db_path=None):
             {"category_id": cid, "name": names.get(cid, ""), "deleted_ids": to_delete},
             now,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def set_asset_category(source_path: str, category_id=None, db_path=None, append=True):
@@ -562,10 +1073,7 @@ def set_asset_category(source_path: str, category_id=None, db_path=None, append=
     source_path = os.path.abspath(source_path)
     now = _utc_now_iso()
     category_value = int(category_id) if category_id else None
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         asset_id = _ensure_asset_id(conn, source_path, now)
         if category_value is None:
             conn.execute("DELETE FROM asset_category_links WHERE asset_id=?", (asset_id,))
@@ -590,6 +1098,7 @@ def set_asset_category(source_path: str, category_id=None, db_path=None, append=
                 )
             else:
                 conn.execute("UPDATE assets SET updated_at=?, last_seen_at=? WHERE id=?", (now, now, asset_id))
+        _refresh_search_categories(conn, [asset_id])
         _insert_event(
             conn,
             asset_id,
@@ -597,9 +1106,6 @@ def set_asset_category(source_path: str, category_id=None, db_path=None, append=
             {"path": source_path, "category_id": category_value, "append": bool(append)},
             now,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def clear_asset_categories(source_path: str, db_path=None):
@@ -608,10 +1114,7 @@ def clear_asset_categories(source_path: str, db_path=None):
         return
     source_path = os.path.abspath(source_path)
     now = _utc_now_iso()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (source_path,)).fetchone()
         if row is None:
             return
@@ -621,6 +1124,7 @@ def clear_asset_categories(source_path: str, db_path=None):
             "UPDATE assets SET category_id=NULL, updated_at=?, last_seen_at=? WHERE id=?",
             (now, now, asset_id),
         )
+        _refresh_search_categories(conn, [asset_id])
         _insert_event(
             conn,
             asset_id,
@@ -628,9 +1132,6 @@ def clear_asset_categories(source_path: str, db_path=None):
             {"path": source_path},
             now,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def remove_asset_category(source_path: str, category_id: int, db_path=None):
@@ -642,10 +1143,7 @@ def remove_asset_category(source_path: str, category_id: int, db_path=None):
     if cid <= 0:
         return
     now = _utc_now_iso()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys=ON;")
+    with get_catalog_store(db_path).transaction() as conn:
         row = conn.execute(
             "SELECT id, category_id FROM assets WHERE source_path=? LIMIT 1",
             (source_path,),
@@ -674,6 +1172,7 @@ def remove_asset_category(source_path: str, category_id: int, db_path=None):
                 "UPDATE assets SET updated_at=?, last_seen_at=? WHERE id=?",
                 (now, now, asset_id),
             )
+        _refresh_search_categories(conn, [asset_id])
         _insert_event(
             conn,
             asset_id,
@@ -681,34 +1180,24 @@ def remove_asset_category(source_path: str, category_id: int, db_path=None):
             {"path": source_path, "category_id": cid},
             now,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def get_asset_category_map(source_paths, db_path=None):
     db_path = db_path or get_default_db_path()
     if not os.path.isfile(db_path) or not source_paths:
         return {}
-    normalized = [os.path.abspath(p) for p in source_paths if p]
+    normalized = [_norm_path(p) for p in source_paths if p]
     if not normalized:
         return {}
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        placeholders = ",".join(["?"] * len(normalized))
+    with get_catalog_store(db_path).transaction() as conn, _path_lookup(conn, normalized) as lookup:
         rows = conn.execute(
-            f"SELECT source_path, category_id FROM assets WHERE source_path IN ({placeholders})",
-            normalized,
+            f"SELECT a.norm_path, a.category_id FROM {lookup} l JOIN assets a ON a.norm_path = l.path"
         ).fetchall()
-    finally:
-        conn.close()
     out = {}
     for row in rows:
-        path = row["source_path"] or ""
-        if not path:
+        norm = row["norm_path"] or ""
+        if not norm:
             continue
-        norm = os.path.normcase(os.path.normpath(os.path.abspath(path)))
         out[norm] = (int(row["category_id"]) if row["category_id"] is not None else None)
     return out
 
@@ -717,34 +1206,27 @@ def get_asset_categories_map(source_paths, db_path=None):
     db_path = db_path or get_default_db_path()
     if not os.path.isfile(db_path) or not source_paths:
         return {}
-    normalized = [os.path.abspath(p) for p in source_paths if p]
+    normalized = [_norm_path(p) for p in source_paths if p]
     if not normalized:
         return {}
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        placeholders = ",".join(["?"] * len(normalized))
+    with get_catalog_store(db_path).transaction() as conn, _path_lookup(conn, normalized) as lookup:
         rows = conn.execute(
             f"""
             SELECT
-                a.source_path,
+                a.norm_path,
                 a.category_id AS primary_category_id,
-                l.category_id AS linked_category_id
-            FROM assets a
-            LEFT JOIN asset_category_links l ON l.asset_id = a.id
-            WHERE a.source_path IN ({placeholders})
-            """,
-            normalized,
+                cl.category_id AS linked_category_id
+            FROM {lookup} lp
+            JOIN assets a ON a.norm_path = lp.path
+            LEFT JOIN asset_category_links cl ON cl.asset_id = a.id
+            """
         ).fetchall()
-    finally:
-        conn.close()
 
     out = {}
     for row in rows:
-        path = row["source_path"] or ""
-        if not path:
+        norm = row["norm_path"] or ""
+        if not norm:
             continue
-        norm = os.path.normcase(os.path.normpath(os.path.abspath(path)))
         bucket = out.setdefault(norm, set())
         primary = row["primary_category_id"]
         linked = row["linked_category_id"]
@@ -755,41 +1237,301 @@ def get_asset_categories_map(source_paths, db_path=None):
     return out
 
 
-def _load_existing_assets(conn, root):
-    like_root = root + os.sep + "%"
-    rows = conn.execute(
+def search_assets(query, root, db_path=None, limit=None):
+    # Ranked full-text lookup over the assets indexed under root; returns normalized paths,
+    # best match first. None means the index cannot answer (no FTS5, empty query, no catalog).
+    db_path = db_path or get_default_db_path()
+    match = _search_query(query)
+    if not match or not root or not os.path.isfile(db_path):
+        return None
+    conn = get_catalog_store(init_catalog_db(db_path)).connection()
+    sql = f"""
+        SELECT a.norm_path
+        FROM asset_search
+        JOIN asset_search_docs d ON d.asset_id = asset_search.rowid
+        JOIN assets a ON a.id = d.asset_id
+        WHERE asset_search MATCH ? AND d.root = ?
+        ORDER BY bm25(asset_search, {_SEARCH_WEIGHTS}), a.id
+    """
+    params = [match, _norm_path(root)]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [r["norm_path"] for r in rows]
+
+
+def set_asset_search_terms(source_path, materials, textures, db_path=None):
+    # Material and texture names seen when the model was loaded; only assets already
+    # indexed by a directory scan have a search document to attach them to.
+    db_path = init_catalog_db(db_path)
+    if not source_path:
+        return False
+    materials_text = " ".join(sorted({str(m).strip() for m in (materials or ()) if str(m or "").strip()}))
+    textures_text = " ".join(sorted({str(t).strip() for t in (textures or ()) if str(t or "").strip()}))
+    with get_catalog_store(db_path).transaction() as conn:
+        cur = conn.execute(
+            """
+            UPDATE asset_search_docs SET materials = ?, textures = ?
+            WHERE asset_id = (SELECT id FROM assets WHERE source_path = ? LIMIT 1)
+              AND (materials != ? OR textures != ?)
+            """,
+            (materials_text, textures_text, os.path.abspath(source_path), materials_text, textures_text),
+        )
+        return cur.rowcount > 0
+
+
+def _apply_scan(conn, root, scanned, now):
+    # Set-based diff of one directory scan against the catalog: the scan goes into a temp
+    # table and every asset class (new/updated/unchanged/removed) is handled by a few joins.
+    for table in ("scan_files", "scan_existing", "scan_diff"):
+        conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+    conn.execute(
         """
-        SELECT
-            a.id AS asset_id,
-            a.name,
-            a.source_path,
-            g.size_bytes,
-            g.mtime
+        CREATE TEMP TABLE scan_files (
+            norm TEXT NOT NULL,
+            dir TEXT NOT NULL,
+            path TEXT NOT NULL,
+            name TEXT NOT NULL,
+            ext TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            mtime REAL NOT NULL
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO temp.scan_files(norm, dir, path, name, ext, size_bytes, mtime) VALUES(?, ?, ?, ?, ?, ?, ?)",
+        (
+            (norm, os.path.dirname(norm), item["path"], item["name"], item["ext"], item["size"], item["mtime"])
+            for norm, item in scanned.items()
+        ),
+    )
+    # Building the index after the bulk insert is cheaper than maintaining it row by row.
+    conn.execute("CREATE UNIQUE INDEX temp.idx_scan_files_norm ON scan_files(norm)")
+
+    conn.execute(
+        """
+        CREATE TEMP TABLE scan_existing (
+            norm TEXT PRIMARY KEY,
+            asset_id INTEGER NOT NULL,
+            source_path TEXT NOT NULL,
+            size_bytes INTEGER NULL,
+            mtime REAL NULL
+        ) WITHOUT ROWID
+        """
+    )
+    root_where, root_params = _under_root("a.norm_path", root)
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO temp.scan_existing(norm, asset_id, source_path, size_bytes, mtime)
+        SELECT a.norm_path, a.id, a.source_path, g.size_bytes, g.mtime
         FROM assets a
         LEFT JOIN geometries g
             ON g.asset_id = a.id AND g.file_path = a.source_path
-        WHERE a.source_path = ? OR a.source_path LIKE ?
+        WHERE {root_where}
+        ORDER BY a.id DESC
         """,
-        (root, like_root),
+        root_params,
+    )
+    conn.execute(
+        """
+        CREATE TEMP TABLE scan_diff AS
+        SELECT
+            f.rowid AS seq,
+            f.norm,
+            f.dir,
+            f.path,
+            f.name,
+            f.ext,
+            f.size_bytes,
+            f.mtime,
+            e.asset_id,
+            CASE
+                WHEN e.asset_id IS NULL THEN 'new'
+                WHEN e.size_bytes IS NULL OR e.mtime IS NULL
+                     OR e.size_bytes != f.size_bytes
+                     OR abs(e.mtime - f.mtime) > 1e-6 THEN 'updated'
+                ELSE 'seen'
+            END AS state
+        FROM temp.scan_files f
+        LEFT JOIN temp.scan_existing e ON e.norm = f.norm
+        """
+    )
+    conn.execute("CREATE INDEX temp.idx_scan_diff_state ON scan_diff(state, asset_id)")
+
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO asset_dirs(norm_path)
+        SELECT DISTINCT dir FROM temp.scan_diff WHERE state = 'new'
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO assets(name, source_path, norm_path, dir_id, created_at, updated_at, last_seen_at)
+        SELECT d.name, d.path, d.norm, ad.id, ?, ?, ?
+        FROM temp.scan_diff d
+        JOIN asset_dirs ad ON ad.norm_path = d.dir
+        WHERE d.state = 'new'
+        ORDER BY d.seq
+        """,
+        (now, now, now),
+    )
+    conn.execute(
+        """
+        UPDATE temp.scan_diff
+        SET asset_id = (SELECT a.id FROM assets a WHERE a.source_path = scan_diff.path)
+        WHERE state = 'new'
+        """
+    )
+    conn.execute(
+        """
+        UPDATE assets
+        SET name = (SELECT d.name FROM temp.scan_diff d WHERE d.state = 'updated' AND d.asset_id = assets.id),
+            updated_at = ?,
+            last_seen_at = ?
+        WHERE id IN (SELECT asset_id FROM temp.scan_diff WHERE state = 'updated')
+        """,
+        (now, now),
+    )
+    conn.execute(
+        "UPDATE assets SET last_seen_at = ? WHERE id IN (SELECT asset_id FROM temp.scan_diff WHERE state = 'seen')",
+        (now,),
+    )
+    conn.execute(
+        """
+        INSERT INTO geometries(asset_id, file_path, format, size_bytes, mtime, hash_fast, created_at)
+        SELECT asset_id, path, ext, size_bytes, mtime, printf('%d:%.6f', size_bytes, mtime), ?
+        FROM temp.scan_diff
+        WHERE state IN ('new', 'updated') AND asset_id IS NOT NULL
+        ORDER BY seq
+        ON CONFLICT(asset_id, file_path) DO UPDATE SET
+            format = excluded.format,
+            size_bytes = excluded.size_bytes,
+            mtime = excluded.mtime,
+            hash_fast = excluded.hash_fast
+        """,
+        (now,),
+    )
+    # New and changed files get fresh search documents, and so does every file last indexed
+    # under another root (its relative path changed). Material and texture terms are kept.
+    conn.execute(
+        f"""
+        INSERT INTO asset_search_docs(asset_id, root, name, path, categories)
+        SELECT d.asset_id, ?, d.name, substr(d.path, ?), {_SEARCH_CATEGORIES_SQL.format(asset_id="d.asset_id")}
+        FROM temp.scan_diff d
+        LEFT JOIN asset_search_docs s ON s.asset_id = d.asset_id
+        WHERE d.asset_id IS NOT NULL AND (d.state != 'seen' OR s.asset_id IS NULL OR s.root != ?)
+        ORDER BY d.seq
+        ON CONFLICT(asset_id) DO UPDATE SET
+            root = excluded.root,
+            name = excluded.name,
+            path = excluded.path,
+            categories = excluded.categories
+        """,
+        (root, len(root) + 2, root),
+    )
+    changed = conn.execute(
+        """
+        SELECT asset_id, state, path, size_bytes, mtime
+        FROM temp.scan_diff
+        WHERE state IN ('new', 'updated') AND asset_id IS NOT NULL
+        ORDER BY seq
+        """
     ).fetchall()
-    out = {}
-    for r in rows:
-        norm = os.path.normcase(os.path.normpath(os.path.abspath(r["source_path"])))
-        out[norm] = r
-    return out
+    events = [
+        (
+            int(r["asset_id"]),
+            "new_asset" if r["state"] == "new" else "updated_asset",
+            json.dumps({"path": r["path"], "size": r["size_bytes"], "mtime": r["mtime"]}, ensure_ascii=False),
+            now,
+        )
+        for r in changed
+    ]
 
+    # Log removal only once until file appears again.
+    removed = conn.execute(
+        """
+        SELECT e.asset_id, e.source_path, le.event_type AS last_event
+        FROM temp.scan_existing e
+        LEFT JOIN asset_last_event le ON le.asset_id = e.asset_id
+        WHERE NOT EXISTS (SELECT 1 FROM temp.scan_files f WHERE f.norm = e.norm)
+        """
+    ).fetchall()
+    removed_count = 0
+    for r in removed:
+        if r["last_event"] == "removed_asset":
+            continue
+        events.append((int(r["asset_id"]), "removed_asset", json.dumps({"path": r["source_path"]}, ensure_ascii=False), now))
+        removed_count += 1
+    conn.executemany(
+        "INSERT INTO events(asset_id, event_type, payload_json, created_at) VALUES(?, ?, ?, ?)",
+        events,
+    )
+    conn.executemany(
+        "UPDATE assets SET updated_at = ?, last_seen_at = ? WHERE id = ?",
+        ((now, now, int(r["asset_id"])) for r in removed),
+    )
 
-def _insert_asset(conn, name, source_path, now):
+    counts = dict(conn.execute("SELECT state, COUNT(*) FROM temp.scan_diff GROUP BY state").fetchall())
+    for table in ("scan_files", "scan_existing", "scan_diff"):
+        conn.execute(f"DROP TABLE temp.{table}")
+    return {
+        "new": int(counts.get("new", 0)),
+        "updated": int(counts.get("updated", 0)),
+        "removed": removed_count,
+        "seen": len(scanned),
+    }
+
+
+@contextmanager
+def _path_lookup(conn, paths):
+    # Large path lists join against a temp table instead of one IN (?, ...) placeholder per
+    # path, which runs into SQLITE_MAX_VARIABLE_NUMBER and plans poorly for big folders.
+    # Callers pass normalized paths, matched against the indexed assets.norm_path.
+    conn.execute("DROP TABLE IF EXISTS temp.lookup_paths")
+    conn.execute("CREATE TEMP TABLE lookup_paths (path TEXT PRIMARY KEY) WITHOUT ROWID")
+    try:
+        conn.executemany("INSERT OR IGNORE INTO temp.lookup_paths(path) VALUES(?)", ((p,) for p in paths))
+        yield "temp.lookup_paths"
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.lookup_paths")
+
+
+def _norm_path(path):
+    return os.path.normcase(os.path.normpath(os.path.abspath(path))) if path else ""
+
+
+def _dir_path(norm_path):
+    return os.path.dirname(norm_path) if norm_path else ""
+
+
+def _insert_asset(conn, name, source_path, now, favorite=False):
+    norm = _norm_path(source_path)
     cur = conn.execute(
         """
-        INSERT INTO assets(name, source_path, created_at, updated_at, last_seen_at)
-        VALUES(?, ?, ?, ?, ?)
+        INSERT INTO assets(name, source_path, norm_path, dir_id, favorite, created_at, updated_at, last_seen_at)
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (name, source_path, now, now, now),
+        (name, source_path, norm, _dir_id(conn, os.path.dirname(norm)), int(bool(favorite)), now, now, now),
     )
     return int(cur.lastrowid)
 
 
+def _dir_id(conn, dir_norm):
+    conn.execute("INSERT OR IGNORE INTO asset_dirs(norm_path) VALUES(?)", (dir_norm,))
+    return int(conn.execute("SELECT id FROM asset_dirs WHERE norm_path=?", (dir_norm,)).fetchone()[0])
+
+
+def _under_root(column, root_norm):
+    # Root-scoped filter on a normalized path column as an index range scan:
+    # everything between "root/" and "root0" ("/" + 1) lies under root.
+    base = root_norm.rstrip(os.sep)
+    return f"({column} = ? OR ({column} >= ? AND {column} < ?))", [root_norm, base + os.sep, base + chr(ord(os.sep) + 1)]
+
+
 def _ensure_asset_id(conn, source_path: str, now: str) -> int:
     row = conn.execute("SELECT id FROM assets WHERE source_path=? LIMIT 1", (source_path,)).fetchone()
     if row is None:
@@ -800,42 +1542,70 @@ def _ensure_asset_id(conn, source_path: str, now: str) -> int:
 
 
 def _upsert_geometry(conn, asset_id, item, now):
-    row = conn.execute(
-        "SELECT id FROM geometries WHERE asset_id=? AND file_path=? LIMIT 1",
-        (asset_id, item["path"]),
-    ).fetchone()
-    if row is None:
-        conn.execute(
-            """
-            INSERT INTO geometries(
-                asset_id, file_path, format, size_bytes, mtime, hash_fast, created_at
-            ) VALUES(?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                asset_id,
-                item["path"],
-                item["ext"],
-                item["size"],
-                item["mtime"],
-                f"{item['size']}:{item['mtime']:.6f}",
-                now,
-            ),
-        )
-    else:
-        conn.execute(
-            """
-            UPDATE geometries
-            SET format=?, size_bytes=?, mtime=?, hash_fast=?
-            WHERE id=?
-            """,
-            (
-                item["ext"],
-                item["size"],
-                item["mtime"],
-                f"{item['size']}:{item['mtime']:.6f}",
-                row["id"],
-            ),
-        )
+    conn.execute(
+        """
+        INSERT INTO geometries(
+            asset_id, file_path, format, size_bytes, mtime, hash_fast, created_at
+        ) VALUES(?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(asset_id, file_path) DO UPDATE SET
+            format = excluded.format,
+            size_bytes = excluded.size_bytes,
+            mtime = excluded.mtime,
+            hash_fast = excluded.hash_fast
+        """,
+        (
+            asset_id,
+            item["path"],
+            item["ext"],
+            item["size"],
+            item["mtime"],
+            f"{item['size']}:{item['mtime']:.6f}",
+            now,
+        ),
+    )
+
+
+def _upsert_search_doc(conn, asset_id, root, source_path):
+    rel = os.path.relpath(source_path, root) if root else source_path
+    conn.execute(
+        f"""
+        INSERT INTO asset_search_docs(asset_id, root, name, path, categories)
+        VALUES(?, ?, ?, ?, {_SEARCH_CATEGORIES_SQL.format(asset_id="?")})
+        ON CONFLICT(asset_id) DO UPDATE SET
+            root = excluded.root,
+            name = excluded.name,
+            path = excluded.path,
+            categories = excluded.categories
+        """,
+        (asset_id, root, os.path.basename(source_path), rel, asset_id, asset_id),
+    )
+
+
+def _category_asset_ids(conn, category_ids):
+    placeholders = ",".join(["?"] * len(category_ids))
+    rows = conn.execute(
+        f"""
+        SELECT asset_id FROM asset_category_links WHERE category_id IN ({placeholders})
+        UNION
+        SELECT id FROM assets WHERE category_id IN ({placeholders})
+        """,
+        list(category_ids) * 2,
+    ).fetchall()
+    return [int(r[0]) for r in rows]
+
+
+def _refresh_search_categories(conn, asset_ids):
+    conn.executemany(
+        f"UPDATE asset_search_docs SET categories = {_SEARCH_CATEGORIES_SQL.format(asset_id='?')} WHERE asset_id = ?",
+        ((int(asset_id), int(asset_id), int(asset_id)) for asset_id in asset_ids),
+    )
+
+
+def _search_query(text):
+    # Every word of the input must prefix-match some token: "chair wo" -> "chair"* "wo"*.
+    # Separators follow the unicode61 tokenizer, so "oak_chair" is two tokens on both sides.
+    tokens = re.findall(r"[^\W_]+", str(text or "").lower())
+    return " ".join(f'"{token}"*' for token in tokens)
 
 
 def _insert_event(conn, asset_id, event_type, payload, now):
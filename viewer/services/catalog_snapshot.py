@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+
+
+class CatalogSnapshot:
+    # Column-wise view of the models of one directory: per-path values are derived once when
+    # the listing changes, filters are boolean masks over rows and return row index arrays.
+    def __init__(self, root: str, paths, rels, norms, category_names, category_codes):
+        self.root = root
+        self.paths = paths
+        self.rels = rels
+        self.norms = norms
+        self.index = {norm: row for row, norm in enumerate(norms)}
+        self.rel_lower = np.array([rel.lower() for rel in rels], dtype=str)
+        self.category_names = category_names
+        self.category_codes = category_codes
+        self.favorite = np.zeros(len(paths), dtype=bool)
+        self.category_bits = np.zeros((len(paths), 1), dtype=np.uint64)
+        self.category_count = np.zeros(len(paths), dtype=np.int32)
+        self.category_bit = {}
+        # The model list, favorite set and category map the columns were filled from.
+        self.source = None
+        self.favorites_source = None
+        self.categories_source = None
+        self.categories_version = -1
+
+    @classmethod
+    def build(cls, model_files, root: str, top_category):
+        paths = list(model_files or [])
+        rels = [os.path.relpath(p, root) if root else p for p in paths]
+        norms = [os.path.normcase(os.path.normpath(os.path.abspath(p))) for p in paths]
+        categories = [top_category(p, root) for p in paths]
+        category_names = sorted(set(categories), key=lambda x: x.lower())
+        code_by_name = {name: code for code, name in enumerate(category_names)}
+        codes = np.fromiter((code_by_name[c] for c in categories), dtype=np.int32, count=len(categories))
+        snapshot = cls(root, paths, rels, norms, category_names, codes)
+        snapshot.source = model_files
+        return snapshot
+
+    def __len__(self):
+        return len(self.paths)
+
+    def all_rows(self):
+        return np.arange(len(self.paths), dtype=np.int64)
+
+    def paths_for(self, rows):
+        paths = self.paths
+        return [paths[row] for row in rows.tolist()]
+
+    def rows_for_norms(self, norms):
+        # Rows in the order of norms; paths outside the snapshot are skipped.
+        index = self.index
+        return np.fromiter((index[n] for n in norms if n in index), dtype=np.int64)
+
+    def category_name(self, row: int) -> str:
+        return self.category_names[int(self.category_codes[row])]
+
+    def set_favorites(self, favorite_paths):
+        self.favorite = np.fromiter((n in favorite_paths for n in self.norms), dtype=bool, count=len(self.norms))
+        self.favorites_source = favorite_paths
+
+    def set_favorite(self, norm: str, is_favorite: bool):
+        row = self.index.get(norm)
+        if row is not None:
+            self.favorite[row] = bool(is_favorite)
+
+    def set_asset_categories(self, categories_map, version: int = 0):
+        # Virtual category membership as a bitset per row: bit b of word b // 64 is category
+        # category_bit[id]; "any of these categories" is one AND over the matrix.
+        ids = sorted({int(cid) for cats in categories_map.values() for cid in (cats or ())})
+        self.category_bit = {cid: bit for bit, cid in enumerate(ids)}
+        words = max(1, (len(ids) + 63) // 64)
+        bits = np.zeros((len(self.paths), words), dtype=np.uint64)
+        counts = np.zeros(len(self.paths), dtype=np.int32)
+        for norm, cats in categories_map.items():
+            row = self.index.get(norm)
+            if row is None or not cats:
+                continue
+            for cid in cats:
+                bit = self.category_bit[int(cid)]
+                bits[row, bit >> 6] |= np.uint64(1 << (bit & 63))
+            counts[row] = len(cats)
+        self.category_bits = bits
+        self.category_count = counts
+        self.categories_source = categories_map
+        self.categories_version = version
+
+    def search_mask(self, needle: str):
+        # Every word must occur in the relpath, so "oak ch" finds what the full-text
+        # prefix query "oak"* "ch"* finds by name or path.
+        mask = np.ones(len(self.paths), dtype=bool)
+        for word in (needle or "").split():
+            mask &= np.char.find(self.rel_lower, word) >= 0
+        return mask
+
+    def top_category_mask(self, category_name: str):
+        try:
+            code = self.category_names.index(category_name)
+        except ValueError:
+            return np.zeros(len(self.paths), dtype=bool)
+        return self.category_codes == code
+
+    def uncategorized_mask(self):
+        return self.category_count == 0
+
+    def any_category_mask(self, category_ids):
+        wanted = np.zeros(self.category_bits.shape[1], dtype=np.uint64)
+        for cid in category_ids:
+            bit = self.category_bit.get(int(cid))
+            if bit is not None:
+                wanted[bit >> 6] |= np.uint64(1 << (bit & 63))
+        if not wanted.any():
+            return np.zeros(len(self.paths), dtype=bool)
+        return (self.category_bits & wanted).any(axis=1)
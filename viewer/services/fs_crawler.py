@@ -0,0 +1,172 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from viewer.services.catalog_db import get_directory_cache, save_directory_cache
+
+
+_DEFAULT_WORKERS = 8
+
+
+@dataclass
+class CrawlResult:
+    root: str
+    # normalized path -> {"path", "name", "size", "mtime", "ext"}, the scan_and_index_directory item format
+    items: dict = field(default_factory=dict)
+    # Normalized paths whose size/mtime came from a cached listing and may be stale.
+    reused_items: set = field(default_factory=set)
+    directories: int = 0
+    listed: int = 0
+    reused: int = 0
+    duration_sec: float = 0.0
+
+    def paths(self):
+        root = self.root
+        return sorted((item["path"] for item in self.items.values()), key=lambda p: os.path.relpath(p, root).lower())
+
+    def fresh_items(self, max_workers: int = _DEFAULT_WORKERS) -> dict:
+        # Items for the indexer: a directory mtime does not change when a file is edited in place,
+        # so files from reused listings are stat'ed again; files gone since are dropped.
+        if not self.reused_items:
+            return dict(self.items)
+        items = dict(self.items)
+        reused = sorted(self.reused_items)
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="restat") as pool:
+            for norm, st in zip(reused, pool.map(_stat_or_none, (items[n]["path"] for n in reused))):
+                if st is None:
+                    items.pop(norm, None)
+                else:
+                    items[norm] = file_item(items[norm]["path"], st.st_size, st.st_mtime)
+        return items
+
+
+def extensions_key(model_extensions) -> str:
+    return ",".join(sorted(str(ext).lower() for ext in (model_extensions or ())))
+
+
+def file_item(full_path: str, size, mtime) -> dict:
+    name = os.path.basename(full_path)
+    return {
+        "path": full_path,
+        "name": name,
+        "size": int(size),
+        "mtime": float(mtime),
+        "ext": os.path.splitext(name)[1].lower().lstrip("."),
+    }
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _stat_or_none(path: str):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def list_directory(path: str, model_extensions):
+    # Model files ([name, size, mtime]) and subdirectory names of one directory.
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.lower().endswith(model_extensions) and entry.is_file():
+                        # DirEntry caches the stat; on Windows it comes with the listing itself.
+                        st = entry.stat()
+                        files.append([entry.name, int(st.st_size), float(st.st_mtime)])
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _visit_directory(path: str, cached, model_extensions, ext_key: str):
+    # One directory per task: a stat for its mtime, and a listing only when that mtime moved.
+    try:
+        dir_mtime = float(os.stat(path).st_mtime)
+    except OSError:
+        return None
+    if cached and cached.get("ext_key") == ext_key and abs(float(cached.get("mtime", -1.0)) - dir_mtime) < 1e-6:
+        return {"path": path, "mtime": dir_mtime, "files": cached["files"], "subdirs": cached["subdirs"], "reused": True}
+    files, subdirs = list_directory(path, model_extensions)
+    return {"path": path, "mtime": dir_mtime, "files": files, "subdirs": subdirs, "reused": False}
+
+
+def crawl_directory(
+    directory: str,
+    model_extensions,
+    db_path=None,
+    incremental: bool = True,
+    max_workers: int = _DEFAULT_WORKERS,
+    progress=None,
+):
+    # With incremental=True a directory whose mtime matches the stored one is not listed again;
+    # its subdirectories are still visited, since nested changes do not touch parent mtimes.
+    # Files edited in place keep their directory mtime: sizes/mtimes from reused listings are
+    # only good for the file list, CrawlResult.fresh_items() re-stats them for indexing.
+    t0 = time.perf_counter()
+    model_extensions = tuple(str(ext).lower() for ext in (model_extensions or ()))
+    ext_key = extensions_key(model_extensions)
+    base = os.path.abspath(directory)
+    result = CrawlResult(root=base)
+    if not os.path.isdir(base):
+        return result
+
+    cache = {}
+    if incremental:
+        try:
+            cache = get_directory_cache(base, db_path=db_path)
+        except Exception:
+            cache = {}
+
+    listings = {}
+    visited = set()
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="crawl") as pool:
+        pending = {pool.submit(_visit_directory, base, cache.get(_norm(base)), model_extensions, ext_key)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                visit = future.result()
+                if visit is None:
+                    continue
+                path = visit["path"]
+                result.directories += 1
+                if visit["reused"]:
+                    result.reused += 1
+                else:
+                    result.listed += 1
+                for name, size, mtime in visit["files"]:
+                    full_path = os.path.join(path, name)
+                    result.items[_norm(full_path)] = file_item(full_path, size, mtime)
+                    if visit["reused"]:
+                        result.reused_items.add(_norm(full_path))
+                visited.add(_norm(path))
+                if not visit["reused"]:
+                    listings[_norm(path)] = {
+                        "mtime": visit["mtime"],
+                        "ext_key": ext_key,
+                        "files": visit["files"],
+                        "subdirs": visit["subdirs"],
+                    }
+                for name in visit["subdirs"]:
+                    sub_path = os.path.join(path, name)
+                    pending.add(pool.submit(_visit_directory, sub_path, cache.get(_norm(sub_path)), model_extensions, ext_key))
+            if progress is not None:
+                progress(len(result.items))
+
+    try:
+        removed = [norm for norm in cache if norm not in visited] if incremental else None
+        save_directory_cache(base, listings, db_path=db_path, removed=removed)
+    except Exception:
+        # The cache only speeds up the next crawl; a locked or read-only catalog is not fatal.
+        pass
+    result.duration_sec = round(time.perf_counter() - t0, 3)
+    return result
@@ -0,0 +1,152 @@
+import os
+from dataclasses import dataclass, field
+
+from viewer.services.fs_crawler import file_item, list_directory
+
+
+_NETWORK_FS_TYPES = {"cifs", "smbfs", "smb3", "nfs", "nfs4", "afs", "9p", "fuse.sshfs", "davfs", "fuse.rclone"}
+_DRIVE_REMOTE = 4
+
+
+@dataclass
+class FileChanges:
+    # Keyed by normalized path; created/modified hold scan_and_index_directory items.
+    created: dict = field(default_factory=dict)
+    modified: dict = field(default_factory=dict)
+    deleted: dict = field(default_factory=dict)
+    added_dirs: list = field(default_factory=list)
+    removed_dirs: list = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.created or self.modified or self.deleted or self.added_dirs or self.removed_dirs)
+
+    def has_files(self) -> bool:
+        return bool(self.created or self.modified or self.deleted)
+
+    def touched_paths(self):
+        return [item["path"] for item in self.modified.values()] + list(self.deleted.values())
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def is_network_path(path: str) -> bool:
+    # Native change notifications do not see edits made by other machines on network shares.
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"):
+            return True
+        try:
+            import ctypes
+
+            drive = os.path.splitdrive(path)[0] + "\\"
+            return int(ctypes.windll.kernel32.GetDriveTypeW(drive)) == _DRIVE_REMOTE
+        except Exception:
+            return False
+    best_mount = ""
+    best_type = ""
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8", errors="ignore") as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mount_point = parts[1].replace("\\040", " ")
+                prefix = mount_point.rstrip("/") + "/"
+                if (path == mount_point or path.startswith(prefix)) and len(mount_point) >= len(best_mount):
+                    best_mount = mount_point
+                    best_type = parts[2]
+    except OSError:
+        return False
+    return best_type.lower() in _NETWORK_FS_TYPES
+
+
+class DirectoryWatchState:
+    # Last known listing of every directory under root; rescans are diffed against it, so
+    # both change notifications and polling turn into created/modified/deleted batches.
+    def __init__(self, root: str, model_extensions):
+        self.root = os.path.abspath(root)
+        self.model_extensions = tuple(str(ext).lower() for ext in (model_extensions or ()))
+        self.dirs = {}
+
+    def directories(self):
+        return [entry["path"] for entry in self.dirs.values()]
+
+    def load(self, listings=None):
+        # listings: catalog_dirs rows from the last crawl (get_directory_cache); walks when absent.
+        self.dirs = {}
+        listings = listings or {}
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            cached = listings.get(_norm(path))
+            if cached is not None:
+                files = {name: (int(size), float(mtime)) for name, size, mtime in cached.get("files") or []}
+                subdirs = list(cached.get("subdirs") or [])
+            else:
+                if not os.path.isdir(path):
+                    continue
+                listed, subdirs = list_directory(path, self.model_extensions)
+                files = {name: (int(size), float(mtime)) for name, size, mtime in listed}
+            self.dirs[_norm(path)] = {"path": path, "files": files, "subdirs": subdirs}
+            stack.extend(os.path.join(path, name) for name in subdirs)
+
+    def poll(self) -> FileChanges:
+        return self.rescan(self.directories() or [self.root])
+
+    def rescan(self, dir_paths) -> FileChanges:
+        changes = FileChanges()
+        queue = []
+        seen = set()
+        for path in dir_paths:
+            norm = _norm(os.path.abspath(path))
+            if norm in seen:
+                continue
+            seen.add(norm)
+            queue.append(os.path.abspath(path))
+        while queue:
+            path = queue.pop()
+            norm = _norm(path)
+            previous = self.dirs.get(norm)
+            if not os.path.isdir(path):
+                if previous is not None:
+                    self._drop_tree(norm, changes)
+                continue
+            listed, subdirs = list_directory(path, self.model_extensions)
+            files = {name: (int(size), float(mtime)) for name, size, mtime in listed}
+            old_files = previous["files"] if previous is not None else {}
+            old_subdirs = set(previous["subdirs"]) if previous is not None else set()
+            if previous is None:
+                changes.added_dirs.append(path)
+            for name, (size, mtime) in files.items():
+                full_path = os.path.join(path, name)
+                old = old_files.get(name)
+                if old is None:
+                    changes.created[_norm(full_path)] = file_item(full_path, size, mtime)
+                elif old[0] != size or abs(old[1] - mtime) > 1e-6:
+                    changes.modified[_norm(full_path)] = file_item(full_path, size, mtime)
+            for name in old_files:
+                if name not in files:
+                    full_path = os.path.join(path, name)
+                    changes.deleted[_norm(full_path)] = full_path
+            for name in old_subdirs - set(subdirs):
+                self._drop_tree(_norm(os.path.join(path, name)), changes)
+            self.dirs[norm] = {"path": path, "files": files, "subdirs": subdirs}
+            for name in subdirs:
+                sub_path = os.path.join(path, name)
+                sub_norm = _norm(sub_path)
+                # New folders arrive with their content already inside (copy, unzip, move).
+                if sub_norm not in self.dirs and sub_norm not in seen:
+                    seen.add(sub_norm)
+                    queue.append(sub_path)
+        return changes
+
+    def _drop_tree(self, norm_dir: str, changes: FileChanges):
+        prefix = norm_dir.rstrip(os.sep) + os.sep
+        for key in [k for k in self.dirs if k == norm_dir or k.startswith(prefix)]:
+            entry = self.dirs.pop(key)
+            changes.removed_dirs.append(entry["path"])
+            for name in entry["files"]:
+                full_path = os.path.join(entry["path"], name)
+                changes.deleted[_norm(full_path)] = full_path
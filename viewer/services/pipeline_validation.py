@@ -14,6 +14,7 @@ from viewer.utils.texture_utils import (
     CHANNEL_ROUGHNESS,
     classify_texture_channel,
 )
+from viewer.utils.texture_cache import get_texture_alpha_flags
 
 try:
     from PIL import Image
@@ -462,15 +463,10 @@ def _has_effective_alpha_channel(path: str) -> bool:
     key = os.path.normcase(os.path.normpath(str(path)))
     if key in _ALPHA_CHANNEL_CACHE:
         return bool(_ALPHA_CHANNEL_CACHE[key])
-    try:
-        with Image.open(path) as img:
-            mode = str(getattr(img, "mode", "") or "").upper()
-            has_alpha = ("A" in mode) or ("transparency" in (getattr(img, "info", {}) or {}))
-            _ALPHA_CHANNEL_CACHE[key] = bool(has_alpha)
-            return bool(has_alpha)
-    except Exception:
-        _ALPHA_CHANNEL_CACHE[key] = False
-        return False
+    # Flags persist in the decoded-texture disk cache, so repeat sessions skip image probing.
+    has_alpha = bool(get_texture_alpha_flags(path).get("has_alpha_channel", False))
+    _ALPHA_CHANNEL_CACHE[key] = has_alpha
+    return has_alpha
 
 
 def _mark_channel_presence(presence: dict, channel: str):
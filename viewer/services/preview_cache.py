@@ -5,7 +5,7 @@ import time
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QImage, QPainter
 
-from viewer.services.catalog_db import set_asset_preview
+from viewer.services.catalog_db import clear_asset_previews, set_asset_preview
 
 
 def get_preview_cache_dir():
@@ -23,6 +23,26 @@ def build_preview_path_for_model(model_path, size=128):
     return os.path.join(get_preview_cache_dir(), f"{digest}.png")
 
 
+def invalidate_previews(model_paths, db_path=None) -> int:
+    # Drops stored previews of changed or deleted models; only files inside the cache are removed.
+    try:
+        preview_paths = clear_asset_previews(model_paths, db_path=db_path)
+    except Exception:
+        return 0
+    cache_root = os.path.normcase(os.path.normpath(get_preview_cache_dir()))
+    removed = 0
+    for path in preview_paths:
+        norm = os.path.normcase(os.path.normpath(os.path.abspath(path)))
+        if not norm.startswith(cache_root + os.sep):
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
 def save_viewport_preview(model_path, image: QImage, db_path=None, size=128, force_rebuild=False):
     out_path = build_preview_path_for_model(model_path, size=size)
     if (not force_rebuild) and os.path.isfile(out_path):
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+
+BENCHMARK_MODES = {
+    "fast": {"fast_mode": True, "shadows": False, "alpha": "cutout"},
+    "quality": {"fast_mode": False, "shadows": False, "alpha": "cutout"},
+    "shadows": {"fast_mode": False, "shadows": True, "alpha": "cutout"},
+    "blend": {"fast_mode": False, "shadows": False, "alpha": "blend"},
+}
+_FRAME_FIELDS = ("frame", "angle_x", "angle_y", "wall_ms", "cpu_ms", "gpu_ms", "draw_calls", "triangles", "texture_binds")
+
+
+def orbit_angles(frame: int, frames: int):
+    # One full turn around the model with a gentle elevation wave, identical for every run.
+    t = float(frame) / float(max(frames, 1))
+    return 20.0 + 10.0 * math.sin(2.0 * math.pi * t), (360.0 * t) % 360.0
+
+
+def _summarize(values):
+    arr = np.asarray([float(v) for v in values], dtype=np.float64)
+    if arr.size == 0:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": float(arr.mean()),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+    }
+
+
+def run_model_benchmark(renderer, payload, mode: str, frames: int = 240, warmup: int = 10):
+    from viewer.ui.render_profiler import RenderProfiler
+
+    settings = BENCHMARK_MODES[mode]
+    scene = renderer.prepare(payload, shadows=settings["shadows"])
+    scene.set_fast_mode(settings["fast_mode"])
+    scene.set_alpha_render_mode(settings["alpha"])
+    if settings["shadows"] and not settings["fast_mode"]:
+        scene.set_shadows_enabled(True)
+
+    for frame in range(max(0, int(warmup))):
+        renderer.draw_frame(*orbit_angles(frame, frames))
+
+    # Fresh profiler sized for the whole run so no frame is dropped from the window.
+    scene.render_profiler.release_gl()
+    scene.render_profiler = RenderProfiler(window=frames)
+    scene.render_profiler.set_enabled(True)
+    wall_ms = []
+    angles = []
+    for frame in range(int(frames)):
+        angle_x, angle_y = orbit_angles(frame, frames)
+        t0 = time.perf_counter()
+        renderer.draw_frame(angle_x, angle_y)
+        wall_ms.append((time.perf_counter() - t0) * 1000.0)
+        angles.append((angle_x, angle_y))
+    scene.render_profiler.collect_gpu_results()
+
+    rows = []
+    for frame, (record, wall, (angle_x, angle_y)) in enumerate(zip(scene.render_profiler.frames(), wall_ms, angles)):
+        gpu = record.get("gpu_ms") or {}
+        rows.append(
+            {
+                "frame": frame,
+                "angle_x": round(angle_x, 3),
+                "angle_y": round(angle_y, 3),
+                "wall_ms": round(wall, 4),
+                "cpu_ms": round(float(record.get("frame_ms", 0.0)), 4),
+                "gpu_ms": round(float(sum(gpu.values())), 4) if gpu else "",
+                "draw_calls": int(record.get("draw_calls", 0)),
+                "triangles": int(record.get("triangles", 0)),
+                "texture_binds": int(record.get("texture_binds", 0)),
+            }
+        )
+    summary = {
+        "mode": mode,
+        "frames": len(rows),
+        "wall_ms": _summarize(r["wall_ms"] for r in rows),
+        "cpu_ms": _summarize(r["cpu_ms"] for r in rows),
+        "gpu_ms": _summarize(r["gpu_ms"] for r in rows if r["gpu_ms"] != ""),
+        "draw_calls": _summarize(r["draw_calls"] for r in rows),
+        "triangles": _summarize(r["triangles"] for r in rows),
+        "phases": scene.render_profiler.summary(),
+        "gpu_timing": scene.render_profiler.gpu_status,
+    }
+    scene.render_profiler.set_enabled(False)
+    return rows, summary
+
+
+def _write_csv(path: str, rows):
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=_FRAME_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _gl_info():
+    from OpenGL.GL import GL_RENDERER, GL_VENDOR, GL_VERSION, glGetString
+
+    info = {}
+    for key, name in (("vendor", GL_VENDOR), ("renderer", GL_RENDERER), ("version", GL_VERSION)):
+        try:
+            raw = glGetString(name)
+            info[key] = raw.decode("utf-8", errors="ignore") if isinstance(raw, bytes) else str(raw or "")
+        except Exception:
+            info[key] = ""
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scripted-orbit viewport benchmark (offscreen, no vsync).")
+    parser.add_argument("models", nargs="+", help="model files to benchmark")
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--size", default="1280x720", help="WIDTHxHEIGHT")
+    parser.add_argument("--modes", default=",".join(BENCHMARK_MODES), help="comma-separated: " + ",".join(BENCHMARK_MODES))
+    parser.add_argument("--samples", type=int, default=0, help="MSAA samples of the offscreen target")
+    parser.add_argument("--out-dir", default="", help="report directory (default: logs/benchmark_<timestamp>)")
+    parser.add_argument("--software", action="store_true", help="force Mesa llvmpipe")
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in BENCHMARK_MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    try:
+        width, height = (int(v) for v in args.size.lower().split("x", 1))
+    except ValueError:
+        parser.error("--size must look like 1280x720")
+
+    if args.software:
+        os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+    # Mesa honours vblank_mode; FBO rendering is not synced anyway.
+    os.environ.setdefault("vblank_mode", "0")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QEvent
+    from PyQt5.QtWidgets import QApplication
+
+    from viewer.loaders.model_loader import load_model_payload
+    from viewer.ui.offscreen_renderer import OffscreenRenderer
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    out_dir = args.out_dir or os.path.join(root, "logs", f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    renderer = OffscreenRenderer(width=width, height=height, samples=args.samples)
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "frames": int(args.frames),
+        "warmup": int(args.warmup),
+        "size": [width, height],
+        "modes": modes,
+        "results": [],
+    }
+    failed = 0
+    try:
+        for model_path in args.models:
+            stem = os.path.splitext(os.path.basename(model_path))[0]
+            t0 = time.perf_counter()
+            try:
+                payload = load_model_payload(model_path, normals_policy="import")
+            except Exception as exc:
+                failed += 1
+                print(f"[benchmark] {model_path}: {exc}", file=sys.stderr)
+                continue
+            load_sec = time.perf_counter() - t0
+            for mode in modes:
+                try:
+                    rows, summary = run_model_benchmark(renderer, payload, mode, frames=args.frames, warmup=args.warmup)
+                except Exception as exc:
+                    failed += 1
+                    print(f"[benchmark] {model_path} [{mode}]: {exc}", file=sys.stderr)
+                    continue
+                if "gl" not in report:
+                    report["gl"] = _gl_info()
+                csv_path = os.path.join(out_dir, f"{stem}__{mode}.csv")
+                _write_csv(csv_path, rows)
+                summary.update({"model": model_path, "load_sec": round(load_sec, 4), "csv": os.path.basename(csv_path)})
+                report["results"].append(summary)
+                print(
+                    f"[benchmark] {stem} [{mode}]: wall p50 {summary['wall_ms']['p50']:.2f} ms"
+                    f" / p95 {summary['wall_ms']['p95']:.2f} ms, draws {summary['draw_calls']['p50']:.0f}"
+                )
+    finally:
+        renderer.close()
+        # Delivers the deferred deletes of the GL widget before the app goes away.
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    print(f"[benchmark] report: {out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
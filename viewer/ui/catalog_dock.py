@@ -259,7 +259,7 @@ class CatalogDockPanel(QWidget):
         self.set_virtual_categories([], selected_id=0)
         self._refresh_assign_button_state()
 
-    def set_items(self, items, preview_map):
+    def set_items(self, items, preview_map, stats_map=None):
         current_path = self.current_path()
         self._icon_timer.stop()
         self._pending_icon_jobs = []
@@ -282,9 +282,16 @@ class CatalogDockPanel(QWidget):
             item.setData(self.FAVORITE_ROLE, bool(is_favorite))
             item.setData(self.CATEGORY_COUNT_ROLE, int(category_count))
             if category_count <= 0:
-                item.setToolTip(f"{rel_display}\nСтатус: без категории")
+                tooltip = f"{rel_display}\nСтатус: без категории"
             else:
-                item.setToolTip(f"{rel_display}\nКатегорий: {category_count}")
+                tooltip = f"{rel_display}\nКатегорий: {category_count}"
+            stats = (stats_map or {}).get(os.path.normcase(os.path.normpath(os.path.abspath(path))))
+            if stats:
+                size = (stats.get("bbox") or {}).get("size") or []
+                tooltip += f"\nТреугольников: {stats['polycount']:,}, UV: {stats['uv_sets']}"
+                if len(size) == 3:
+                    tooltip += f"\nРазмер: {size[0]:.3g} x {size[1]:.3g} x {size[2]:.3g}"
+            item.setToolTip(tooltip)
             preview_path = preview_map.get(path, "")
             if preview_path and os.path.isfile(preview_path):
                 item.setData(self.PREVIEW_PATH_ROLE, preview_path)
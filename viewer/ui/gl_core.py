@@ -0,0 +1,360 @@
+import ctypes
+import re
+
+import numpy as np
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_DYNAMIC_DRAW,
+    GL_ELEMENT_ARRAY_BUFFER,
+    GL_FALSE,
+    GL_FLOAT,
+    GL_STATIC_DRAW,
+    GL_TRIANGLES,
+    GL_TRIANGLE_STRIP,
+    GL_UNSIGNED_INT,
+    GL_VERSION,
+    glBindBuffer,
+    glBindVertexArray,
+    glBufferData,
+    glDeleteBuffers,
+    glDeleteVertexArrays,
+    glDisableVertexAttribArray,
+    glDrawArrays,
+    glDrawElements,
+    glDrawElementsInstanced,
+    glEnableVertexAttribArray,
+    glGenBuffers,
+    glGenVertexArrays,
+    glGetString,
+    glVertexAttrib2f,
+    glVertexAttrib4f,
+    glVertexAttribDivisor,
+    glVertexAttribPointer,
+)
+
+ATTRIB_POSITION = 0
+ATTRIB_NORMAL = 1
+ATTRIB_TEXCOORD = 2
+# mat4 per-instance transform occupies four consecutive locations (one per column).
+ATTRIB_INSTANCE = 3
+
+
+CORE_VERTEX_SHADER_SRC = """
+#version 330 core
+layout(location = 0) in vec3 aPosition;
+layout(location = 1) in vec3 aNormal;
+layout(location = 2) in vec2 aTexCoord;
+layout(location = 3) in mat4 aInstance;
+
+out vec3 vPosView;
+out vec3 vNormalView;
+out vec2 vUv;
+out vec4 vShadowCoord;
+
+uniform mat4 uModel;
+uniform mat4 uView;
+uniform mat4 uProj;
+uniform mat3 uNormalMatrix;
+uniform mat4 uLightVP;
+
+void main() {
+    vec4 worldPos = uModel * (aInstance * vec4(aPosition, 1.0));
+    vec4 posView = uView * worldPos;
+    vPosView = posView.xyz;
+    // Instance transforms are rotation + uniform scale in practice, so mat3() is enough for normals.
+    vNormalView = normalize(uNormalMatrix * (mat3(aInstance) * aNormal));
+    vUv = aTexCoord;
+    vShadowCoord = uLightVP * worldPos;
+    gl_Position = uProj * posView;
+}
+"""
+
+CORE_VERTEX_SHADER_DEPTH_SRC = """
+#version 330 core
+layout(location = 0) in vec3 aPosition;
+layout(location = 3) in mat4 aInstance;
+uniform mat4 uLightVP;
+uniform mat4 uModel;
+
+void main() {
+    gl_Position = uLightVP * (uModel * (aInstance * vec4(aPosition, 1.0)));
+}
+"""
+
+CORE_FRAGMENT_SHADER_DEPTH_SRC = """
+#version 330 core
+void main() {
+}
+"""
+
+CORE_VERTEX_SHADER_BACKGROUND_SRC = """
+#version 330 core
+layout(location = 0) in vec2 aPosition;
+out float vT;
+
+void main() {
+    vT = aPosition.y * 0.5 + 0.5;
+    gl_Position = vec4(aPosition, 0.0, 1.0);
+}
+"""
+
+CORE_FRAGMENT_SHADER_BACKGROUND_SRC = """
+#version 330 core
+in float vT;
+out vec4 fragColor;
+uniform vec3 uTopColor;
+uniform vec3 uBottomColor;
+
+void main() {
+    fragColor = vec4(mix(uBottomColor, uTopColor, vT), 1.0);
+}
+"""
+
+CORE_VERTEX_SHADER_SHADOW_CATCHER_SRC = """
+#version 330 core
+layout(location = 0) in vec2 aPosition;
+out vec4 vShadowCoord;
+uniform mat4 uLightVP;
+uniform mat4 uView;
+uniform mat4 uProj;
+uniform float uHalfSize;
+uniform float uPlaneY;
+
+void main() {
+    vec4 worldPos = vec4(aPosition.x * uHalfSize, uPlaneY, aPosition.y * uHalfSize, 1.0);
+    vShadowCoord = uLightVP * worldPos;
+    gl_Position = uProj * (uView * worldPos);
+}
+"""
+
+# Full-screen and ground-plane passes share one static strip in [-1, 1]^2.
+_UNIT_QUAD_STRIP = np.array([-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0], dtype=np.float32)
+
+
+def core_fragment_source(legacy_src: str) -> str:
+    # GLSL 1.20 fragment shaders differ from 3.30 core only in I/O keywords and sampler calls.
+    src = legacy_src.replace("#version 120", "#version 330 core\nout vec4 fragColor;", 1)
+    src = re.sub(r"\bvarying\b", "in", src)
+    src = re.sub(r"\btexture2D\s*\(", "texture(", src)
+    return re.sub(r"\bgl_FragColor\b", "fragColor", src)
+
+
+def gl_version_at_least(major: int, minor: int) -> bool:
+    try:
+        raw = glGetString(GL_VERSION)
+    except Exception:
+        return False
+    if not raw:
+        return False
+    if isinstance(raw, bytes):
+        raw = raw.decode("ascii", errors="ignore")
+    match = re.search(r"(\d+)\.(\d+)", str(raw))
+    if not match:
+        return False
+    return (int(match.group(1)), int(match.group(2))) >= (int(major), int(minor))
+
+
+def set_identity_instance_attribute():
+    # Non-instanced VAOs leave the instance attribute disabled and read this constant value.
+    # The value is context state but becomes undefined after a draw with the attribute array
+    # enabled, so it is set after context creation and again after every instanced draw.
+    for column in range(4):
+        values = [0.0, 0.0, 0.0, 0.0]
+        values[column] = 1.0
+        glVertexAttrib4f(ATTRIB_INSTANCE + column, *values)
+
+
+def _gen_id(fn):
+    value = fn(1)
+    if hasattr(value, "__len__"):
+        value = value[0]
+    return int(value)
+
+
+class StaticQuad:
+    def __init__(self):
+        self.vao = 0
+        self.vbo = 0
+
+    def create(self):
+        self.vao = _gen_id(glGenVertexArrays)
+        self.vbo = _gen_id(glGenBuffers)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, _UNIT_QUAD_STRIP.nbytes, _UNIT_QUAD_STRIP, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(ATTRIB_POSITION)
+        glVertexAttribPointer(ATTRIB_POSITION, 2, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        if not self.vao:
+            return
+        glBindVertexArray(self.vao)
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        glBindVertexArray(0)
+
+    def release(self):
+        if self.vbo:
+            glDeleteBuffers(1, [self.vbo])
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+        self.vao = 0
+        self.vbo = 0
+
+
+class CoreMeshBuffers:
+    # Vertex attributes live in static VBOs; the full index buffer and every submesh
+    # index array are packed into one element buffer and drawn by byte offset.
+    def __init__(self):
+        self.vao = 0
+        self.position_vbo = 0
+        self.normal_vbo = 0
+        self.texcoord_vbo = 0
+        self.ebo = 0
+        self.scratch_ebo = 0
+        self.index_count = 0
+        self._ranges = {}
+        self._keep_alive = []
+
+    def upload(self, vertices, normals, texcoords, index_arrays):
+        self.release()
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        if vertices.shape[0] == 0:
+            return
+        normals = np.asarray(normals, dtype=np.float32)
+        if normals.size != vertices.size:
+            normals = np.zeros_like(vertices)
+            normals[:, 1] = 1.0
+        normals = np.ascontiguousarray(normals).reshape(-1, 3)
+
+        self.vao = _gen_id(glGenVertexArrays)
+        glBindVertexArray(self.vao)
+        self.position_vbo = self._upload_attribute(ATTRIB_POSITION, vertices, 3)
+        self.normal_vbo = self._upload_attribute(ATTRIB_NORMAL, normals, 3)
+        texcoords = np.asarray(texcoords, dtype=np.float32)
+        if texcoords.size and texcoords.shape[0] == vertices.shape[0]:
+            self.texcoord_vbo = self._upload_attribute(ATTRIB_TEXCOORD, np.ascontiguousarray(texcoords).reshape(-1, 2), 2)
+        else:
+            glDisableVertexAttribArray(ATTRIB_TEXCOORD)
+            glVertexAttrib2f(ATTRIB_TEXCOORD, 0.0, 0.0)
+
+        packed = []
+        offset = 0
+        for arr in index_arrays:
+            if arr is None or id(arr) in self._ranges:
+                continue
+            flat = np.asarray(arr, dtype=np.uint32).reshape(-1)
+            self._ranges[id(arr)] = (offset * 4, int(flat.size))
+            # Ranges are keyed by array identity, so the source arrays must outlive the buffer.
+            self._keep_alive.append(arr)
+            packed.append(flat)
+            offset += int(flat.size)
+        all_indices = np.ascontiguousarray(np.concatenate(packed) if packed else np.array([], dtype=np.uint32))
+        self.index_count = int(all_indices.size)
+        self.ebo = _gen_id(glGenBuffers)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        if all_indices.size:
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, all_indices.nbytes, all_indices, GL_STATIC_DRAW)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def is_ready(self) -> bool:
+        return bool(self.vao)
+
+    def draw(self, indices) -> int:
+        if not self.vao:
+            return 0
+        glBindVertexArray(self.vao)
+        try:
+            rng = self._ranges.get(id(indices))
+            if rng is not None:
+                offset_bytes, count = rng
+                if count:
+                    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(offset_bytes))
+                return count
+            # Index arrays built per frame are streamed through a scratch buffer bound to the VAO.
+            flat = np.ascontiguousarray(np.asarray(indices, dtype=np.uint32).reshape(-1))
+            if flat.size == 0:
+                return 0
+            if not self.scratch_ebo:
+                self.scratch_ebo = _gen_id(glGenBuffers)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.scratch_ebo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, flat.nbytes, flat, GL_DYNAMIC_DRAW)
+            glDrawElements(GL_TRIANGLES, int(flat.size), GL_UNSIGNED_INT, ctypes.c_void_p(0))
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+            return int(flat.size)
+        finally:
+            glBindVertexArray(0)
+
+    def release(self):
+        buffers = [b for b in (self.position_vbo, self.normal_vbo, self.texcoord_vbo, self.ebo, self.scratch_ebo) if b]
+        if buffers:
+            glDeleteBuffers(len(buffers), buffers)
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+        self.vao = 0
+        self.position_vbo = 0
+        self.normal_vbo = 0
+        self.texcoord_vbo = 0
+        self.ebo = 0
+        self.scratch_ebo = 0
+        self.index_count = 0
+        self._ranges = {}
+        self._keep_alive = []
+
+    def _upload_attribute(self, location: int, data: np.ndarray, components: int) -> int:
+        vbo = _gen_id(glGenBuffers)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(location)
+        glVertexAttribPointer(location, components, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        return vbo
+
+
+class CoreInstancedMesh(CoreMeshBuffers):
+    # One geometry plus a per-instance mat4 buffer, drawn with a single glDrawElementsInstanced.
+    def __init__(self):
+        super().__init__()
+        self.instance_vbo = 0
+        self.instance_count = 0
+        self._indices = None
+
+    def upload_instanced(self, vertices, normals, texcoords, indices, transforms):
+        self._indices = indices
+        self.upload(vertices, normals, texcoords, [indices])
+        if not self.vao:
+            return
+        # Row-major numpy matrices -> column-major GL layout, 64 bytes per instance.
+        columns = np.ascontiguousarray(np.asarray(transforms, dtype=np.float32).reshape(-1, 4, 4).transpose(0, 2, 1))
+        self.instance_count = int(columns.shape[0])
+        glBindVertexArray(self.vao)
+        self.instance_vbo = _gen_id(glGenBuffers)
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, columns.nbytes, columns, GL_STATIC_DRAW)
+        for column in range(4):
+            location = ATTRIB_INSTANCE + column
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, 64, ctypes.c_void_p(16 * column))
+            glVertexAttribDivisor(location, 1)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw_instanced(self) -> int:
+        if not self.vao or not self.index_count or not self.instance_count:
+            return 0
+        glBindVertexArray(self.vao)
+        try:
+            glDrawElementsInstanced(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, ctypes.c_void_p(0), self.instance_count)
+        finally:
+            glBindVertexArray(0)
+            set_identity_instance_attribute()
+        return self.index_count * self.instance_count
+
+    def release(self):
+        if self.instance_vbo:
+            glDeleteBuffers(1, [self.instance_vbo])
+        self.instance_vbo = 0
+        self.instance_count = 0
+        super().release()
@@ -0,0 +1,161 @@
+import os
+from collections import OrderedDict
+
+
+DEFAULT_TEXTURE_BUDGET_BYTES = 768 * 1024 * 1024
+
+
+def _norm_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(str(path))))
+
+
+class GpuTextureCache:
+    # LRU of uploaded GL textures shared across model switches.
+    # Keys are (normalized path, mtime_ns, upload params); textures touched by
+    # the current model are pinned and never evicted until the next model starts.
+    def __init__(self, budget_bytes=DEFAULT_TEXTURE_BUDGET_BYTES, delete_fn=None):
+        self.budget_bytes = int(max(0, budget_bytes))
+        self.delete_fn = delete_fn
+        self.used_bytes = 0
+        self.uploads = 0
+        self.evictions = 0
+        # (normalized path, mtime_ns) -> {"has_alpha", "has_alpha_channel", "width", "height"}.
+        # Kept while a texture of that file version is cached or the current model touched it.
+        self.metadata = {}
+        self._entries = OrderedDict()
+        self._path_keys = {}
+        self._meta_keys = {}
+        self._pinned = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def make_key(self, path: str, upload_params=()):
+        try:
+            mtime_ns = int(os.stat(path).st_mtime_ns)
+        except OSError:
+            return None
+        return (_norm_path(path), mtime_ns, tuple(upload_params))
+
+    def lookup(self, path: str, upload_params=()):
+        if not path:
+            return None, 0
+        memo_key = (path, tuple(upload_params))
+        key = self._path_keys.get(memo_key)
+        if key is None:
+            key = self.make_key(path, upload_params)
+            if key is None:
+                return None, 0
+            self._path_keys[memo_key] = key
+        entry = self._entries.get(key)
+        if entry is None:
+            return key, 0
+        self._entries.move_to_end(key)
+        self._pinned.add(key)
+        return key, int(entry[0])
+
+    def insert(self, key, texture_id: int, size_bytes: int):
+        if key is None or not texture_id:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= int(old[1])
+            if int(old[0]) != int(texture_id):
+                self._delete([int(old[0])])
+        self._entries[key] = (int(texture_id), int(max(0, size_bytes)))
+        self.used_bytes += int(max(0, size_bytes))
+        self._pinned.add(key)
+        self.uploads += 1
+        self.evict()
+
+    def _meta_key(self, path: str):
+        # Like lookup(): the file is stat'ed once per path and model, then memoized.
+        key = self._meta_keys.get(path)
+        if key is None:
+            try:
+                mtime_ns = int(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtime_ns = -1
+            key = (_norm_path(path), mtime_ns)
+            self._meta_keys[path] = key
+        return key
+
+    def get_meta(self, path: str):
+        if not path:
+            return None
+        return self.metadata.get(self._meta_key(path))
+
+    def update_meta(self, path: str, **values):
+        if not path:
+            return {}
+        meta = self.metadata.setdefault(self._meta_key(path), {})
+        meta.update(values)
+        return meta
+
+    def has_alpha(self, path: str) -> bool:
+        meta = self.get_meta(path)
+        return bool(meta.get("has_alpha", False)) if meta else False
+
+    def begin_model(self):
+        # New model: previous pins are released and mtimes are re-checked lazily.
+        self._pinned = set()
+        self._path_keys = {}
+        self._meta_keys = {}
+        self.evict()
+        self._prune_meta()
+
+    def set_budget_bytes(self, budget_bytes: int):
+        self.budget_bytes = int(max(0, budget_bytes))
+        self.evict()
+
+    def evict(self):
+        if self.used_bytes <= self.budget_bytes:
+            return 0
+        doomed = []
+        for key, (texture_id, size_bytes) in self._entries.items():
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if key in self._pinned:
+                continue
+            doomed.append(key)
+            self.used_bytes -= int(size_bytes)
+        ids = [int(self._entries.pop(key)[0]) for key in doomed]
+        self.evictions += len(ids)
+        self._delete(ids)
+        if ids:
+            self._prune_meta()
+        return len(ids)
+
+    def clear(self):
+        ids = [int(entry[0]) for entry in self._entries.values()]
+        self._entries = OrderedDict()
+        self._path_keys = {}
+        self._meta_keys = {}
+        self._pinned = set()
+        self.used_bytes = 0
+        self.metadata.clear()
+        self._delete(ids)
+
+    def _prune_meta(self):
+        # Metadata goes with the textures of its file version; flags read for the current
+        # model (memoized in _meta_keys) stay until the next begin_model.
+        live = {key[:2] for key in self._entries}
+        live.update(self._meta_keys.values())
+        for key in [key for key in self.metadata if key not in live]:
+            del self.metadata[key]
+
+    def stats(self):
+        return {
+            "textures": len(self._entries),
+            "pinned": len(self._pinned),
+            "metadata": len(self.metadata),
+            "used_bytes": int(self.used_bytes),
+            "budget_bytes": int(self.budget_bytes),
+            "uploads": int(self.uploads),
+            "evictions": int(self.evictions),
+        }
+
+    def _delete(self, texture_ids):
+        texture_ids = [int(t) for t in texture_ids if t]
+        if texture_ids and self.delete_fn is not None:
+            self.delete_fn(texture_ids)
@@ -0,0 +1,88 @@
+RENDER_SCALE_STEPS = (1.0, 0.85, 0.7, 0.5)
+
+
+class InteractionQualityGovernor:
+    # Chooses how much to degrade frames while the camera moves.
+    # Level 0 is full quality; higher levels shrink the render target and drop
+    # shadow refresh plus normal/roughness sampling. Levels follow measured
+    # frame times: the last settled frame seeds the first interactive frame,
+    # then an EMA of interactive frame intervals steps the level up or down.
+    def __init__(self, target_frame_ms: float = 20.0, smoothing: float = 0.25):
+        self.enabled = True
+        self.target_frame_ms = float(target_frame_ms)
+        self.smoothing = float(smoothing)
+        self.level = 0
+        self.static_frame_ms = 0.0
+        self.interactive_frame_ms = 0.0
+        self._interacting = False
+        self._last_frame_end = 0.0
+
+    @property
+    def scale(self) -> float:
+        if not self.enabled:
+            return 1.0
+        return RENDER_SCALE_STEPS[self.level]
+
+    @property
+    def reduce_detail(self) -> bool:
+        return self.enabled and self.level > 0
+
+    def reset(self):
+        self.level = 0
+        self.static_frame_ms = 0.0
+        self.interactive_frame_ms = 0.0
+        self._last_frame_end = 0.0
+
+    def begin_frame(self, interacting: bool) -> bool:
+        # Returns True when this frame should be rendered at reduced quality.
+        if not self.enabled:
+            return False
+        if interacting and not self._interacting:
+            self.interactive_frame_ms = 0.0
+            self._last_frame_end = 0.0
+            self.level = self._initial_level()
+        self._interacting = bool(interacting)
+        return self._interacting and self.level > 0
+
+    def end_frame(self, now: float, paint_ms: float):
+        if not self._interacting:
+            self.static_frame_ms = self._ema(self.static_frame_ms, paint_ms)
+            self._last_frame_end = 0.0
+            return
+        # Interval between interactive frames also covers swap and GPU stalls;
+        # long gaps mean the user paused, not that the frame was slow.
+        sample = paint_ms
+        if self._last_frame_end > 0.0:
+            interval_ms = (now - self._last_frame_end) * 1000.0
+            if interval_ms < 250.0:
+                sample = max(sample, interval_ms)
+        self._last_frame_end = now
+        self.interactive_frame_ms = self._ema(self.interactive_frame_ms, sample)
+        if self.interactive_frame_ms > self.target_frame_ms * 1.15 and self.level < len(RENDER_SCALE_STEPS) - 1:
+            self.level += 1
+            self.interactive_frame_ms = 0.0
+        elif self.interactive_frame_ms and self.interactive_frame_ms < self.target_frame_ms * 0.5 and self.level > 0:
+            self.level -= 1
+            self.interactive_frame_ms = 0.0
+
+    def status_text(self) -> str:
+        if not self.enabled:
+            return "off"
+        return (
+            f"scale {self.scale:.2f} | static {self.static_frame_ms:.1f} ms"
+            f" | moving {self.interactive_frame_ms:.1f} ms (target {self.target_frame_ms:.0f})"
+        )
+
+    def _initial_level(self) -> int:
+        # Pixel cost scales with area, so pick the first step whose estimate fits the budget.
+        if self.static_frame_ms <= self.target_frame_ms:
+            return min(self.level, 1)
+        for level, scale in enumerate(RENDER_SCALE_STEPS):
+            if self.static_frame_ms * scale * scale <= self.target_frame_ms:
+                return max(level, self.level)
+        return len(RENDER_SCALE_STEPS) - 1
+
+    def _ema(self, current: float, sample: float) -> float:
+        if current <= 0.0:
+            return float(sample)
+        return current + (float(sample) - current) * self.smoothing
@@ -29,6 +29,7 @@ from viewer.controllers.catalog_controller import CatalogController
 from viewer.controllers.catalog_log_controller import CatalogLogController
 from viewer.controllers.catalog_ui_controller import CatalogUiController
 from viewer.controllers.catalog_view_controller import CatalogViewController
+from viewer.controllers.catalog_watch_controller import CatalogWatchController
 from viewer.controllers.directory_scan_controller import DirectoryScanController
 from viewer.controllers.directory_ui_controller import DirectoryUiController
 from viewer.controllers.material_controller import MaterialController
@@ -56,12 +57,16 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.gl_widget = OpenGLWidget(self)
         self.gl_widget.on_key_azimuth_changed = self._on_key_azimuth_drag_from_viewport
+        self.gl_widget.on_material_picked = self._on_viewport_material_picked
+        self.gl_widget.on_measure_changed = self._on_viewport_measure_changed
         self.settings = QSettings("3d-viewer", "model-browser")
         self.catalog_db_path = init_catalog_db()
         self._settings_ready = False
         self.current_directory = ""
         self.model_files = []
         self.filtered_model_files = []
+        # Rows of catalog_controller.snapshot behind filtered_model_files.
+        self.filtered_rows = None
         self.favorite_paths = set()
         self.current_file_path = ""
         self._selected_model_path = ""
@@ -121,9 +126,13 @@ class MainWindow(QMainWindow):
         self.directory_scan_controller = DirectoryScanController(self)
         self.directory_scan_controller.scanFinished.connect(self._on_directory_scan_finished)
         self.directory_scan_controller.scanFailed.connect(self._on_directory_scan_failed)
+        self.directory_scan_controller.scanProgress.connect(self._on_directory_scan_progress)
         self.catalog_index_controller = CatalogIndexController(self)
         self.catalog_index_controller.scanFinished.connect(self._on_index_scan_finished)
         self.catalog_index_controller.scanFailed.connect(self._on_index_scan_failed)
+        self.catalog_watch_controller = CatalogWatchController(self)
+        self.catalog_watch_controller.changesApplied.connect(self._on_catalog_watch_changes)
+        self.catalog_watch_controller.watchFailed.connect(self._on_catalog_watch_failed)
         self.model_session_controller = ModelSessionController(self)
         self.model_session_controller.loadingStarted.connect(self._on_model_loading_started)
         self.model_session_controller.loaded.connect(self._on_model_loaded)
@@ -460,6 +469,40 @@ class MainWindow(QMainWindow):
         light_general_layout.addRow("Ambient", amb_row)
         light_root.addWidget(light_general_group)
 
+        light_env_group = QGroupBox("Environment (HDRI)", self)
+        light_env_layout = QFormLayout(light_env_group)
+
+        self.environment_combo = QComboBox(self)
+        self.environment_combo.addItem("Нет", "")
+        self.environment_combo.currentIndexChanged.connect(self._on_environment_changed)
+        env_row = QHBoxLayout()
+        env_row.addWidget(self.environment_combo, stretch=1)
+        self.environment_button = QPushButton("HDRI...", self)
+        self.environment_button.clicked.connect(self._choose_environment_map)
+        env_row.addWidget(self.environment_button)
+        light_env_layout.addRow("Map", env_row)
+
+        self.environment_intensity_label = QLabel("1.00", self)
+        self.environment_intensity_slider = QSlider(Qt.Horizontal, self)
+        self.environment_intensity_slider.setRange(0, 300)
+        self.environment_intensity_slider.setValue(100)
+        self.environment_intensity_slider.valueChanged.connect(self._on_environment_intensity_changed)
+        env_int_row = QHBoxLayout()
+        env_int_row.addWidget(self.environment_intensity_slider, stretch=1)
+        env_int_row.addWidget(self.environment_intensity_label)
+        light_env_layout.addRow("Intensity", env_int_row)
+
+        self.environment_rotation_label = QLabel("0°", self)
+        self.environment_rotation_slider = QSlider(Qt.Horizontal, self)
+        self.environment_rotation_slider.setRange(-180, 180)
+        self.environment_rotation_slider.setValue(0)
+        self.environment_rotation_slider.valueChanged.connect(self._on_environment_rotation_changed)
+        env_rot_row = QHBoxLayout()
+        env_rot_row.addWidget(self.environment_rotation_slider, stretch=1)
+        env_rot_row.addWidget(self.environment_rotation_label)
+        light_env_layout.addRow("Rotation", env_rot_row)
+        light_root.addWidget(light_env_group)
+
         light_rig_group = QGroupBox("Light Rig", self)
         light_rig_layout = QFormLayout(light_rig_group)
 
@@ -625,6 +668,8 @@ class MainWindow(QMainWindow):
         self._on_normals_hard_angle_changed(self.normals_hard_angle_slider.value())
         self._on_normals_policy_changed(self.normals_policy_combo.currentIndex())
         self._on_ambient_changed(self.ambient_slider.value())
+        self._on_environment_intensity_changed(self.environment_intensity_slider.value())
+        self._on_environment_rotation_changed(self.environment_rotation_slider.value())
         self._on_key_light_changed(self.key_light_slider.value())
         self._on_fill_light_changed(self.fill_light_slider.value())
         self._on_key_light_azimuth_changed(self.key_azimuth_slider.value())
@@ -858,6 +903,7 @@ class MainWindow(QMainWindow):
         shadow_bias = self.settings.value("view/shadow_bias_slider", 12, type=int)
         shadow_softness = self.settings.value("view/shadow_softness_slider", 100, type=int)
         shadow_quality = self.settings.value("view/shadow_quality", "balanced", type=str)
+        texture_budget_mb = self.settings.value("view/texture_cache_budget_mb", 768, type=int)
         auto_collapse = self.settings.value("view/auto_collapse_submeshes", 96, type=int)
         normals_policy = self.settings.value("view/normals_policy", "import", type=str)
         hard_angle = self.settings.value("view/normals_hard_angle", 60, type=int)
@@ -868,6 +914,10 @@ class MainWindow(QMainWindow):
         blend_base_alpha = self.settings.value("view/blend_base_alpha", False, type=bool)
         ui_theme = self.settings.value("view/ui_theme", "graphite", type=str)
         bg_color_hex = self.settings.value("view/bg_color_hex", "#14233f", type=str)
+        environment_path = self.settings.value("view/environment_path", "", type=str)
+        environment_recent = self.settings.value("view/environment_recent", [], type=list)
+        environment_intensity = self.settings.value("view/environment_intensity", 100, type=int)
+        environment_rotation = self.settings.value("view/environment_rotation", 0, type=int)
         projection = self.settings.value("view/projection_mode", "perspective", type=str)
         render_mode = self.settings.value("view/render_mode", "quality", type=str)
         shadows = self.settings.value("view/shadows_enabled", False, type=bool)
@@ -916,6 +966,14 @@ class MainWindow(QMainWindow):
         if qcolor.isValid():
             self._apply_background_color(qcolor)
 
+        self.environment_intensity_slider.setValue(
+            max(self.environment_intensity_slider.minimum(), min(self.environment_intensity_slider.maximum(), environment_intensity))
+        )
+        self.environment_rotation_slider.setValue(
+            max(self.environment_rotation_slider.minimum(), min(self.environment_rotation_slider.maximum(), environment_rotation))
+        )
+        self.render_settings_controller.restore_environment(environment_recent, environment_path)
+
         projection_idx = self.projection_combo.findData(projection)
         if projection_idx >= 0:
             self.projection_combo.setCurrentIndex(projection_idx)
@@ -928,6 +986,7 @@ class MainWindow(QMainWindow):
         shadow_quality_idx = self.shadow_quality_combo.findData(shadow_quality)
         if shadow_quality_idx >= 0:
             self.shadow_quality_combo.setCurrentIndex(shadow_quality_idx)
+        self.gl_widget.set_texture_cache_budget_mb(max(64, int(texture_budget_mb)))
         self.shadows_checkbox.setChecked(bool(shadows))
         # Force synchronization even when checkbox value didn't change
         # (stateChanged signal is not emitted in that case).
@@ -972,12 +1031,21 @@ class MainWindow(QMainWindow):
     def _start_directory_scan(self, directory: str, auto_select_first: bool):
         self.directory_ui_controller.start_directory_scan(directory, auto_select_first=auto_select_first)
 
-    def _on_directory_scan_finished(self, request_id: int, directory: str, files, auto_select_first: bool):
-        self.directory_ui_controller.on_directory_scan_finished(request_id, directory, files, auto_select_first)
+    def _on_directory_scan_finished(self, request_id: int, directory: str, result, auto_select_first: bool):
+        self.directory_ui_controller.on_directory_scan_finished(request_id, directory, result, auto_select_first)
 
     def _on_directory_scan_failed(self, request_id: int, error_text: str):
         self.directory_ui_controller.on_directory_scan_failed(request_id, error_text)
 
+    def _on_directory_scan_progress(self, request_id: int, directory: str, count: int):
+        self.directory_ui_controller.on_directory_scan_progress(request_id, directory, count)
+
+    def _on_catalog_watch_changes(self, directory: str, changes, stats):
+        self.directory_ui_controller.on_catalog_watch_changes(directory, changes, stats)
+
+    def _on_catalog_watch_failed(self, error_text: str):
+        self.directory_ui_controller.on_catalog_watch_failed(error_text)
+
     def _top_category(self, file_path: str) -> str:
         return self.catalog_view_controller.top_category(file_path)
 
@@ -1037,6 +1105,12 @@ class MainWindow(QMainWindow):
     def _toggle_overlay_action(self):
         self.navigation_ui_controller.toggle_overlay_action()
 
+    def _toggle_profiler_action(self):
+        self.navigation_ui_controller.toggle_profiler_action()
+
+    def _dump_render_profile_action(self):
+        self.navigation_ui_controller.dump_render_profile_action()
+
     def _populate_material_controls(self, texture_sets):
         self.material_ui_controller.populate_material_controls(texture_sets)
 
@@ -1154,6 +1228,24 @@ class MainWindow(QMainWindow):
     def _on_ambient_changed(self, value: int):
         self.render_settings_controller.on_ambient_changed(value)
 
+    def _on_environment_changed(self, _value: int):
+        self.render_settings_controller.on_environment_changed()
+
+    def _choose_environment_map(self):
+        self.render_settings_controller.choose_environment_map()
+
+    def _on_environment_loaded(self, request_id: int, lighting):
+        self.render_settings_controller.on_environment_loaded(request_id, lighting)
+
+    def _on_environment_failed(self, request_id: int, error_text: str):
+        self.render_settings_controller.on_environment_failed(request_id, error_text)
+
+    def _on_environment_intensity_changed(self, value: int):
+        self.render_settings_controller.on_environment_intensity_changed(value)
+
+    def _on_environment_rotation_changed(self, value: int):
+        self.render_settings_controller.on_environment_rotation_changed(value)
+
     def _on_key_light_changed(self, value: int):
         self.render_settings_controller.on_key_light_changed(value)
 
@@ -1175,6 +1267,12 @@ class MainWindow(QMainWindow):
     def _on_key_azimuth_drag_from_viewport(self, azimuth_value: float):
         self.render_settings_controller.on_key_azimuth_drag_from_viewport(azimuth_value)
 
+    def _on_viewport_material_picked(self, pick):
+        self.material_ui_controller.select_material_from_pick(pick)
+
+    def _on_viewport_measure_changed(self, distance, point_count: int):
+        self.navigation_ui_controller.on_viewport_measure_changed(distance, point_count)
+
     def _on_shadow_opacity_changed(self, value: int):
         self.render_settings_controller.on_shadow_opacity_changed(value)
 
@@ -1232,7 +1330,7 @@ class MainWindow(QMainWindow):
     def _on_model_load_failed(self, request_id: int, row: int, file_path: str, error_text: str):
         self.preview_ui_controller.on_model_load_failed(request_id, row, file_path, error_text)
 
-    def _start_index_scan(self, directory: str, scanned_paths=None):
+    def _start_index_scan(self, directory: str, scanned_paths=None, scanned_items=None, crawl_result=None):
         if not directory:
             return
         self._last_index_summary = None
@@ -1243,6 +1341,9 @@ class MainWindow(QMainWindow):
             model_extensions=self.model_extensions,
             db_path=self.catalog_db_path,
             scanned_paths=scanned_paths,
+            scanned_items=scanned_items,
+            event_retention=self.catalog_log_controller.event_retention(),
+            crawl_result=crawl_result,
         )
 
     def _on_index_scan_finished(self, summary: dict):
@@ -1363,6 +1464,7 @@ class MainWindow(QMainWindow):
         self.preview_ui_controller.on_catalog_thumb_size_changed(size)
 
     def closeEvent(self, event):
+        self.catalog_watch_controller.stop()
         self._save_workspace_state()
         try:
             self.settings.setValue("view/shadows_enabled", bool(self.shadows_checkbox.isChecked()))
@@ -0,0 +1,247 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+from PyQt5.QtCore import QEvent
+from PyQt5.QtGui import (
+    QCloseEvent,
+    QImage,
+    QOffscreenSurface,
+    QOpenGLContext,
+    QOpenGLFramebufferObject,
+    QOpenGLFramebufferObjectFormat,
+    QSurfaceFormat,
+)
+from OpenGL.GL import GL_PACK_ALIGNMENT, GL_RGBA, GL_UNSIGNED_BYTE, glFinish, glPixelStorei, glReadPixels
+
+from viewer.loaders.model_loader import load_model_payload
+from viewer.ui.opengl_widget import OpenGLWidget
+
+
+class _OffscreenScene(OpenGLWidget):
+    # Never shown: the widget only carries scene state, shaders and material resolution,
+    # while context, size and target framebuffer come from the owning OffscreenRenderer.
+    def __init__(self, renderer):
+        super().__init__(None)
+        self._renderer = renderer
+
+    def context(self):
+        return self._renderer.context
+
+    def makeCurrent(self):
+        self._renderer.make_current()
+
+    def doneCurrent(self):
+        # The offscreen context stays current for the whole render call.
+        return
+
+    def defaultFramebufferObject(self):
+        fbo = self._renderer.fbo
+        return int(fbo.handle()) if fbo is not None else 0
+
+    def width(self):
+        renderer = getattr(self, "_renderer", None)
+        return int(renderer.width) if renderer is not None else super().width()
+
+    def height(self):
+        renderer = getattr(self, "_renderer", None)
+        return int(renderer.height) if renderer is not None else super().height()
+
+    def update(self):
+        return
+
+
+class OffscreenRenderer:
+    def __init__(self, width: int = 256, height: int = 256, samples: int = 4):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.samples = max(0, int(samples))
+        self.context = None
+        self.surface = None
+        self.fbo = None
+        self.resolve_fbo = None
+        self.scene = None
+        self.last_error = ""
+        self._initialized = False
+
+    def make_current(self):
+        self._ensure_context()
+        if not self.context.makeCurrent(self.surface):
+            raise RuntimeError("Cannot make offscreen OpenGL context current.")
+
+    def render_payload(
+        self,
+        payload,
+        width: int = 0,
+        height: int = 0,
+        angle_x: float = 20.0,
+        angle_y: float = 35.0,
+        shadows: bool = False,
+        background=None,
+    ) -> np.ndarray:
+        self.prepare(payload, width=width, height=height, shadows=shadows, background=background)
+        return self.draw_frame(angle_x, angle_y, read_back=True)
+
+    def prepare(self, payload, width: int = 0, height: int = 0, shadows: bool = False, background=None):
+        # Loads the payload into the scene once; draw_frame() can then be called repeatedly.
+        if width:
+            self.width = max(1, int(width))
+        if height:
+            self.height = max(1, int(height))
+        self.make_current()
+        self._ensure_targets()
+        scene = self._ensure_scene()
+        if background is not None:
+            scene.set_background_color(*background)
+        if not scene.apply_payload(payload):
+            self.last_error = scene.last_error
+            raise RuntimeError(scene.last_error or "Model does not contain valid geometry.")
+        scene.set_shadows_enabled(bool(shadows))
+        return scene
+
+    def draw_frame(self, angle_x: float = 20.0, angle_y: float = 35.0, read_back: bool = False):
+        # Renders one frame and waits for the GPU; returns the image only when read_back is set.
+        self.make_current()
+        scene = self._ensure_scene()
+        scene.set_angle(float(angle_x), float(angle_y))
+        raw = None
+        self.fbo.bind()
+        try:
+            scene.resizeGL(self.width, self.height)
+            scene.paintGL()
+            if self.resolve_fbo is not None and read_back:
+                QOpenGLFramebufferObject.blitFramebuffer(self.resolve_fbo, self.fbo)
+                self.resolve_fbo.bind()
+            glFinish()
+            if read_back:
+                glPixelStorei(GL_PACK_ALIGNMENT, 1)
+                raw = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        finally:
+            QOpenGLFramebufferObject.bindDefault()
+        if not read_back:
+            return None
+        if not isinstance(raw, (bytes, bytearray)):
+            raw = np.asarray(raw, dtype=np.uint8).tobytes()
+        image = np.frombuffer(raw, dtype=np.uint8).reshape(self.height, self.width, 4)
+        # GL rows start at the bottom; callers get a top-down RGBA image.
+        return np.ascontiguousarray(np.flipud(image))
+
+    def render_file(self, file_path: str, **kwargs) -> np.ndarray:
+        payload = load_model_payload(file_path, normals_policy="import")
+        return self.render_payload(payload, **kwargs)
+
+    def close(self):
+        if self.context is None:
+            return
+        try:
+            self.make_current()
+            if self.scene is not None:
+                self.scene.closeEvent(QCloseEvent())
+                self.scene.deleteLater()
+            self.fbo = None
+            self.resolve_fbo = None
+            self.context.doneCurrent()
+        except RuntimeError:
+            pass
+        self.scene = None
+        self.context = None
+        self.surface = None
+        self._initialized = False
+
+    def _ensure_context(self):
+        if self.context is not None:
+            return
+        fmt = QSurfaceFormat.defaultFormat()
+        fmt.setDepthBufferSize(24)
+        # Frames go to an FBO, never to a swap chain, so they are not vsync-limited.
+        fmt.setSwapInterval(0)
+        self.context = QOpenGLContext()
+        self.context.setFormat(fmt)
+        if not self.context.create():
+            self.context = None
+            raise RuntimeError("Cannot create offscreen OpenGL context.")
+        self.surface = QOffscreenSurface()
+        self.surface.setFormat(self.context.format())
+        self.surface.create()
+        if not self.surface.isValid():
+            raise RuntimeError("Offscreen surface is not supported by this platform.")
+
+    def _ensure_targets(self):
+        if self.fbo is not None and self.fbo.width() == self.width and self.fbo.height() == self.height:
+            return
+        fmt = QOpenGLFramebufferObjectFormat()
+        fmt.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
+        fmt.setSamples(self.samples)
+        self.fbo = QOpenGLFramebufferObject(self.width, self.height, fmt)
+        self.resolve_fbo = QOpenGLFramebufferObject(self.width, self.height) if self.samples > 0 else None
+        if not self.fbo.isValid():
+            raise RuntimeError("Offscreen framebuffer is incomplete.")
+
+    def _ensure_scene(self):
+        if self.scene is None:
+            self.scene = _OffscreenScene(self)
+        if not self._initialized:
+            self.scene.initializeGL()
+            self._initialized = True
+        return self.scene
+
+
+def render_payload_to_array(payload, width: int = 256, height: int = 256, **kwargs) -> np.ndarray:
+    renderer = OffscreenRenderer(width=width, height=height)
+    try:
+        return renderer.render_payload(payload, **kwargs)
+    finally:
+        renderer.close()
+
+
+def array_to_qimage(image: np.ndarray) -> QImage:
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = int(image.shape[0]), int(image.shape[1])
+    return QImage(image.tobytes(), width, height, width * 4, QImage.Format_RGBA8888).copy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render model previews without a window.")
+    parser.add_argument("models", nargs="+", help="model files to render")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--out-dir", default="", help="write <model>.png files here")
+    parser.add_argument("--catalog", action="store_true", help="store results as catalog previews")
+    parser.add_argument("--shadows", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Widgets still need a QApplication; "offscreen" avoids any visible window.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    renderer = OffscreenRenderer(width=args.size, height=args.size)
+    failed = 0
+    try:
+        for model_path in args.models:
+            try:
+                image = renderer.render_file(model_path, shadows=args.shadows)
+            except Exception as exc:
+                failed += 1
+                print(f"[offscreen] {model_path}: {exc}", file=sys.stderr)
+                continue
+            qimage = array_to_qimage(image)
+            if args.catalog:
+                from viewer.services.preview_cache import save_viewport_preview
+
+                out_path = save_viewport_preview(model_path, qimage, size=args.size, force_rebuild=True)
+            else:
+                out_dir = args.out_dir or os.path.dirname(os.path.abspath(model_path))
+                os.makedirs(out_dir, exist_ok=True)
+                out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(model_path))[0] + ".png")
+                qimage.save(out_path, "PNG")
+            print(f"[offscreen] {model_path} -> {out_path}")
+    finally:
+        renderer.close()
+        # Delivers the deferred deletes of the GL widget before the app goes away.
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
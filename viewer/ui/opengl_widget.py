@@ -1,8 +1,10 @@
 import html
 import os
+import time
 
 import numpy as np
 from PyQt5.QtCore import QPoint, Qt, QTimer
+from PyQt5.QtGui import QOpenGLContext, QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat
 from PyQt5.QtWidgets import QLabel, QOpenGLWidget
 from OpenGL.GL import (
     GL_BLEND,
@@ -23,6 +25,7 @@ from OpenGL.GL import (
     GL_TEXTURE2,
     GL_TEXTURE3,
     GL_TEXTURE4,
+    GL_TEXTURE5,
     GL_TEXTURE_2D,
     GL_TEXTURE_MAG_FILTER,
     GL_TEXTURE_MIN_FILTER,
@@ -36,6 +39,8 @@ from OpenGL.GL import (
     GL_VERTEX_SHADER,
     GL_DEPTH_COMPONENT,
     GL_FRAMEBUFFER,
+    GL_DRAW_FRAMEBUFFER,
+    GL_READ_FRAMEBUFFER,
     GL_DEPTH_ATTACHMENT,
     GL_FRAMEBUFFER_COMPLETE,
     GL_NEAREST,
@@ -45,6 +50,9 @@ from OpenGL.GL import (
     GL_FRONT,
     GL_NONE,
     GL_POLYGON_OFFSET_FILL,
+    GL_COLOR_CLEAR_VALUE,
+    GL_PACK_ALIGNMENT,
+    GL_SCISSOR_TEST,
     glActiveTexture,
     glBindTexture,
     glBlendFunc,
@@ -62,6 +70,7 @@ from OpenGL.GL import (
     glEnableClientState,
     glFramebufferTexture2D,
     glBindFramebuffer,
+    glBlitFramebuffer,
     glGenFramebuffers,
     glDeleteFramebuffers,
     glCheckFramebufferStatus,
@@ -69,6 +78,8 @@ from OpenGL.GL import (
     glGenTextures,
     glGetUniformLocation,
     glLoadIdentity,
+    glLoadMatrixf,
+    glMultMatrixf,
     glMatrixMode,
     glPopMatrix,
     glPushMatrix,
@@ -83,8 +94,13 @@ from OpenGL.GL import (
     glUniform1f,
     glUniform1i,
     glUniform3f,
+    glUniform3fv,
+    glUniformMatrix3fv,
     glUniformMatrix4fv,
     glReadBuffer,
+    glReadPixels,
+    glScissor,
+    glGetFloatv,
     glPolygonOffset,
     glUseProgram,
     glBegin,
@@ -99,7 +115,7 @@ from OpenGL.GL import (
     GL_TEXTURE_COORD_ARRAY,
     GL_VERTEX_ARRAY,
 )
-from OpenGL.GLU import gluLookAt, gluPerspective
+from OpenGL.GLU import gluPerspective
 from OpenGL.GL.shaders import compileProgram, compileShader
 
 try:
@@ -108,6 +124,26 @@ except ImportError:
     Image = None
 
 from viewer.loaders.model_loader import load_model_payload
+from viewer.ui.gl_core import (
+    CORE_FRAGMENT_SHADER_BACKGROUND_SRC,
+    CORE_FRAGMENT_SHADER_DEPTH_SRC,
+    CORE_VERTEX_SHADER_BACKGROUND_SRC,
+    CORE_VERTEX_SHADER_DEPTH_SRC,
+    CORE_VERTEX_SHADER_SHADOW_CATCHER_SRC,
+    CORE_VERTEX_SHADER_SRC,
+    CoreMeshBuffers,
+    CoreInstancedMesh,
+    StaticQuad,
+    core_fragment_source,
+    gl_version_at_least,
+    set_identity_instance_attribute,
+)
+from viewer.ui.gpu_texture_cache import GpuTextureCache
+from viewer.ui.interaction_quality import InteractionQualityGovernor
+from viewer.ui.render_profiler import RenderProfiler
+from viewer.ui.shader_variants import ShaderVariantCache
+from viewer.utils.mesh_bvh import MeshBVH, measure_distance, raycast_instances
+from viewer.utils.texture_cache import decode_texture, get_texture_alpha_flags
 
 CHANNEL_BASE = "basecolor"
 CHANNEL_METAL = "metal"
@@ -194,6 +230,12 @@ uniform sampler2D uShadowMap;
 uniform vec2 uShadowTexelSize;
 uniform float uShadowBias;
 uniform float uShadowSoftness;
+uniform int uUseEnv;
+uniform sampler2D uEnvMap;
+uniform vec3 uEnvSH[9];
+uniform mat3 uEnvViewToWorld;
+uniform vec2 uEnvAtlas;
+uniform float uEnvIntensity;
 
 float DistributionGGX(vec3 N, vec3 H, float roughness) {
     float a = roughness * roughness;
@@ -273,6 +315,51 @@ float computeShadow(vec3 N, vec3 L) {
     return 1.0 - shadow;
 }
 
+vec3 envIrradiance(vec3 n) {
+    // Nine-term SH with the cosine convolution baked in; the result is irradiance / pi.
+    vec3 e = uEnvSH[0]
+        + uEnvSH[1] * n.y + uEnvSH[2] * n.z + uEnvSH[3] * n.x
+        + uEnvSH[4] * (n.x * n.y) + uEnvSH[5] * (n.y * n.z) + uEnvSH[6] * (3.0 * n.z * n.z - 1.0)
+        + uEnvSH[7] * (n.x * n.z) + uEnvSH[8] * (n.x * n.x - n.y * n.y);
+    return max(e, vec3(0.0));
+}
+
+vec3 sampleEnvBand(vec2 uv, float band) {
+    // Atlas bands are equirect maps without mips; clamp inside the band so bilinear taps do not bleed.
+    float t = clamp(1.0 - uv.y, 0.5 / uEnvAtlas.y, 1.0 - 0.5 / uEnvAtlas.y);
+    vec4 rgbm = texture2D(uEnvMap, vec2(uv.x, (band + t) / uEnvAtlas.x));
+    // RGBM range matches ENV_RGBM_RANGE in viewer.utils.environment_map.
+    return rgbm.rgb * (rgbm.a * 16.0);
+}
+
+vec3 envSpecular(vec3 dirWorld, float roughness) {
+    vec2 uv = vec2(atan(dirWorld.x, -dirWorld.z) * 0.15915494 + 0.5, acos(clamp(dirWorld.y, -1.0, 1.0)) * 0.31830989);
+    float lod = roughness * (uEnvAtlas.x - 1.0);
+    float band0 = floor(lod);
+    float band1 = min(band0 + 1.0, uEnvAtlas.x - 1.0);
+    return mix(sampleEnvBand(uv, band0), sampleEnvBand(uv, band1), lod - band0);
+}
+
+vec2 envBrdfApprox(float NdotV, float roughness) {
+    // Analytic fit of the split-sum BRDF integral, so no LUT texture is needed.
+    vec4 c0 = vec4(-1.0, -0.0275, -0.572, 0.022);
+    vec4 c1 = vec4(1.0, 0.0425, 1.04, -0.04);
+    vec4 r = roughness * c0 + c1;
+    float a004 = min(r.x * r.x, exp2(-9.28 * NdotV)) * r.x + r.y;
+    return vec2(-1.04, 1.04) * a004 + r.zw;
+}
+
+vec3 computeEnvironmentLight(vec3 N, vec3 V, vec3 albedo, float metallic, float roughness, vec3 F0) {
+    float NdotV = max(dot(N, V), 0.0);
+    vec3 kS = F0 + (max(vec3(1.0 - roughness), F0) - F0) * pow(1.0 - NdotV, 5.0);
+    vec3 kD = (vec3(1.0) - kS) * (1.0 - metallic);
+    vec3 Nw = normalize(uEnvViewToWorld * N);
+    vec3 Rw = normalize(uEnvViewToWorld * reflect(-V, N));
+    vec2 brdf = envBrdfApprox(NdotV, roughness);
+    vec3 specular = envSpecular(Rw, roughness) * (F0 * brdf.x + brdf.y);
+    return (kD * albedo * envIrradiance(Nw) + specular) * uEnvIntensity;
+}
+
 vec3 computeDirectionalLight(vec3 N, vec3 V, vec3 albedo, float metallic, float roughness, vec3 F0, vec3 lightDir, vec3 lightColor) {
     vec3 L = normalize(lightDir);
     vec3 H = normalize(V + L);
@@ -358,6 +445,9 @@ void main() {
     Lo += computeDirectionalLight(N, V, base, metallic, roughness, F0, uLightDirView1, uLightColor1);
 
     vec3 ambient = vec3(uAmbientStrength) * base;
+    if (uUseEnv == 1) {
+        ambient = computeEnvironmentLight(N, V, base, metallic, roughness, F0);
+    }
     vec3 color = ambient + Lo;
 
     // Simple filmic tonemap + gamma
@@ -386,6 +476,15 @@ void main() {
 }
 """
 
+FRAGMENT_SHADER_PICK_SRC = """
+#version 120
+uniform vec3 uPickColor;
+
+void main() {
+    gl_FragColor = vec4(uPickColor, 1.0);
+}
+"""
+
 VERTEX_SHADER_SHADOW_CATCHER_SRC = """
 #version 120
 varying vec4 vShadowCoord;
@@ -441,6 +540,14 @@ void main() {
 }
 """
 
+# Uploaded environment atlases kept besides the current one, least recently used dropped first.
+_ENV_TEXTURES_KEEP = 2
+
+_UNIT_CUBE_CORNERS = np.array(
+    [[sx, sy, sz] for sx in (-1.0, 1.0) for sy in (-1.0, 1.0) for sz in (-1.0, 1.0)],
+    dtype=np.float32,
+)
+
 
 class OpenGLWidget(QOpenGLWidget):
     def __init__(self, parent=None):
@@ -462,7 +569,11 @@ class OpenGLWidget(QOpenGLWidget):
         self._inertia_damping = 0.92
         self._inertia_min_velocity = 0.01
         self._last_mouse_left_drag = False
+        self._mouse_drag_active = False
         self.on_key_azimuth_changed = None
+        self.on_material_picked = None
+        self.on_measure_changed = None
+        self._pick_press_pos = None
 
         self.vertices = np.array([], dtype=np.float32)
         self.indices = np.array([], dtype=np.uint32)
@@ -470,6 +581,15 @@ class OpenGLWidget(QOpenGLWidget):
         self.texcoords = np.array([], dtype=np.float32)
 
         self.shader_program = None
+        # "core" = GL 3.3 VAO/uniform-matrix path, "legacy" = fixed-function bridge for old drivers.
+        self.render_path = "legacy"
+        self.render_path_preference = str(os.environ.get("VIEWER_RENDER_PATH", "auto") or "auto").strip().lower()
+        self.render_path_status = ""
+        self.background_program = None
+        self._core_mesh = CoreMeshBuffers()
+        self._core_mesh_dirty = True
+        self._core_quad = StaticQuad()
+        self._proj_matrix = np.identity(4, dtype=np.float32)
         self.texture_ids = {ch: 0 for ch in ALL_CHANNELS}
         self.last_texture_path = ""
         self.last_texture_paths = {ch: "" for ch in ALL_CHANNELS}
@@ -477,15 +597,45 @@ class OpenGLWidget(QOpenGLWidget):
         self.material_channel_overrides = {}
         self.two_sided_global_override = False
         self.material_two_sided_overrides = {}
-        self.texture_cache = {}
-        self.texture_alpha_cache = {}
-        self.texture_alpha_channel_cache = {}
+        self.texture_cache = GpuTextureCache(delete_fn=self._delete_texture_ids)
         self.base_texture_has_alpha = False
         self.last_texture_sets = {}
         self.last_texture_candidates = []
         self.submeshes = []
+        self.instance_groups = []
+        self.mesh_stats = None
+        self._core_instances = []
+        self._core_instances_dirty = True
         self.last_debug_info = {}
         self.last_error = ""
+        self.frustum_culling_enabled = True
+        # Blend mode: transparent submeshes are drawn far-to-near by centroid, and triangles
+        # inside submeshes up to this size are depth-sorted too (0 disables triangle sorting).
+        self.sort_transparent = True
+        self.transparent_sort_max_triangles = 250000
+        self._submesh_centroids = np.zeros((0, 3), dtype=np.float32)
+        self._submesh_slot_by_indices = {}
+        self._triangle_centroid_cache = {}
+        self._sorted_triangle_cache = {}
+        # Submeshes whose projected extent is below this many pixels are skipped while the camera moves.
+        self.small_feature_cull_px = 2.0
+        self._submesh_bounds_min = np.zeros((0, 3), dtype=np.float32)
+        self._submesh_bounds_max = np.zeros((0, 3), dtype=np.float32)
+        self.cull_stats = {"total": 0, "drawn": 0, "frustum": 0, "small": 0}
+        # Instance groups are culled as a whole by the AABB of all their placements.
+        self._instance_bounds_min = np.zeros((0, 3), dtype=np.float32)
+        self._instance_bounds_max = np.zeros((0, 3), dtype=np.float32)
+        self.instance_cull_stats = {"total": 0, "drawn": 0, "frustum": 0, "small": 0}
+        self.pick_program = None
+        self._pick_fbo = None
+        # Per-material specialized programs; shader_program is the one currently bound while drawing.
+        self.shader_variants_enabled = os.environ.get("VIEWER_SHADER_VARIANTS", "1") != "0"
+        self._shader_variants = None
+        self._uber_program = None
+        self._mesh_bvh = None
+        self._instance_bvhs = None
+        self.last_pick = None
+        self.measure_points = []
 
         self.unlit_texture_preview = False
         self.light_positions = [
@@ -501,6 +651,11 @@ class OpenGLWidget(QOpenGLWidget):
             [0.75, 0.8, 1.0],
         ]
         self.ambient_strength = 0.08
+        # Image-based lighting replaces the constant ambient term when an HDRI is set.
+        self.environment = None
+        self.environment_intensity = 1.0
+        self.environment_rotation_deg = 0.0
+        self._environment_textures = {}
         self.key_light_intensity = 18.0
         self.fill_light_intensity = 10.0
         self.alpha_cutoff = 0.5
@@ -519,6 +674,8 @@ class OpenGLWidget(QOpenGLWidget):
         self.depth_shader_program = None
         self.shadow_catcher_program = None
         self._light_vp = np.identity(4, dtype=np.float32)
+        # Depth map depends only on key light, model placement and map size, not on the orbit camera.
+        self._shadow_map_dirty = True
         self.shadow_catcher_opacity = 0.42
         self.shadow_bias = 0.0012
         self.shadow_softness = 1.0
@@ -552,30 +709,77 @@ class OpenGLWidget(QOpenGLWidget):
         self._warmup_timer = QTimer(self)
         self._warmup_timer.setSingleShot(True)
         self._warmup_timer.timeout.connect(self._warmup_next_texture)
+        self.render_profiler = RenderProfiler()
+        self.quality_governor = InteractionQualityGovernor()
+        self._interaction_fbo = None
+        self._reduced_quality_frame = False
+        self._overlay_refresh_timer = QTimer(self)
+        self._overlay_refresh_timer.setInterval(500)
+        self._overlay_refresh_timer.timeout.connect(self._refresh_overlay_text)
 
     def initializeGL(self):
         glEnable(GL_DEPTH_TEST)
         glClearColor(0.0, 0.0, 0.0, 1.0)
-        self._init_shaders()
+        # A (re)created context owns no buffers yet; drop stale ids instead of deleting them.
+        self._core_mesh = CoreMeshBuffers()
+        self._core_quad = StaticQuad()
+        self._core_instances = []
+        self._core_instances_dirty = True
+        self.pick_program = None
+        self._pick_fbo = None
+        self.render_path = "legacy"
+        if self.render_path_preference != "legacy" and gl_version_at_least(3, 3):
+            try:
+                self._init_core_shaders()
+                set_identity_instance_attribute()
+                self.render_path = "core"
+                self.render_path_status = "core"
+            except Exception as exc:
+                self.render_path_status = f"legacy (core init failed: {exc})"
+        elif self.render_path_preference == "legacy":
+            self.render_path_status = "legacy (forced)"
+        else:
+            self.render_path_status = "legacy (GL < 3.3)"
+        if self.render_path == "legacy":
+            self._init_shaders()
+        self._core_mesh_dirty = True
+        self._shadow_map_dirty = True
         self.shadow_status_message = "off"
         if self.shadow_requested:
             self.set_shadows_enabled(True)
 
     def _init_shaders(self):
-        self.shader_program = compileProgram(
-            compileShader(VERTEX_SHADER_SRC, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER_SRC, GL_FRAGMENT_SHADER),
-        )
+        self._shader_variants = ShaderVariantCache(VERTEX_SHADER_SRC, FRAGMENT_SHADER_SRC)
+        self.shader_program = self._uber_program = self._shader_variants.get()
         self.shadow_catcher_program = compileProgram(
             compileShader(VERTEX_SHADER_SHADOW_CATCHER_SRC, GL_VERTEX_SHADER),
             compileShader(FRAGMENT_SHADER_SHADOW_CATCHER_SRC, GL_FRAGMENT_SHADER),
         )
 
-    def _init_shadow_pipeline(self):
-        self.depth_shader_program = compileProgram(
-            compileShader(VERTEX_SHADER_DEPTH_SRC, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER_DEPTH_SRC, GL_FRAGMENT_SHADER),
+    def _init_core_shaders(self):
+        self._shader_variants = ShaderVariantCache(CORE_VERTEX_SHADER_SRC, core_fragment_source(FRAGMENT_SHADER_SRC))
+        self.shader_program = self._uber_program = self._shader_variants.get()
+        self.shadow_catcher_program = compileProgram(
+            compileShader(CORE_VERTEX_SHADER_SHADOW_CATCHER_SRC, GL_VERTEX_SHADER),
+            compileShader(core_fragment_source(FRAGMENT_SHADER_SHADOW_CATCHER_SRC), GL_FRAGMENT_SHADER),
+        )
+        self.background_program = compileProgram(
+            compileShader(CORE_VERTEX_SHADER_BACKGROUND_SRC, GL_VERTEX_SHADER),
+            compileShader(CORE_FRAGMENT_SHADER_BACKGROUND_SRC, GL_FRAGMENT_SHADER),
         )
+        self._core_quad.create()
+
+    def _init_shadow_pipeline(self):
+        if self.render_path == "core":
+            self.depth_shader_program = compileProgram(
+                compileShader(CORE_VERTEX_SHADER_DEPTH_SRC, GL_VERTEX_SHADER),
+                compileShader(CORE_FRAGMENT_SHADER_DEPTH_SRC, GL_FRAGMENT_SHADER),
+            )
+        else:
+            self.depth_shader_program = compileProgram(
+                compileShader(VERTEX_SHADER_DEPTH_SRC, GL_VERTEX_SHADER),
+                compileShader(FRAGMENT_SHADER_DEPTH_SRC, GL_FRAGMENT_SHADER),
+            )
         self._recreate_shadow_targets(self.shadow_size)
 
     def _recreate_shadow_targets(self, size: int):
@@ -609,6 +813,7 @@ class OpenGLWidget(QOpenGLWidget):
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
         glBindTexture(GL_TEXTURE_2D, 0)
+        self._shadow_map_dirty = True
 
         fbo_id = glGenFramebuffers(1)
         if isinstance(fbo_id, (tuple, list)):
@@ -651,6 +856,8 @@ class OpenGLWidget(QOpenGLWidget):
 
     def apply_payload(self, payload) -> bool:
         try:
+            self.texture_cache.begin_model()
+            self._core_mesh_dirty = True
             self.vertices = payload.vertices
             self.indices = payload.indices
             self.normals = payload.normals
@@ -658,6 +865,9 @@ class OpenGLWidget(QOpenGLWidget):
             self.last_texture_sets = payload.texture_sets or {}
             self.last_texture_candidates = list(payload.texture_candidates or [])
             self.submeshes = payload.submeshes or []
+            self.instance_groups = list(getattr(payload, "instance_groups", None) or [])
+            self._core_instances_dirty = True
+            self.mesh_stats = getattr(payload, "mesh_stats", None)
             self.last_debug_info = payload.debug_info or {}
             self.last_texture_path = ""
             self.last_texture_paths = {ch: "" for ch in ALL_CHANNELS}
@@ -666,6 +876,12 @@ class OpenGLWidget(QOpenGLWidget):
             self.material_two_sided_overrides = {}
             self.two_sided_global_override = False
             self._compute_model_bounds()
+            self._compute_submesh_bounds()
+            self.quality_governor.reset()
+            self._mesh_bvh = None
+            self._instance_bvhs = None
+            self.last_pick = None
+            self.measure_points = []
 
             if self.texcoords.size > 0 and not self.submeshes:
                 self._apply_default_texture_set()
@@ -674,9 +890,9 @@ class OpenGLWidget(QOpenGLWidget):
                 if not first_base:
                     first_base = self._get_fallback_texture_path(CHANNEL_BASE)
                 self.last_texture_path = first_base or ""
-                self.base_texture_has_alpha = bool(self.texture_alpha_cache.get(first_base, False))
+                self.base_texture_has_alpha = self.texture_cache.has_alpha(first_base)
 
-            if self.vertices.size == 0 or self.indices.size == 0:
+            if not self._has_geometry():
                 raise RuntimeError("Model does not contain valid geometry.")
 
             self.last_error = ""
@@ -715,6 +931,9 @@ class OpenGLWidget(QOpenGLWidget):
         h = max(h, 1)
         w = max(w, 1)
         glViewport(0, 0, w, h)
+        if self.render_path == "core":
+            # Core path rebuilds the projection uniform every frame from _projection_matrix().
+            return
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
         aspect = w / h
@@ -724,26 +943,105 @@ class OpenGLWidget(QOpenGLWidget):
         else:
             gluPerspective(45.0, aspect, 0.1, 100.0)
 
+    def _projection_matrix(self):
+        aspect = max(self.width(), 1) / float(max(self.height(), 1))
+        if self.projection_mode == "orthographic":
+            extent = max(0.35, self.model_radius * 1.25) / max(self.zoom, 0.01)
+            return self._ortho_matrix(-extent * aspect, extent * aspect, -extent, extent, 0.1, 100.0)
+        return self._perspective_matrix(45.0, aspect, 0.1, 100.0)
+
+    def _model_matrix(self):
+        translate = np.identity(4, dtype=np.float32)
+        translate[0:3, 3] = self.model_translate
+        return np.dot(translate, self._model_rotation_matrix()).astype(np.float32)
+
     def paintGL(self):
+        self.render_profiler.begin_frame()
+        frame_t0 = time.perf_counter()
+        self._reduced_quality_frame = self.quality_governor.begin_frame(self._is_interacting())
+        if self._reduced_quality_frame and not self._bind_interaction_fbo():
+            self._reduced_quality_frame = False
+        try:
+            self._paint_frame()
+        finally:
+            if self._reduced_quality_frame:
+                self._present_interaction_fbo()
+            now = time.perf_counter()
+            self.quality_governor.end_frame(now, (now - frame_t0) * 1000.0)
+            self.render_profiler.end_frame()
+
+    def _bind_interaction_fbo(self) -> bool:
+        # Reduced-resolution target used only while the camera moves.
+        dpr = float(self.devicePixelRatioF())
+        full_w = max(1, int(self.width() * dpr))
+        full_h = max(1, int(self.height() * dpr))
+        scale = self.quality_governor.scale
+        w = max(1, int(full_w * scale))
+        h = max(1, int(full_h * scale))
+        try:
+            fbo = self._interaction_fbo
+            if fbo is None or fbo.width() != w or fbo.height() != h:
+                fmt = QOpenGLFramebufferObjectFormat()
+                fmt.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
+                fbo = QOpenGLFramebufferObject(w, h, fmt)
+                self._interaction_fbo = fbo
+            if not fbo.isValid() or not fbo.bind():
+                raise RuntimeError("interaction framebuffer is incomplete")
+        except Exception:
+            self._interaction_fbo = None
+            self.quality_governor.enabled = False
+            return False
+        glViewport(0, 0, w, h)
+        return True
+
+    def _present_interaction_fbo(self):
+        fbo = self._interaction_fbo
+        dpr = float(self.devicePixelRatioF())
+        full_w = max(1, int(self.width() * dpr))
+        full_h = max(1, int(self.height() * dpr))
+        default_fbo = int(self.defaultFramebufferObject())
+        try:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, int(fbo.handle()))
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, default_fbo)
+            glBlitFramebuffer(0, 0, fbo.width(), fbo.height(), 0, 0, full_w, full_h, GL_COLOR_BUFFER_BIT, GL_LINEAR)
+        except Exception:
+            # No framebuffer blit on this driver: fall back to full-quality frames.
+            self.quality_governor.enabled = False
+            self.update()
+        finally:
+            glBindFramebuffer(GL_FRAMEBUFFER, default_fbo)
+            glViewport(0, 0, full_w, full_h)
+
+    def set_interaction_quality_enabled(self, enabled: bool):
+        self.quality_governor.enabled = bool(enabled)
+        if not enabled:
+            self.quality_governor.reset()
+        self.update()
+
+    def _paint_frame(self):
+        profiler = self.render_profiler
         if (
             self.enable_ground_shadow
-            and self.vertices.size
-            and self.indices.size
+            and self._has_geometry()
             and self.depth_shader_program
             and self.shadow_fbo
+            and self._shadow_map_dirty
+            and not self._reduced_quality_frame
         ):
+            profiler.begin_phase("shadow_map")
             try:
                 self._render_shadow_map()
+                self._shadow_map_dirty = False
             except Exception:
                 # Runtime fallback for drivers with incomplete depth/FBO behavior.
                 self.enable_ground_shadow = False
                 self.shadow_status_message = "runtime fallback"
 
+        profiler.begin_phase("background")
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         self._draw_background_gradient()
+        profiler.end_phase()
 
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
         if self.projection_mode == "orthographic":
             camera_distance = max(0.3, self.model_radius * 2.2)
         else:
@@ -754,24 +1052,23 @@ class OpenGLWidget(QOpenGLWidget):
             target,
             np.array([0.0, 1.0, 0.0], dtype=np.float32),
         )
-        gluLookAt(
-            float(eye[0]),
-            float(eye[1]),
-            float(eye[2]),
-            float(target[0]),
-            float(target[1]),
-            float(target[2]),
-            0,
-            1,
-            0,
-        )
+        core = self.render_path == "core"
+        if core:
+            self._proj_matrix = self._projection_matrix()
+        else:
+            glMatrixMode(GL_MODELVIEW)
+            glLoadMatrixf(np.ascontiguousarray(self._view_matrix.T))
 
-        if self.vertices.size == 0 or self.indices.size == 0 or self.shader_program is None:
+        if not self._has_geometry() or self.shader_program is None:
             return
 
         effective_fast_mode = self.fast_mode
-        glPushMatrix()
-        self._apply_model_translation()
+        profiler.begin_phase("opaque")
+        if core:
+            self._ensure_core_mesh()
+        else:
+            glPushMatrix()
+            self._apply_model_translation()
         glUseProgram(self.shader_program)
         try:
             self._set_common_uniforms(effective_fast_mode=effective_fast_mode)
@@ -794,11 +1091,14 @@ class OpenGLWidget(QOpenGLWidget):
                     CHANNEL_NORMAL: 0 if effective_fast_mode else self._get_or_create_texture_id(global_paths.get(CHANNEL_NORMAL, "")),
                 }
                 base_path = str(global_paths.get(CHANNEL_BASE) or "")
-                has_alpha = bool(self.texture_alpha_cache.get(base_path, False))
+                has_alpha = self.texture_cache.has_alpha(base_path)
                 swizzles = self._resolve_channel_swizzles({}, global_paths)
                 draw_entries.append((self.indices, tex_ids, has_alpha, swizzles, ""))
             elif self.submeshes:
-                for submesh in self.submeshes:
+                visible = self._update_submesh_culling()
+                for idx, submesh in enumerate(self.submeshes):
+                    if visible is not None and not visible[idx]:
+                        continue
                     tex_ids, has_alpha, swizzles = self._resolve_submesh_textures(submesh, effective_fast_mode=effective_fast_mode)
                     draw_entries.append((submesh["indices"], tex_ids, has_alpha, swizzles, str(submesh.get("material_uid") or "")))
             else:
@@ -827,13 +1127,27 @@ class OpenGLWidget(QOpenGLWidget):
                     self._set_material_uniforms(tex_ids, has_alpha, swizzles, effective_fast_mode=effective_fast_mode)
                     self._draw_mesh_indices(draw_indices)
                 glDisable(GL_CULL_FACE)
+                self._draw_instance_groups(effective_fast_mode)
 
                 if transparent_entries:
+                    profiler.begin_phase("transparent")
                     glEnable(GL_BLEND)
                     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+                    transparent_entries = self._sort_transparent_entries(transparent_entries)
                     for draw_indices, tex_ids, has_alpha, swizzles, material_uid in transparent_entries:
                         two_sided = self.get_effective_two_sided(material_uid)
-                        if two_sided:
+                        sorted_indices = self._sorted_transparent_triangles(draw_indices)
+                        if sorted_indices is not None:
+                            # Triangles already go back-to-front: one pass with both faces
+                            # composites correctly, no separate back/front draws needed.
+                            if two_sided:
+                                glDisable(GL_CULL_FACE)
+                            else:
+                                glEnable(GL_CULL_FACE)
+                                glCullFace(GL_BACK)
+                            self._set_material_uniforms(tex_ids, has_alpha, swizzles, effective_fast_mode=effective_fast_mode)
+                            self._draw_mesh_indices(sorted_indices)
+                        elif two_sided:
                             # Two-sided rendering for alpha-blended geometry:
                             # first back faces, then front faces for more stable composition.
                             glEnable(GL_CULL_FACE)
@@ -860,18 +1174,55 @@ class OpenGLWidget(QOpenGLWidget):
                     self._set_material_uniforms(tex_ids, has_alpha, swizzles, effective_fast_mode=effective_fast_mode)
                     self._draw_mesh_indices(draw_indices)
                 glDisable(GL_CULL_FACE)
+                self._draw_instance_groups(effective_fast_mode)
         finally:
             self._unbind_texture_units()
             glUseProgram(0)
-            glPopMatrix()
+            if self._uber_program:
+                self.shader_program = self._uber_program
+            if not core:
+                glPopMatrix()
 
+        profiler.begin_phase("shadow_catcher")
         self._draw_shadow_catcher()
 
     def set_overlay_lines(self, lines):
         self.overlay_lines = [str(line) for line in (lines or []) if str(line).strip()]
-        if self.overlay_lines:
+        self._refresh_overlay_text()
+
+    def _refresh_overlay_text(self):
+        lines = list(self.overlay_lines)
+        if self.overlay_lines and self.frustum_culling_enabled and self.cull_stats["total"]:
+            stats = self.cull_stats
+            lines.append(
+                f"Culling: drawn {stats['drawn']} / {stats['total']} (frustum {stats['frustum']}, small {stats['small']})"
+            )
+        if self.overlay_lines and self.frustum_culling_enabled and self.instance_cull_stats["total"]:
+            stats = self.instance_cull_stats
+            lines.append(f"Instance groups: drawn {stats['drawn']} / {stats['total']} (frustum {stats['frustum']}, small {stats['small']})")
+        if self.overlay_lines and self.last_pick:
+            pick = self.last_pick
+            name = pick["material_name"] or pick["material_uid"] or "-"
+            if pick.get("instance_group", -1) >= 0:
+                lines.append(f"Picked: {name} (instance group {pick['instance_group']}, instance {pick['instance']}, {pick['source']})")
+            else:
+                lines.append(f"Picked: {name} (submesh {pick['submesh']}, {pick['source']})")
+        if self.overlay_lines and self.measure_points:
+            distance = self.measure_distance()
+            lines.append(
+                f"Measure: {distance:.4f} source units" if distance is not None else "Measure: pick second point (Ctrl+Alt+click)"
+            )
+        if self.overlay_lines and self.environment is not None:
+            lines.append(
+                f"Environment: {os.path.basename(self.environment.path)} "
+                f"(x{self.environment_intensity:.2f}, {self.environment_rotation_deg:.0f}°)"
+            )
+        if self.overlay_lines and self.quality_governor.enabled:
+            lines.append(f"Interaction quality: {self.quality_governor.status_text()}")
+        lines += self.render_profiler.overlay_lines()
+        if lines:
             html_lines = []
-            for line in self.overlay_lines:
+            for line in lines:
                 raw = str(line).strip()
                 if raw.startswith("<"):
                     html_lines.append(raw)
@@ -888,8 +1239,44 @@ class OpenGLWidget(QOpenGLWidget):
         if self.overlay_visible:
             self.overlay_label.raise_()
             self._update_overlay_label_geometry()
+        self._sync_overlay_refresh_timer()
         self.update()
 
+    def set_profiler_enabled(self, enabled: bool):
+        self.render_profiler.set_enabled(enabled)
+        self.render_profiler.reset()
+        self._sync_overlay_refresh_timer()
+        self._refresh_overlay_text()
+        self.update()
+
+    def dump_render_profile(self, path: str) -> str:
+        extra = {
+            "vertices": int(self.vertices.shape[0]) if getattr(self.vertices, "ndim", 0) == 2 else 0,
+            "triangles": int(self.indices.size // 3) if self.indices.size else 0,
+            "submeshes": len(self.submeshes or []),
+            "instance_groups": len(self.instance_groups),
+            "instances": int(sum(len(g["transforms"]) for g in self.instance_groups)),
+            "viewport": [int(self.width()), int(self.height())],
+            "fast_mode": bool(self.fast_mode),
+            "shadows": bool(self.enable_ground_shadow),
+            "alpha_mode": str(self.alpha_render_mode),
+            "texture_cache": self.texture_cache.stats(),
+            "shader_variants": self._shader_variants.stats() if self._shader_variants is not None else {},
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.render_profiler.to_json(extra=extra))
+        return path
+
+    def _sync_overlay_refresh_timer(self):
+        live_stats = self.render_profiler.enabled or (
+            self.frustum_culling_enabled and bool(self.submeshes or self.instance_groups)
+        )
+        if live_stats and self.overlay_visible:
+            self._overlay_refresh_timer.start()
+        else:
+            self._overlay_refresh_timer.stop()
+
     def toggle_overlay(self):
         self.set_overlay_visible(not self.overlay_visible)
         return self.overlay_visible
@@ -914,6 +1301,7 @@ class OpenGLWidget(QOpenGLWidget):
         self._set_sampler_uniform("uRoughTex", 2)
         self._set_sampler_uniform("uNormalTex", 3)
         self._set_sampler_uniform("uShadowMap", 4)
+        self._set_sampler_uniform("uEnvMap", 5)
         self._set_int_uniform("uUnlitTexturePreview", 1 if self.unlit_texture_preview else 0)
         self._set_int_uniform("uFastMode", 1 if effective_fast_mode else 0)
         self._set_int_uniform("uFlipNormalY", 1 if self._normal_y_flip_enabled() else 0)
@@ -934,8 +1322,16 @@ class OpenGLWidget(QOpenGLWidget):
         self._set_vec3_uniform("uLightColor0", *key_color)
         self._set_vec3_uniform("uLightColor1", *fill_color)
         self._set_matrix_uniform("uLightVP", self._light_vp)
-        self._set_matrix_uniform("uModelRot", self._model_rotation_matrix())
-        self._set_vec3_uniform("uModelOffset", *self.model_translate)
+        if self.render_path == "core":
+            model = self._model_matrix()
+            model_view = np.dot(self._view_matrix, model)
+            self._set_matrix_uniform("uModel", model)
+            self._set_matrix_uniform("uView", self._view_matrix)
+            self._set_matrix_uniform("uProj", self._proj_matrix)
+            self._set_mat3_uniform("uNormalMatrix", np.linalg.inv(model_view[0:3, 0:3]).T)
+        else:
+            self._set_matrix_uniform("uModelRot", self._model_rotation_matrix())
+            self._set_vec3_uniform("uModelOffset", *self.model_translate)
         texel = 1.0 / float(max(self.shadow_size, 1))
         self._set_int_uniform("uShadowEnabled", 1 if (self.enable_ground_shadow and self.shadow_depth_tex) else 0)
         self._set_float_uniform("uShadowBias", self.shadow_bias)
@@ -944,6 +1340,72 @@ class OpenGLWidget(QOpenGLWidget):
         if location != -1:
             glUniform2f(location, texel, texel)
         self._bind_texture_unit(4, self.shadow_depth_tex)
+        self._set_environment_uniforms()
+
+    def _set_environment_uniforms(self):
+        env_tex = self._environment_texture_id()
+        self._set_int_uniform("uUseEnv", 1 if env_tex else 0)
+        self._bind_texture_unit(5, env_tex)
+        if not env_tex:
+            return
+        env = self.environment
+        location = glGetUniformLocation(self.shader_program, "uEnvSH")
+        if location != -1:
+            glUniform3fv(location, 9, np.ascontiguousarray(env.sh, dtype=np.float32))
+        location = glGetUniformLocation(self.shader_program, "uEnvAtlas")
+        if location != -1:
+            glUniform2f(location, float(env.levels), float(env.band_height))
+        self._set_float_uniform("uEnvIntensity", self.environment_intensity)
+        # View -> world (inverse view rotation), then the user yaw around world Y.
+        yaw = np.radians(self.environment_rotation_deg)
+        c, s = float(np.cos(yaw)), float(np.sin(yaw))
+        rot = np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]], dtype=np.float32)
+        self._set_mat3_uniform("uEnvViewToWorld", rot @ np.asarray(self._view_matrix, dtype=np.float32)[:3, :3].T)
+
+    def _environment_texture_id(self) -> int:
+        env = self.environment
+        if env is None:
+            return 0
+        tex_id = self._environment_textures.pop(env.key, 0)
+        if tex_id:
+            # Re-insert so dict order stays least recently used first.
+            self._environment_textures[env.key] = tex_id
+            return tex_id
+        tex_id = glGenTextures(1)
+        if isinstance(tex_id, (tuple, list)):
+            tex_id = int(tex_id[0])
+        tex_id = int(tex_id)
+        atlas = np.ascontiguousarray(env.atlas, dtype=np.uint8)
+        # Upload on the environment's own unit so material/shadow bindings stay intact.
+        glActiveTexture(GL_TEXTURE5)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        # Longitude wraps; bands are clamped in the shader.
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, int(atlas.shape[1]), int(atlas.shape[0]), 0, GL_RGBA, GL_UNSIGNED_BYTE, atlas)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self._environment_textures[env.key] = tex_id
+        self._evict_environment_textures(_ENV_TEXTURES_KEEP)
+        return tex_id
+
+    def _evict_environment_textures(self, keep: int):
+        current = self.environment.key if self.environment is not None else None
+        stale = [key for key in self._environment_textures if key != current]
+        stale = stale[: max(0, len(stale) - int(keep))]
+        if stale:
+            self._delete_texture_ids([self._environment_textures.pop(key) for key in stale])
+
+    def release_unused_environment_textures(self):
+        # Drops every uploaded atlas except the one in use (cache clear actions).
+        self._evict_environment_textures(0)
+
+    def _release_environment_textures(self):
+        if self._environment_textures:
+            glDeleteTextures([int(t) for t in self._environment_textures.values()])
+        self._environment_textures = {}
 
     def _set_material_uniforms(self, texture_ids, has_base_alpha: bool, swizzles=None, effective_fast_mode: bool = False):
         base_tex = int(texture_ids.get(CHANNEL_BASE, 0) or 0)
@@ -955,26 +1417,17 @@ class OpenGLWidget(QOpenGLWidget):
             metal_tex = int(texture_ids.get(CHANNEL_METAL, 0) or 0)
             rough_tex = int(texture_ids.get(CHANNEL_ROUGH, 0) or 0)
             normal_tex = int(texture_ids.get(CHANNEL_NORMAL, 0) or 0)
+        reduced_detail = self._reduced_quality_frame
+        if reduced_detail:
+            rough_tex = 0
+            normal_tex = 0
 
-        self._bind_texture_unit(0, base_tex)
-        self._bind_texture_unit(1, metal_tex)
-        self._bind_texture_unit(2, rough_tex)
-        self._bind_texture_unit(3, normal_tex)
-
-        self._set_int_uniform("uHasBase", 1 if base_tex else 0)
-        self._set_int_uniform("uHasMetal", 1 if metal_tex else 0)
-        self._set_int_uniform("uHasRough", 1 if rough_tex else 0)
-        self._set_int_uniform("uHasNormal", 1 if normal_tex else 0)
         swizzles = swizzles or {}
-        self._set_int_uniform("uMetalChannel", int(swizzles.get("metal", 0)))
-        self._set_int_uniform("uRoughChannel", int(swizzles.get("roughness", 0)))
         use_metal_alpha_for_rough = int(swizzles.get("rough_from_metal_alpha", 0))
         invert_rough = int(swizzles.get("invert_rough", 0))
-        if effective_fast_mode:
+        if effective_fast_mode or reduced_detail:
             use_metal_alpha_for_rough = 0
             invert_rough = 0
-        self._set_int_uniform("uRoughFromMetalAlpha", use_metal_alpha_for_rough)
-        self._set_int_uniform("uInvertRough", invert_rough)
         alpha_mode = 0
         use_base_alpha = 0
         if self.alpha_render_mode == "blend":
@@ -983,10 +1436,53 @@ class OpenGLWidget(QOpenGLWidget):
         elif self.alpha_render_mode == "cutout" and has_base_alpha:
             alpha_mode = 1
             use_base_alpha = 1
-        self._set_int_uniform("uAlphaMode", alpha_mode)
-        self._set_int_uniform("uUseBaseAlpha", use_base_alpha)
+        features = {
+            "uHasBase": 1 if base_tex else 0,
+            "uHasMetal": 1 if metal_tex else 0,
+            "uHasRough": 1 if rough_tex else 0,
+            "uHasNormal": 1 if normal_tex else 0,
+            "uRoughFromMetalAlpha": use_metal_alpha_for_rough,
+            "uInvertRough": invert_rough,
+            "uUnlitTexturePreview": 1 if self.unlit_texture_preview else 0,
+            "uFastMode": 1 if effective_fast_mode else 0,
+            "uAlphaMode": alpha_mode,
+            "uUseBaseAlpha": use_base_alpha,
+            "uUseEnv": 1 if (self.environment is not None and not effective_fast_mode) else 0,
+        }
+        self._use_material_variant(features, effective_fast_mode)
+
+        self._bind_texture_unit(0, base_tex)
+        self._bind_texture_unit(1, metal_tex)
+        self._bind_texture_unit(2, rough_tex)
+        self._bind_texture_unit(3, normal_tex)
+
+        # In a specialized variant these are constants and the setters find no location.
+        for name, value in features.items():
+            self._set_int_uniform(name, value)
+        self._set_int_uniform("uMetalChannel", int(swizzles.get("metal", 0)))
+        self._set_int_uniform("uRoughChannel", int(swizzles.get("roughness", 0)))
+
+    def _use_material_variant(self, features, effective_fast_mode: bool):
+        if not self.shader_variants_enabled or self._shader_variants is None:
+            return
+        try:
+            program = self._shader_variants.get(features)
+        except Exception:
+            # A variant that fails to build disables specialization; the uber-shader still works.
+            self.shader_variants_enabled = False
+            program = self._uber_program
+        if not program or program == self.shader_program:
+            return
+        self.shader_program = program
+        glUseProgram(program)
+        self._set_common_uniforms(effective_fast_mode=effective_fast_mode)
 
     def _draw_mesh_indices(self, draw_indices):
+        if self.render_path == "core":
+            count = self._core_mesh.draw(draw_indices)
+            if count:
+                self.render_profiler.count_draw(count // 3)
+            return
         draw_indices = np.asarray(draw_indices, dtype=np.uint32).reshape(-1)
         if draw_indices.size == 0:
             return
@@ -1002,6 +1498,7 @@ class OpenGLWidget(QOpenGLWidget):
             glTexCoordPointer(2, GL_FLOAT, 0, self.texcoords)
 
         glDrawElements(GL_TRIANGLES, int(draw_indices.size), GL_UNSIGNED_INT, draw_indices)
+        self.render_profiler.count_draw(int(draw_indices.size) // 3)
 
         if has_uv:
             glDisableClientState(GL_TEXTURE_COORD_ARRAY)
@@ -1009,12 +1506,34 @@ class OpenGLWidget(QOpenGLWidget):
         glDisableClientState(GL_VERTEX_ARRAY)
 
     def _unbind_texture_units(self):
-        for unit in (GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2, GL_TEXTURE3, GL_TEXTURE4):
+        for unit in (GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2, GL_TEXTURE3, GL_TEXTURE4, GL_TEXTURE5):
             glActiveTexture(unit)
             glBindTexture(GL_TEXTURE_2D, 0)
 
     def _draw_background_gradient(self):
         # Screen-space gradient to avoid a flat black backdrop.
+        b = min(max(self.background_brightness, 0.2), 2.0)
+        s = min(max(self.background_gradient_strength, 0.0), 1.0)
+        base = np.clip(self.background_color.astype(np.float32), 0.0, 1.0)
+        top = np.clip(base * (1.0 + 0.45 * s) * b, 0.0, 1.0)
+        bottom = np.clip(base * (1.0 - 0.55 * s) * b, 0.0, 1.0)
+
+        if self.render_path == "core":
+            if self.background_program is None:
+                return
+            glDisable(GL_DEPTH_TEST)
+            glUseProgram(self.background_program)
+            try:
+                for name, color in (("uTopColor", top), ("uBottomColor", bottom)):
+                    loc = glGetUniformLocation(self.background_program, name)
+                    if loc != -1:
+                        glUniform3f(loc, float(color[0]), float(color[1]), float(color[2]))
+                self._core_quad.draw()
+            finally:
+                glUseProgram(0)
+                glEnable(GL_DEPTH_TEST)
+            return
+
         glUseProgram(0)
         glDisable(GL_DEPTH_TEST)
         glDisable(GL_TEXTURE_2D)
@@ -1028,12 +1547,6 @@ class OpenGLWidget(QOpenGLWidget):
         glPushMatrix()
         glLoadIdentity()
 
-        b = min(max(self.background_brightness, 0.2), 2.0)
-        s = min(max(self.background_gradient_strength, 0.0), 1.0)
-        base = np.clip(self.background_color.astype(np.float32), 0.0, 1.0)
-        top = np.clip(base * (1.0 + 0.45 * s) * b, 0.0, 1.0)
-        bottom = np.clip(base * (1.0 - 0.55 * s) * b, 0.0, 1.0)
-
         glBegin(GL_QUADS)
         glColor3f(float(bottom[0]), float(bottom[1]), float(bottom[2]))  # bottom
         glVertex3f(-1.0, -1.0, 0.0)
@@ -1084,12 +1597,21 @@ class OpenGLWidget(QOpenGLWidget):
 
             glEnable(GL_BLEND)
             glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            glBegin(GL_QUADS)
-            glVertex3f(-size, y, -size)
-            glVertex3f(size, y, -size)
-            glVertex3f(size, y, size)
-            glVertex3f(-size, y, size)
-            glEnd()
+            if self.render_path == "core":
+                self._set_matrix_uniform("uView", self._view_matrix, program=self.shadow_catcher_program)
+                self._set_matrix_uniform("uProj", self._proj_matrix, program=self.shadow_catcher_program)
+                for name, value in (("uHalfSize", size), ("uPlaneY", y)):
+                    loc = glGetUniformLocation(self.shadow_catcher_program, name)
+                    if loc != -1:
+                        glUniform1f(loc, float(value))
+                self._core_quad.draw()
+            else:
+                glBegin(GL_QUADS)
+                glVertex3f(-size, y, -size)
+                glVertex3f(size, y, -size)
+                glVertex3f(size, y, size)
+                glVertex3f(-size, y, size)
+                glEnd()
             glDisable(GL_BLEND)
         finally:
             self._unbind_texture_units()
@@ -1106,32 +1628,18 @@ class OpenGLWidget(QOpenGLWidget):
         margin = cover_radius * 0.18
 
         # Stable directional-light bounds in light space (orthographic shadow map).
-        corners_world = []
-        for sx in (-1.0, 1.0):
-            for sy in (-1.0, 1.0):
-                for sz in (-1.0, 1.0):
-                    corners_world.append(
-                        np.array(
-                            [
-                                target[0] + sx * cover_radius,
-                                target[1] + sy * cover_radius,
-                                target[2] + sz * cover_radius,
-                                1.0,
-                            ],
-                            dtype=np.float32,
-                        )
-                    )
-        light_corners = [np.dot(light_view, c) for c in corners_world]
-        xs = [float(v[0]) for v in light_corners]
-        ys = [float(v[1]) for v in light_corners]
-        zs = [float(v[2]) for v in light_corners]
-
-        left = min(xs) - margin
-        right = max(xs) + margin
-        bottom = min(ys) - margin
-        top = max(ys) + margin
-        depth_near = max(0.05, min([-z for z in zs]) - margin)
-        depth_far = max(depth_near + 0.1, max([-z for z in zs]) + margin)
+        corners_world = np.ones((8, 4), dtype=np.float32)
+        corners_world[:, :3] = target + _UNIT_CUBE_CORNERS * cover_radius
+        light_corners = corners_world @ light_view.T
+        mins = light_corners.min(axis=0)
+        maxs = light_corners.max(axis=0)
+
+        left = float(mins[0]) - margin
+        right = float(maxs[0]) + margin
+        bottom = float(mins[1]) - margin
+        top = float(maxs[1]) + margin
+        depth_near = max(0.05, float(-maxs[2]) - margin)
+        depth_far = max(depth_near + 0.1, float(-mins[2]) + margin)
         light_proj = self._ortho_matrix(left, right, bottom, top, depth_near, depth_far)
         self._light_vp = np.dot(light_proj, light_view).astype(np.float32)
 
@@ -1150,17 +1658,24 @@ class OpenGLWidget(QOpenGLWidget):
         glUseProgram(self.depth_shader_program)
         try:
             self._set_matrix_uniform("uLightVP", self._light_vp, program=self.depth_shader_program)
-            self._set_matrix_uniform("uModelRot", self._model_rotation_matrix(), program=self.depth_shader_program)
-            loc = glGetUniformLocation(self.depth_shader_program, "uModelOffset")
-            if loc != -1:
-                glUniform3f(loc, float(self.model_translate[0]), float(self.model_translate[1]), float(self.model_translate[2]))
+            self._set_depth_model_uniforms(self.depth_shader_program)
             self._draw_mesh_positions_only()
+            self._draw_instance_positions_only(self.depth_shader_program)
         finally:
             glUseProgram(0)
             glDisable(GL_POLYGON_OFFSET_FILL)
             glBindFramebuffer(GL_FRAMEBUFFER, int(self.defaultFramebufferObject()))
             glViewport(0, 0, max(self.width(), 1), max(self.height(), 1))
 
+    def _set_depth_model_uniforms(self, program):
+        if self.render_path == "core":
+            self._set_matrix_uniform("uModel", self._model_matrix(), program=program)
+            return
+        self._set_matrix_uniform("uModelRot", self._model_rotation_matrix(), program=program)
+        loc = glGetUniformLocation(program, "uModelOffset")
+        if loc != -1:
+            glUniform3f(loc, float(self.model_translate[0]), float(self.model_translate[1]), float(self.model_translate[2]))
+
     def _apply_model_translation(self):
         glTranslatef(
             float(self.model_translate[0]),
@@ -1189,15 +1704,22 @@ class OpenGLWidget(QOpenGLWidget):
         if location != -1:
             glUniformMatrix4fv(location, 1, GL_FALSE, np.asarray(mat4, dtype=np.float32).T)
 
+    def _set_mat3_uniform(self, name, mat3):
+        location = glGetUniformLocation(self.shader_program, name)
+        if location != -1:
+            glUniformMatrix3fv(location, 1, GL_FALSE, np.ascontiguousarray(np.asarray(mat3, dtype=np.float32).T))
+
     def _set_vec3_uniform(self, name, x, y, z):
         location = glGetUniformLocation(self.shader_program, name)
         if location != -1:
             glUniform3f(location, float(x), float(y), float(z))
 
     def _bind_texture_unit(self, slot: int, texture_id: int):
-        active = [GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2, GL_TEXTURE3, GL_TEXTURE4][slot]
+        active = [GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2, GL_TEXTURE3, GL_TEXTURE4, GL_TEXTURE5][slot]
         glActiveTexture(active)
         glBindTexture(GL_TEXTURE_2D, int(texture_id) if texture_id else 0)
+        if texture_id:
+            self.render_profiler.count_texture_bind()
 
     def _resolve_submesh_textures(self, submesh, effective_fast_mode: bool = False):
         texture_paths = submesh.get("texture_paths") or {}
@@ -1231,7 +1753,7 @@ class OpenGLWidget(QOpenGLWidget):
         for ch in SHADER_CHANNELS:
             texture_ids[ch] = self._get_or_create_texture_id(resolved[ch])
         base_path = resolved.get(CHANNEL_BASE, "")
-        has_alpha = bool(self.texture_alpha_cache.get(base_path, False))
+        has_alpha = self.texture_cache.has_alpha(base_path)
         swizzles = self._resolve_channel_swizzles(submesh, resolved)
         return texture_ids, has_alpha, swizzles
 
@@ -1253,22 +1775,15 @@ class OpenGLWidget(QOpenGLWidget):
     def _texture_has_alpha_channel(self, path: str) -> bool:
         if not path:
             return False
-        key = os.path.normcase(os.path.normpath(str(path)))
-        cached = self.texture_alpha_channel_cache.get(key)
-        if cached is not None:
-            return bool(cached)
+        meta = self.texture_cache.get_meta(path)
+        if meta is not None and "has_alpha_channel" in meta:
+            return bool(meta["has_alpha_channel"])
         if Image is None or not os.path.isfile(path):
-            self.texture_alpha_channel_cache[key] = False
-            return False
-        try:
-            with Image.open(path) as img:
-                mode = str(getattr(img, "mode", "") or "").upper()
-                has_alpha = ("A" in mode) or ("transparency" in (getattr(img, "info", {}) or {}))
-                self.texture_alpha_channel_cache[key] = bool(has_alpha)
-                return bool(has_alpha)
-        except Exception:
-            self.texture_alpha_channel_cache[key] = False
+            self.texture_cache.update_meta(path, has_alpha_channel=False)
             return False
+        has_alpha = bool(get_texture_alpha_flags(path).get("has_alpha_channel", False))
+        self.texture_cache.update_meta(path, has_alpha_channel=has_alpha)
+        return has_alpha
 
     def _default_channel_swizzle(self, channel: str, path: str) -> int:
         if self._is_orm_texture_path(path):
@@ -1378,54 +1893,31 @@ class OpenGLWidget(QOpenGLWidget):
     def _get_or_create_texture_id(self, path: str):
         if not path:
             return 0
-        if path in self.texture_cache:
-            return int(self.texture_cache[path])
-        if Image is None or not os.path.isfile(path):
+        upload_params = self._texture_upload_params()
+        key, texture_id = self.texture_cache.lookup(path, upload_params)
+        if texture_id:
+            return texture_id
+        if key is None:
             return 0
         try:
-            with Image.open(path) as img:
-                image_copy = img.copy()
-                has_alpha = self._image_has_effective_alpha(image_copy)
-                has_alpha_channel = self._image_has_alpha_channel(image_copy)
-                texture_id = self._upload_texture_image(image_copy, old_texture_id=0, manage_context=False)
-            self.texture_cache[path] = int(texture_id)
-            self.texture_alpha_cache[path] = bool(has_alpha)
-            norm = os.path.normcase(os.path.normpath(path))
-            self.texture_alpha_channel_cache[path] = bool(has_alpha_channel)
-            self.texture_alpha_channel_cache[norm] = bool(has_alpha_channel)
+            arr, flags = decode_texture(path, max_dim=upload_params[0])
+            if arr is None:
+                return 0
+            texture_id = self._upload_texture_array(arr, old_texture_id=0, manage_context=False)
+            self.texture_cache.insert(key, texture_id, int(arr.nbytes))
+            self.texture_cache.update_meta(
+                path,
+                has_alpha=bool(flags.get("has_effective_alpha", False)),
+                has_alpha_channel=bool(flags.get("has_alpha_channel", False)),
+                width=int(arr.shape[1]),
+                height=int(arr.shape[0]),
+            )
             return int(texture_id)
         except Exception:
             return 0
 
-    def _image_has_alpha_channel(self, image_copy) -> bool:
-        if Image is None or image_copy is None:
-            return False
-        try:
-            mode = str(getattr(image_copy, "mode", "") or "").upper()
-            return ("A" in mode) or ("transparency" in (getattr(image_copy, "info", {}) or {}))
-        except Exception:
-            return False
-
-    def _image_has_effective_alpha(self, image_copy) -> bool:
-        if Image is None or image_copy is None:
-            return False
-        try:
-            if image_copy.mode in ("RGBA", "LA"):
-                alpha = image_copy.getchannel("A")
-                extrema = alpha.getextrema()
-                if isinstance(extrema, tuple) and len(extrema) == 2:
-                    return int(extrema[0]) < 255
-                return True
-            if "transparency" in image_copy.info:
-                rgba = image_copy.convert("RGBA")
-                alpha = rgba.getchannel("A")
-                extrema = alpha.getextrema()
-                if isinstance(extrema, tuple) and len(extrema) == 2:
-                    return int(extrema[0]) < 255
-                return True
-        except Exception:
-            return False
-        return False
+    def _texture_upload_params(self):
+        return (1024 if self.fast_mode else 0,)
 
     def _start_texture_warmup(self):
         if self.fast_mode:
@@ -1479,10 +1971,112 @@ class OpenGLWidget(QOpenGLWidget):
             return bool(self.material_two_sided_overrides.get(uid))
         return bool(self.two_sided_global_override)
 
+    def _ensure_core_mesh(self):
+        if not self._core_mesh_dirty and self._core_mesh.is_ready():
+            return
+        index_arrays = [self.indices] + [sub.get("indices") for sub in (self.submeshes or [])]
+        self._core_mesh.upload(self.vertices, self.normals, self.texcoords, index_arrays)
+        self._core_mesh_dirty = False
+
+    def _has_geometry(self) -> bool:
+        return bool((self.vertices.size and self.indices.size) or self.instance_groups)
+
+    def _ensure_core_instances(self):
+        if not self._core_instances_dirty:
+            return
+        for mesh in self._core_instances:
+            mesh.release()
+        self._core_instances = []
+        for group in self.instance_groups:
+            mesh = CoreInstancedMesh()
+            mesh.upload_instanced(group["vertices"], group["normals"], group["texcoords"], group["indices"], group["transforms"])
+            self._core_instances.append(mesh)
+        self._core_instances_dirty = False
+
+    def _draw_instance_groups(self, effective_fast_mode: bool = False):
+        if not self.instance_groups:
+            return
+        if self.render_path == "core":
+            self._ensure_core_instances()
+        visible = self._update_instance_culling()
+        for group_idx, group in enumerate(self.instance_groups):
+            if visible is not None and not visible[group_idx]:
+                continue
+            tex_ids, has_alpha, swizzles = self._resolve_submesh_textures(group, effective_fast_mode=effective_fast_mode)
+            if self.get_effective_two_sided(""):
+                glDisable(GL_CULL_FACE)
+            else:
+                glEnable(GL_CULL_FACE)
+                glCullFace(GL_BACK)
+            self._set_material_uniforms(tex_ids, has_alpha, swizzles, effective_fast_mode=effective_fast_mode)
+            if self.render_path == "core":
+                count = self._core_instances[group_idx].draw_instanced()
+                if count:
+                    self.render_profiler.count_draw(count // 3)
+                continue
+            self._draw_legacy_instances(group, self.shader_program, with_attributes=True)
+        glDisable(GL_CULL_FACE)
+
+    def _draw_instance_positions_only(self, program):
+        if not self.instance_groups:
+            return
+        if self.render_path == "core":
+            self._ensure_core_instances()
+            for mesh in self._core_instances:
+                count = mesh.draw_instanced()
+                if count:
+                    self.render_profiler.count_draw(count // 3)
+            return
+        for group in self.instance_groups:
+            self._draw_legacy_instances(group, program, with_attributes=False)
+
+    def _draw_legacy_instances(self, group, program, with_attributes: bool):
+        # GL 2.1 has no instanced draws: one call per instance, transform via the matrix
+        # stack for the view and via uModelRot for shadow coordinates.
+        vertices = group["vertices"]
+        indices = group["indices"]
+        normals = group["normals"]
+        texcoords = group["texcoords"]
+        has_uv = with_attributes and texcoords.size > 0 and texcoords.shape[0] == vertices.shape[0]
+        model_rot = self._model_rotation_matrix()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, vertices)
+        if with_attributes:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, 0, normals)
+        if has_uv:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        try:
+            for transform in group["transforms"]:
+                self._set_matrix_uniform("uModelRot", np.dot(model_rot, transform), program=program)
+                if with_attributes:
+                    glPushMatrix()
+                    glMultMatrixf(np.ascontiguousarray(transform.T))
+                glDrawElements(GL_TRIANGLES, int(indices.size), GL_UNSIGNED_INT, indices)
+                if with_attributes:
+                    glPopMatrix()
+                self.render_profiler.count_draw(int(indices.size) // 3)
+        finally:
+            self._set_matrix_uniform("uModelRot", model_rot, program=program)
+            if has_uv:
+                glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            if with_attributes:
+                glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
     def _draw_mesh_positions_only(self):
+        if self.render_path == "core":
+            self._ensure_core_mesh()
+            count = self._core_mesh.draw(self.indices)
+            self.render_profiler.count_draw(count // 3)
+            return
+        if self.indices.size == 0:
+            return
         glEnableClientState(GL_VERTEX_ARRAY)
         glVertexPointer(3, GL_FLOAT, 0, self.vertices)
         glDrawElements(GL_TRIANGLES, int(self.indices.size), GL_UNSIGNED_INT, self.indices)
+        self.render_profiler.count_draw(int(self.indices.size) // 3)
         glDisableClientState(GL_VERTEX_ARRAY)
 
     def _look_at_matrix(self, eye, target, up):
@@ -1613,6 +2207,9 @@ class OpenGLWidget(QOpenGLWidget):
             self._orbit_vel_x = 0.0
             self._orbit_vel_y = 0.0
             self._last_mouse_left_drag = True
+            # Ctrl+click picks a material, Ctrl+Alt+click places measure points; dragging still orbits.
+            self._pick_press_pos = event.pos() if event.modifiers() & Qt.ControlModifier else None
+        self._mouse_drag_active = True
         self.last_mouse_pos = event.pos()
 
     def mouseMoveEvent(self, event):
@@ -1672,13 +2269,34 @@ class OpenGLWidget(QOpenGLWidget):
         self.update()
 
     def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self._pick_press_pos is not None:
+            press_pos = self._pick_press_pos
+            self._pick_press_pos = None
+            if (event.pos() - press_pos).manhattanLength() <= 4:
+                self._orbit_vel_x = 0.0
+                self._orbit_vel_y = 0.0
+                self._handle_pick_click(event.x(), event.y(), measure=bool(event.modifiers() & Qt.AltModifier))
         if event.button() == Qt.LeftButton and self._last_mouse_left_drag:
             speed = abs(self._orbit_vel_x) + abs(self._orbit_vel_y)
             if speed > self._inertia_min_velocity:
                 self._inertia_timer.start()
             self._last_mouse_left_drag = False
+        if not event.buttons():
+            self._mouse_drag_active = False
+            # Settled camera: redraw once more without interaction-only shortcuts.
+            self.update()
         super().mouseReleaseEvent(event)
 
+    def _handle_pick_click(self, x: int, y: int, measure: bool = False):
+        if measure:
+            distance = self.add_measure_point_at(x, y)
+            if callable(self.on_measure_changed):
+                self.on_measure_changed(distance, len(self.measure_points))
+            return
+        pick = self.pick_at(x, y)
+        if callable(self.on_material_picked):
+            self.on_material_picked(pick)
+
     def set_angle(self, angle_x: float, angle_y: float):
         self.angle_x = max(-89.0, min(89.0, float(angle_x)))
         self.angle_y = float(angle_y) % 360.0
@@ -1722,6 +2340,20 @@ class OpenGLWidget(QOpenGLWidget):
         self.ambient_strength = min(max(value, 0.0), 0.5)
         self.update()
 
+    def set_environment(self, lighting):
+        # The last few uploaded atlases stay cached by key, so switching back to an HDRI is instant.
+        self.environment = lighting
+        self._refresh_overlay_text()
+        self.update()
+
+    def set_environment_intensity(self, value: float):
+        self.environment_intensity = min(max(float(value), 0.0), 10.0)
+        self.update()
+
+    def set_environment_rotation(self, degrees: float):
+        self.environment_rotation_deg = float(degrees) % 360.0
+        self.update()
+
     def set_key_light_intensity(self, value: float):
         self.key_light_intensity = min(max(value, 0.0), 50.0)
         self.update()
@@ -1756,6 +2388,7 @@ class OpenGLWidget(QOpenGLWidget):
             self.update()
             return False
         self.shadow_requested = bool(enabled)
+        self.invalidate_shadow_map()
         if not enabled:
             self.enable_ground_shadow = False
             self.shadow_status_message = "off"
@@ -1893,8 +2526,12 @@ class OpenGLWidget(QOpenGLWidget):
     def set_key_light_angles(self, azimuth_deg: float, elevation_deg: float):
         self.key_light_azimuth = float(azimuth_deg)
         self.key_light_elevation = max(-89.0, min(89.0, float(elevation_deg)))
+        self.invalidate_shadow_map()
         self.update()
 
+    def invalidate_shadow_map(self):
+        self._shadow_map_dirty = True
+
     def set_fill_light_angles(self, azimuth_deg: float, elevation_deg: float):
         self.fill_light_azimuth = float(azimuth_deg)
         self.fill_light_elevation = max(-89.0, min(89.0, float(elevation_deg)))
@@ -1950,17 +2587,16 @@ class OpenGLWidget(QOpenGLWidget):
             return True
 
         try:
-            with Image.open(path) as img:
-                image_copy = img.copy()
-                has_alpha = self._image_has_effective_alpha(image_copy)
-                has_alpha_channel = self._image_has_alpha_channel(image_copy)
-                texture_id = self._upload_texture_image(image_copy, old_texture_id=self.texture_ids[channel])
+            arr, flags = decode_texture(path, max_dim=self._texture_upload_params()[0])
+            if arr is None:
+                return False
+            has_alpha = bool(flags.get("has_effective_alpha", False))
+            has_alpha_channel = bool(flags.get("has_alpha_channel", False))
+            texture_id = self._upload_texture_array(arr, old_texture_id=self.texture_ids[channel])
             self.texture_ids[channel] = texture_id
             self.last_texture_paths[channel] = path
             self.channel_overrides[channel] = path
-            norm = os.path.normcase(os.path.normpath(path))
-            self.texture_alpha_channel_cache[path] = bool(has_alpha_channel)
-            self.texture_alpha_channel_cache[norm] = bool(has_alpha_channel)
+            self.texture_cache.update_meta(path, has_alpha=bool(has_alpha), has_alpha_channel=bool(has_alpha_channel))
             if channel == CHANNEL_BASE:
                 self.last_texture_path = path
                 self.base_texture_has_alpha = has_alpha
@@ -1979,31 +2615,7 @@ class OpenGLWidget(QOpenGLWidget):
                 self.last_texture_path = ""
                 self.base_texture_has_alpha = False
 
-    def _upload_texture_image(self, image, old_texture_id=0, manage_context=True):
-        if image is None:
-            raise RuntimeError("Texture image is empty.")
-
-        if isinstance(image, np.ndarray):
-            arr = image
-        elif Image is not None and isinstance(image, Image.Image):
-            if self.fast_mode:
-                max_dim = 1024
-                if max(image.size) > max_dim:
-                    image = image.copy()
-                    image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS)
-            if image.mode not in ("RGB", "RGBA"):
-                image = image.convert("RGBA")
-            arr = np.array(image, dtype=np.uint8)
-        else:
-            arr = np.array(image)
-
-        if arr.ndim != 3:
-            raise RuntimeError("Texture must be RGB/RGBA.")
-
-        arr = np.flipud(arr)
-        if arr.dtype != np.uint8:
-            arr = arr.astype(np.uint8)
-
+    def _upload_texture_array(self, arr, old_texture_id=0, manage_context=True):
         channels = arr.shape[2]
         if channels == 3:
             image_format = GL_RGB
@@ -2057,21 +2669,28 @@ class OpenGLWidget(QOpenGLWidget):
         finally:
             self.doneCurrent()
 
+    def _delete_texture_ids(self, texture_ids):
+        if not texture_ids or self.context() is None:
+            return
+        if QOpenGLContext.currentContext() is self.context():
+            glDeleteTextures([int(t) for t in texture_ids])
+            return
+        self.makeCurrent()
+        try:
+            glDeleteTextures([int(t) for t in texture_ids])
+        finally:
+            self.doneCurrent()
+
+    def set_texture_cache_budget_mb(self, value: int):
+        self.texture_cache.set_budget_bytes(int(max(0, value)) * 1024 * 1024)
+
     def _clear_all_textures(self):
         self._warmup_timer.stop()
         self._warmup_queue = []
         for ch in ALL_CHANNELS:
             self._clear_channel_texture(ch)
-        if self.context() is not None:
-            self.makeCurrent()
-            try:
-                for tex_id in self.texture_cache.values():
-                    if tex_id:
-                        glDeleteTextures([int(tex_id)])
-            finally:
-                self.doneCurrent()
-        self.texture_cache = {}
-        self.texture_alpha_cache = {}
+        # GPU textures stay in the shared LRU; only the pins of the previous model are released.
+        self.texture_cache.begin_model()
         self.last_texture_paths = {ch: "" for ch in ALL_CHANNELS}
         self.channel_overrides = {ch: None for ch in ALL_CHANNELS}
         self.material_channel_overrides = {}
@@ -2079,22 +2698,374 @@ class OpenGLWidget(QOpenGLWidget):
         self.two_sided_global_override = False
         self.last_texture_path = ""
 
+    def _compute_submesh_bounds(self):
+        count = len(self.submeshes or [])
+        mins = np.zeros((count, 3), dtype=np.float32)
+        maxs = np.zeros((count, 3), dtype=np.float32)
+        centroids = np.zeros((count, 3), dtype=np.float32)
+        verts = np.asarray(self.vertices, dtype=np.float32).reshape(-1, 3)
+        self._submesh_slot_by_indices = {}
+        self._triangle_centroid_cache = {}
+        self._sorted_triangle_cache = {}
+        stats = self.mesh_stats.submeshes if self.mesh_stats is not None else []
+        if len(stats) != count:
+            stats = []
+        for idx, submesh in enumerate(self.submeshes or []):
+            self._submesh_slot_by_indices[id(submesh.get("indices"))] = idx
+            if stats:
+                mins[idx] = stats[idx]["bbox_min"]
+                maxs[idx] = stats[idx]["bbox_max"]
+                centroids[idx] = stats[idx]["centroid"]
+                continue
+            sub_indices = np.asarray(submesh.get("indices"), dtype=np.int64).reshape(-1)
+            if sub_indices.size == 0 or verts.shape[0] == 0:
+                continue
+            points = verts[sub_indices]
+            mins[idx] = points.min(axis=0)
+            maxs[idx] = points.max(axis=0)
+            centroids[idx] = points.mean(axis=0)
+        self._submesh_bounds_min = mins
+        self._submesh_bounds_max = maxs
+        self._submesh_centroids = centroids
+        self.cull_stats = {"total": count, "drawn": count, "frustum": 0, "small": 0}
+
+        group_count = len(self.instance_groups)
+        self._instance_bounds_min = np.zeros((group_count, 3), dtype=np.float32)
+        self._instance_bounds_max = np.zeros((group_count, 3), dtype=np.float32)
+        for idx, group in enumerate(self.instance_groups):
+            world = self._instance_group_corners(group)
+            if world.size:
+                self._instance_bounds_min[idx] = world.min(axis=0)
+                self._instance_bounds_max[idx] = world.max(axis=0)
+        self.instance_cull_stats = {"total": group_count, "drawn": group_count, "frustum": 0, "small": 0}
+
+    def _update_submesh_culling(self):
+        count = int(self._submesh_bounds_min.shape[0])
+        if not self.frustum_culling_enabled or count == 0 or count != len(self.submeshes or []):
+            self.cull_stats = {"total": count, "drawn": count, "frustum": 0, "small": 0}
+            return None
+        visible, self.cull_stats = self._frustum_visibility(self._submesh_bounds_min, self._submesh_bounds_max)
+        return visible
+
+    def _update_instance_culling(self):
+        count = int(self._instance_bounds_min.shape[0])
+        if not self.frustum_culling_enabled or count == 0 or count != len(self.instance_groups):
+            self.instance_cull_stats = {"total": count, "drawn": count, "frustum": 0, "small": 0}
+            return None
+        visible, self.instance_cull_stats = self._frustum_visibility(self._instance_bounds_min, self._instance_bounds_max)
+        return visible
+
+    def _frustum_visibility(self, bounds_min, bounds_max):
+        count = int(bounds_min.shape[0])
+        mvp = np.dot(np.dot(self._projection_matrix(), self._view_matrix), self._model_matrix())
+        # (n, 8, 4) homogeneous AABB corners -> clip space in one batched product.
+        select_max = (_UNIT_CUBE_CORNERS > 0.0)[None, :, :]
+        corners = np.ones((count, 8, 4), dtype=np.float32)
+        corners[:, :, :3] = np.where(select_max, bounds_max[:, None, :], bounds_min[:, None, :])
+        clip = corners @ mvp.T
+        x, y, z, w = clip[..., 0], clip[..., 1], clip[..., 2], clip[..., 3]
+        outside = (
+            np.all(x < -w, axis=1)
+            | np.all(x > w, axis=1)
+            | np.all(y < -w, axis=1)
+            | np.all(y > w, axis=1)
+            | np.all(z < -w, axis=1)
+            | np.all(z > w, axis=1)
+        )
+        visible = ~outside
+        small = np.zeros(count, dtype=bool)
+        if self.small_feature_cull_px > 0.0 and self._is_interacting():
+            in_front = np.all(w > 1e-5, axis=1)
+            safe_w = np.where(w > 1e-5, w, 1.0)
+            ndc_x = x / safe_w
+            ndc_y = y / safe_w
+            span_px = np.maximum(
+                (ndc_x.max(axis=1) - ndc_x.min(axis=1)) * 0.5 * max(self.width(), 1),
+                (ndc_y.max(axis=1) - ndc_y.min(axis=1)) * 0.5 * max(self.height(), 1),
+            )
+            small = visible & in_front & (span_px < float(self.small_feature_cull_px))
+            visible &= ~small
+        stats = {
+            "total": count,
+            "drawn": int(np.count_nonzero(visible)),
+            "frustum": int(np.count_nonzero(outside)),
+            "small": int(np.count_nonzero(small)),
+        }
+        return visible, stats
+
+    def _view_depth_row(self):
+        # Row of the model-view matrix giving view-space z; larger negative z is farther away.
+        return np.dot(self._view_matrix, self._model_matrix())[2].astype(np.float32)
+
+    def _sort_transparent_entries(self, entries):
+        if not self.sort_transparent or len(entries) < 2:
+            return entries
+        slots = [self._submesh_slot_by_indices.get(id(entry[0]), -1) for entry in entries]
+        if min(slots) < 0 or max(slots) >= self._submesh_centroids.shape[0]:
+            return entries
+        row = self._view_depth_row()
+        depth = self._submesh_centroids[np.asarray(slots)] @ row[:3] + row[3]
+        order = np.argsort(depth, kind="stable")
+        return [entries[i] for i in order]
+
+    def _sorted_transparent_triangles(self, draw_indices):
+        limit = int(self.transparent_sort_max_triangles)
+        if not self.sort_transparent or limit <= 0:
+            return None
+        tri_count = int(np.asarray(draw_indices).size // 3)
+        if tri_count < 2 or tri_count > limit:
+            return None
+        key = id(draw_indices)
+        tris = np.asarray(draw_indices, dtype=np.uint32).reshape(-1, 3)
+        centroids = self._triangle_centroid_cache.get(key)
+        if centroids is None:
+            verts = np.asarray(self.vertices, dtype=np.float32).reshape(-1, 3)
+            centroids = verts[tris].mean(axis=1)
+            self._triangle_centroid_cache[key] = centroids
+        row = self._view_depth_row()
+        view_key = row.tobytes()
+        cached = self._sorted_triangle_cache.get(key)
+        if cached is not None and cached[0] == view_key:
+            return cached[1]
+        order = np.argsort(centroids @ row[:3], kind="stable")
+        sorted_indices = np.ascontiguousarray(tris[order].reshape(-1))
+        self._sorted_triangle_cache[key] = (view_key, sorted_indices)
+        return sorted_indices
+
+    def _is_interacting(self) -> bool:
+        return bool(self._mouse_drag_active or self._inertia_timer.isActive())
+
+    def set_frustum_culling_enabled(self, enabled: bool):
+        self.frustum_culling_enabled = bool(enabled)
+        self._sync_overlay_refresh_timer()
+        self.update()
+
+    def set_small_feature_cull_px(self, value: float):
+        self.small_feature_cull_px = max(0.0, float(value))
+        self.update()
+
+    def _screen_ray(self, x: float, y: float):
+        # Ray in mesh-local space through widget pixel (x, y), using the last rendered view.
+        w = max(self.width(), 1)
+        h = max(self.height(), 1)
+        ndc_x = 2.0 * (float(x) + 0.5) / w - 1.0
+        ndc_y = 1.0 - 2.0 * (float(y) + 0.5) / h
+        mvp = np.dot(np.dot(self._projection_matrix(), self._view_matrix), self._model_matrix()).astype(np.float64)
+        try:
+            inv = np.linalg.inv(mvp)
+        except np.linalg.LinAlgError:
+            return None, None
+        near = inv @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+        far = inv @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+        near = near[:3] / near[3]
+        far = far[:3] / far[3]
+        return near, far - near
+
+    def _ensure_mesh_bvh(self):
+        if self._mesh_bvh is None and self.vertices.size:
+            self._mesh_bvh = MeshBVH.from_submeshes(self.vertices, self.submeshes, fallback_indices=self.indices)
+        return self._mesh_bvh
+
+    def _ensure_instance_bvhs(self):
+        # One BVH per instance group in its local space; placements are handled per ray.
+        if self._instance_bvhs is None:
+            self._instance_bvhs = [
+                MeshBVH.from_submeshes(group["vertices"], [], fallback_indices=group["indices"]) for group in self.instance_groups
+            ]
+        return self._instance_bvhs
+
+    def raycast_at(self, x: float, y: float):
+        bvh = self._ensure_mesh_bvh()
+        if bvh is None and not self.instance_groups:
+            return None
+        origin, direction = self._screen_ray(x, y)
+        if origin is None:
+            return None
+        best = bvh.raycast(origin, direction) if bvh is not None else None
+        for group_idx, group_bvh in enumerate(self._ensure_instance_bvhs()):
+            max_distance = best.distance if best is not None else np.inf
+            hit = raycast_instances(group_bvh, self.instance_groups[group_idx]["transforms"], origin, direction, max_distance)
+            if hit is not None:
+                hit.instance_group = group_idx
+                best = hit
+        return best
+
+    def _ensure_pick_program(self):
+        if self.pick_program is None:
+            if self.render_path == "core":
+                vertex_src = CORE_VERTEX_SHADER_DEPTH_SRC
+                fragment_src = core_fragment_source(FRAGMENT_SHADER_PICK_SRC)
+            else:
+                vertex_src = VERTEX_SHADER_DEPTH_SRC
+                fragment_src = FRAGMENT_SHADER_PICK_SRC
+            self.pick_program = compileProgram(
+                compileShader(vertex_src, GL_VERTEX_SHADER),
+                compileShader(fragment_src, GL_FRAGMENT_SHADER),
+            )
+        return self.pick_program
+
+    def _pick_submesh_gpu(self, x: float, y: float):
+        # ID-buffer pass: every submesh is drawn in a flat color encoding index + 1, instance groups
+        # follow after the submeshes; restricted by scissor to the clicked pixel.
+        # Returns None if GL picking is unavailable.
+        if self.context() is None:
+            return None
+        if not ((self.submeshes and self.vertices.size) or self.instance_groups):
+            return None
+        dpr = float(self.devicePixelRatioF())
+        w = max(1, int(self.width() * dpr))
+        h = max(1, int(self.height() * dpr))
+        px = min(max(int(float(x) * dpr), 0), w - 1)
+        py = min(max(h - 1 - int(float(y) * dpr), 0), h - 1)
+        self.makeCurrent()
+        clear_color = None
+        try:
+            program = self._ensure_pick_program()
+            fbo = self._pick_fbo
+            if fbo is None or fbo.width() != w or fbo.height() != h:
+                fmt = QOpenGLFramebufferObjectFormat()
+                fmt.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
+                fbo = QOpenGLFramebufferObject(w, h, fmt)
+                self._pick_fbo = fbo
+            if not fbo.isValid() or not fbo.bind():
+                return None
+            clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+            glViewport(0, 0, w, h)
+            glEnable(GL_SCISSOR_TEST)
+            glScissor(px, py, 1, 1)
+            glClearColor(0.0, 0.0, 0.0, 0.0)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            glEnable(GL_DEPTH_TEST)
+            glDisable(GL_BLEND)
+            glDisable(GL_CULL_FACE)
+            if self.render_path == "core" and self.vertices.size:
+                self._ensure_core_mesh()
+            glUseProgram(program)
+            view_proj = np.dot(self._projection_matrix(), self._view_matrix)
+            self._set_matrix_uniform("uLightVP", view_proj, program=program)
+            self._set_depth_model_uniforms(program)
+            color_loc = glGetUniformLocation(program, "uPickColor")
+            submesh_count = len(self.submeshes or []) if self.vertices.size else 0
+            for idx in range(submesh_count):
+                ident = idx + 1
+                glUniform3f(color_loc, (ident & 0xFF) / 255.0, ((ident >> 8) & 0xFF) / 255.0, ((ident >> 16) & 0xFF) / 255.0)
+                self._draw_mesh_indices(self.submeshes[idx]["indices"])
+            if self.instance_groups and self.render_path == "core":
+                self._ensure_core_instances()
+            for group_idx, group in enumerate(self.instance_groups):
+                ident = len(self.submeshes or []) + group_idx + 1
+                glUniform3f(color_loc, (ident & 0xFF) / 255.0, ((ident >> 8) & 0xFF) / 255.0, ((ident >> 16) & 0xFF) / 255.0)
+                if self.render_path == "core":
+                    self._core_instances[group_idx].draw_instanced()
+                else:
+                    self._draw_legacy_instances(group, program, with_attributes=False)
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
+            raw = glReadPixels(px, py, 1, 1, GL_RGBA, GL_UNSIGNED_BYTE)
+        except Exception:
+            return None
+        finally:
+            glUseProgram(0)
+            glDisable(GL_SCISSOR_TEST)
+            if clear_color is not None:
+                glClearColor(*[float(c) for c in np.asarray(clear_color).reshape(-1)[:4]])
+            glBindFramebuffer(GL_FRAMEBUFFER, int(self.defaultFramebufferObject()))
+            self.doneCurrent()
+        if not isinstance(raw, (bytes, bytearray)):
+            raw = np.asarray(raw, dtype=np.uint8).tobytes()
+        rgba = bytearray(raw[:4])
+        if len(rgba) < 3:
+            return None
+        return (rgba[0] | (rgba[1] << 8) | (rgba[2] << 16)) - 1
+
+    def pick_at(self, x: float, y: float):
+        submesh_count = len(self.submeshes or [])
+        # Pick ids: submeshes first, then instance groups (see _pick_submesh_gpu).
+        pick_idx = self._pick_submesh_gpu(x, y)
+        instance = -1
+        source = "gpu"
+        if pick_idx is None:
+            hit = self.raycast_at(x, y)
+            pick_idx = -1
+            if hit is not None:
+                pick_idx = hit.submesh if hit.instance_group < 0 else submesh_count + hit.instance_group
+                instance = hit.instance
+            source = "cpu"
+        if 0 <= pick_idx < submesh_count:
+            submesh = self.submeshes[pick_idx]
+            self.last_pick = {
+                "submesh": int(pick_idx),
+                "material_uid": str(submesh.get("material_uid") or ""),
+                "material_name": str(submesh.get("material_name") or ""),
+                "source": source,
+            }
+        elif 0 <= pick_idx - submesh_count < len(self.instance_groups):
+            group_idx = pick_idx - submesh_count
+            self.last_pick = {
+                "submesh": -1,
+                "instance_group": int(group_idx),
+                "instance": int(instance),
+                "material_uid": "",
+                "material_name": str(self.instance_groups[group_idx].get("name") or ""),
+                "source": source,
+            }
+        else:
+            self.last_pick = None
+        self._refresh_overlay_text()
+        return self.last_pick
+
+    def add_measure_point_at(self, x: float, y: float):
+        hit = self.raycast_at(x, y)
+        if hit is None:
+            return None
+        if len(self.measure_points) >= 2:
+            self.measure_points = []
+        self.measure_points.append(hit.point)
+        self._refresh_overlay_text()
+        return self.measure_distance()
+
+    def measure_distance(self):
+        # Picked points are in viewer (normalized) space; the result is in source file units.
+        if len(self.measure_points) < 2:
+            return None
+        return measure_distance(self.measure_points[0], self.measure_points[1]) * self._source_scale()
+
+    def _source_scale(self) -> float:
+        if self.mesh_stats is not None:
+            return float(self.mesh_stats.source_scale or 1.0)
+        return float((self.last_debug_info or {}).get("normalize_scale") or 1.0)
+
+    def clear_measurement(self):
+        self.measure_points = []
+        self._refresh_overlay_text()
+
     def _compute_model_bounds(self):
-        if self.vertices.size == 0:
+        self.invalidate_shadow_map()
+        stats = self.mesh_stats
+        if stats is not None and (stats.vertex_count or stats.instance_count):
+            # Loader already measured bounds and bounding sphere; no per-vertex pass here.
+            mins = np.asarray(stats.bbox_min, dtype=np.float32)
+            center = np.asarray(stats.sphere_center, dtype=np.float32)
+            self.model_center = center
+            self.model_translate = np.array([-center[0], -mins[1], -center[2]], dtype=np.float32)
+            self.model_target_y = float(center[1] - mins[1])
+            self.model_radius = float(stats.sphere_radius) if stats.sphere_radius > 0 else 1.0
+            return
+        points = self._bounds_points()
+        if points.size == 0:
             self.model_center = np.array([0.0, 0.0, 0.0], dtype=np.float32)
             self.model_translate = np.array([0.0, 0.0, 0.0], dtype=np.float32)
             self.model_target_y = 0.0
             self.model_radius = 1.0
             return
 
-        mins = np.min(self.vertices, axis=0)
-        maxs = np.max(self.vertices, axis=0)
+        mins = np.min(points, axis=0)
+        maxs = np.max(points, axis=0)
         center = (mins + maxs) * 0.5
         self.model_center = center.astype(np.float32)
         self.model_translate = np.array([-center[0], -mins[1], -center[2]], dtype=np.float32)
         self.model_target_y = float(center[1] - mins[1])
 
-        centered = self.vertices - center
+        centered = points - center
         lengths = np.linalg.norm(centered, axis=1)
         if lengths.size == 0:
             self.model_radius = 1.0
@@ -2102,11 +3073,45 @@ class OpenGLWidget(QOpenGLWidget):
         radius = float(np.max(lengths))
         self.model_radius = radius if radius > 0 else 1.0
 
+    def _bounds_points(self):
+        parts = []
+        if self.vertices.size:
+            parts.append(np.asarray(self.vertices, dtype=np.float32).reshape(-1, 3))
+        for group in self.instance_groups:
+            world = self._instance_group_corners(group)
+            if world.size:
+                parts.append(world)
+        if not parts:
+            return np.zeros((0, 3), dtype=np.float32)
+        return np.concatenate(parts, axis=0)
+
+    def _instance_group_corners(self, group):
+        local = np.asarray(group["vertices"], dtype=np.float32).reshape(-1, 3)
+        if local.size == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+        # Instance extents from the transformed corners of the local AABB.
+        lo = local.min(axis=0)
+        hi = local.max(axis=0)
+        corners = np.ones((8, 4), dtype=np.float32)
+        corners[:, :3] = np.where(_UNIT_CUBE_CORNERS > 0.0, hi, lo)
+        world = np.einsum("kij,cj->kci", np.asarray(group["transforms"], dtype=np.float32), corners)
+        return world[..., :3].reshape(-1, 3)
+
     def closeEvent(self, event):
         self._clear_all_textures()
+        self.texture_cache.clear()
         if self.context() is not None:
             self.makeCurrent()
             try:
+                self.render_profiler.release_gl()
+                self._interaction_fbo = None
+                self._pick_fbo = None
+                self._core_mesh.release()
+                self._core_quad.release()
+                for mesh in self._core_instances:
+                    mesh.release()
+                self._core_instances = []
+                self._release_environment_textures()
                 if self.shadow_depth_tex:
                     glDeleteTextures([int(self.shadow_depth_tex)])
                     self.shadow_depth_tex = 0
@@ -2115,6 +3120,11 @@ class OpenGLWidget(QOpenGLWidget):
                     self.shadow_fbo = 0
             finally:
                 self.doneCurrent()
+        if self._shader_variants is not None:
+            self._shader_variants.release()
+            self._shader_variants = None
+            self._uber_program = None
+            self.shader_program = None
         if self.shader_program:
             try:
                 glDeleteProgram(self.shader_program)
@@ -2133,6 +3143,18 @@ class OpenGLWidget(QOpenGLWidget):
             except Exception:
                 pass
             self.depth_shader_program = None
+        if self.background_program:
+            try:
+                glDeleteProgram(self.background_program)
+            except Exception:
+                pass
+            self.background_program = None
+        if self.pick_program:
+            try:
+                glDeleteProgram(self.pick_program)
+            except Exception:
+                pass
+            self.pick_program = None
         super().closeEvent(event)
 
     def set_fast_mode(self, enabled: bool):
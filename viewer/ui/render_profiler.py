@@ -0,0 +1,250 @@
+import json
+import time
+from collections import deque
+
+from OpenGL.GL import (
+    GL_QUERY_RESULT,
+    GL_QUERY_RESULT_AVAILABLE,
+    GL_TIME_ELAPSED,
+    glBeginQuery,
+    glDeleteQueries,
+    glEndQuery,
+    glGenQueries,
+    glGetQueryObjectiv,
+    glGetQueryObjectui64v,
+)
+
+
+RENDER_PHASES = ("shadow_map", "background", "opaque", "transparent", "shadow_catcher")
+_MAX_PENDING_GPU_FRAMES = 4
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = (len(sorted_values) - 1) * (float(pct) / 100.0)
+    lo = int(idx)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    frac = idx - lo
+    return float(sorted_values[lo] * (1.0 - frac) + sorted_values[hi] * frac)
+
+
+class RenderProfiler:
+    def __init__(self, window: int = 240):
+        self.enabled = False
+        self.gpu_timing = True
+        self.gpu_status = "off"
+        self._frames = deque(maxlen=max(8, int(window)))
+        self._frame = None
+        self._frame_t0 = 0.0
+        self._phase = ""
+        self._phase_t0 = 0.0
+        self._phase_query_active = False
+        self._query_pool = []
+        self._frame_queries = {}
+        self._pending_gpu = deque()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled)
+        if not self.enabled:
+            self._frame = None
+            self._phase = ""
+
+    def reset(self):
+        self._frames.clear()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._collect_gpu_results()
+        self._frame = {
+            "cpu_ms": {},
+            "gpu_ms": {},
+            "draw_calls": 0,
+            "triangles": 0,
+            "texture_binds": 0,
+        }
+        self._frame_queries = {}
+        self._phase = ""
+        self._frame_t0 = time.perf_counter()
+
+    def begin_phase(self, name: str):
+        if self._frame is None:
+            return
+        self._end_phase()
+        self._phase = str(name)
+        self._phase_t0 = time.perf_counter()
+        if self.gpu_timing:
+            self._phase_query_active = self._begin_gpu_query(self._phase)
+
+    def end_phase(self):
+        if self._frame is None:
+            return
+        self._end_phase()
+
+    def count_draw(self, triangles: int):
+        if self._frame is None:
+            return
+        self._frame["draw_calls"] += 1
+        self._frame["triangles"] += int(triangles)
+
+    def count_texture_bind(self):
+        if self._frame is None:
+            return
+        self._frame["texture_binds"] += 1
+
+    def end_frame(self):
+        if self._frame is None:
+            return
+        self._end_phase()
+        frame = self._frame
+        frame["frame_ms"] = (time.perf_counter() - self._frame_t0) * 1000.0
+        self._frames.append(frame)
+        if self._frame_queries:
+            self._pending_gpu.append((frame, self._frame_queries))
+            while len(self._pending_gpu) > _MAX_PENDING_GPU_FRAMES:
+                _, queries = self._pending_gpu.popleft()
+                self._query_pool.extend(queries.values())
+        self._frame = None
+        self._frame_queries = {}
+
+    def frames(self):
+        return list(self._frames)
+
+    def collect_gpu_results(self):
+        # Resolve finished GPU queries now instead of at the next begin_frame().
+        self._collect_gpu_results()
+
+    def summary(self):
+        frames = list(self._frames)
+        out = {
+            "frames": len(frames),
+            "gpu_timing": self.gpu_status,
+            "frame_ms": self._stats([f.get("frame_ms", 0.0) for f in frames]),
+            "draw_calls": self._stats([f.get("draw_calls", 0) for f in frames]),
+            "triangles": self._stats([f.get("triangles", 0) for f in frames]),
+            "texture_binds": self._stats([f.get("texture_binds", 0) for f in frames]),
+            "phases_cpu_ms": {},
+            "phases_gpu_ms": {},
+        }
+        for phase in RENDER_PHASES:
+            cpu = [f["cpu_ms"][phase] for f in frames if phase in f["cpu_ms"]]
+            gpu = [f["gpu_ms"][phase] for f in frames if phase in f["gpu_ms"]]
+            if cpu:
+                out["phases_cpu_ms"][phase] = self._stats(cpu)
+            if gpu:
+                out["phases_gpu_ms"][phase] = self._stats(gpu)
+        return out
+
+    def overlay_lines(self):
+        if not self.enabled:
+            return []
+        data = self.summary()
+        if not data["frames"]:
+            return ["Profiler: waiting for frames..."]
+        frame_ms = data["frame_ms"]
+        lines = [
+            f"Frame ms p50/p95/p99: {frame_ms['p50']:.2f} / {frame_ms['p95']:.2f} / {frame_ms['p99']:.2f} ({data['frames']} frames)",
+            f"Draw calls / Triangles / Binds: {data['draw_calls']['p50']:.0f} / {data['triangles']['p50']:,.0f} / {data['texture_binds']['p50']:.0f}",
+        ]
+        for phase in RENDER_PHASES:
+            cpu = data["phases_cpu_ms"].get(phase)
+            if not cpu:
+                continue
+            gpu = data["phases_gpu_ms"].get(phase)
+            gpu_text = f" | gpu {gpu['p50']:.2f}" if gpu else ""
+            lines.append(f"  {phase}: cpu {cpu['p50']:.2f} / p95 {cpu['p95']:.2f}{gpu_text}")
+        lines.append(f"GPU timers: {self.gpu_status}")
+        return lines
+
+    def to_json(self, extra=None) -> str:
+        data = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "summary": self.summary(),
+            "recent_frames": list(self._frames)[-32:],
+        }
+        if extra:
+            data["context"] = dict(extra)
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def release_gl(self):
+        ids = list(self._query_pool)
+        for _, queries in self._pending_gpu:
+            ids.extend(queries.values())
+        ids.extend(self._frame_queries.values())
+        self._query_pool = []
+        self._pending_gpu.clear()
+        self._frame_queries = {}
+        if ids:
+            try:
+                glDeleteQueries(len(ids), ids)
+            except Exception:
+                pass
+
+    def _stats(self, values):
+        ordered = sorted(float(v) for v in values)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "max": float(ordered[-1]),
+        }
+
+    def _end_phase(self):
+        if not self._phase:
+            return
+        elapsed = (time.perf_counter() - self._phase_t0) * 1000.0
+        cpu = self._frame["cpu_ms"]
+        cpu[self._phase] = cpu.get(self._phase, 0.0) + elapsed
+        if self._phase_query_active:
+            self._phase_query_active = False
+            try:
+                glEndQuery(GL_TIME_ELAPSED)
+            except Exception:
+                self._disable_gpu_timing("query error")
+        self._phase = ""
+
+    def _begin_gpu_query(self, phase: str) -> bool:
+        if phase in self._frame_queries:
+            # Phase re-entered within the frame: CPU time accumulates, GPU keeps the first span.
+            return False
+        try:
+            if not bool(glGenQueries):
+                self._disable_gpu_timing("unsupported")
+                return False
+            if self._query_pool:
+                query_id = self._query_pool.pop()
+            else:
+                query_id = glGenQueries(1)
+                if hasattr(query_id, "__len__"):
+                    query_id = query_id[0]
+                query_id = int(query_id)
+            glBeginQuery(GL_TIME_ELAPSED, query_id)
+            self._frame_queries[phase] = query_id
+            self.gpu_status = "on"
+            return True
+        except Exception:
+            self._disable_gpu_timing("unsupported")
+            return False
+
+    def _collect_gpu_results(self):
+        while self._pending_gpu:
+            frame, queries = self._pending_gpu[0]
+            try:
+                ready = all(int(glGetQueryObjectiv(q, GL_QUERY_RESULT_AVAILABLE)) for q in queries.values())
+                if not ready:
+                    return
+                for phase, query_id in queries.items():
+                    frame["gpu_ms"][phase] = float(glGetQueryObjectui64v(query_id, GL_QUERY_RESULT)) / 1.0e6
+            except Exception:
+                self._disable_gpu_timing("query error")
+                return
+            self._pending_gpu.popleft()
+            self._query_pool.extend(queries.values())
+
+    def _disable_gpu_timing(self, reason: str):
+        self.gpu_timing = False
+        self.gpu_status = f"off ({reason})"
+        self._frame_queries = {}
@@ -0,0 +1,210 @@
+import ctypes
+import hashlib
+import os
+import re
+
+import numpy as np
+from OpenGL.GL import (
+    GL_FALSE,
+    GL_FRAGMENT_SHADER,
+    GL_LINK_STATUS,
+    GL_PROGRAM_BINARY_LENGTH,
+    GL_RENDERER,
+    GL_TRUE,
+    GL_VENDOR,
+    GL_VERSION,
+    GL_VERTEX_SHADER,
+    glAttachShader,
+    glCreateProgram,
+    glDeleteProgram,
+    glDeleteShader,
+    glGetProgramInfoLog,
+    glGetProgramiv,
+    glGetString,
+    glLinkProgram,
+)
+from OpenGL.GL.shaders import compileShader
+
+try:
+    from OpenGL.GL import (
+        GL_PROGRAM_BINARY_RETRIEVABLE_HINT,
+        glGetProgramBinary,
+        glProgramBinary,
+        glProgramParameteri,
+    )
+except ImportError:
+    glGetProgramBinary = None
+    glProgramBinary = None
+    glProgramParameteri = None
+    GL_PROGRAM_BINARY_RETRIEVABLE_HINT = 0x8257
+
+
+_SHADER_CACHE_VERSION = "v1"
+_SHADER_CACHE_DIR = os.path.join(".cache", "shader_cache")
+
+# Integer uniforms that only switch code paths; a variant bakes them in as constants
+# so the driver can drop the dead branches.
+FEATURE_UNIFORMS = (
+    "uHasBase",
+    "uHasMetal",
+    "uHasRough",
+    "uHasNormal",
+    "uRoughFromMetalAlpha",
+    "uInvertRough",
+    "uUnlitTexturePreview",
+    "uFastMode",
+    "uAlphaMode",
+    "uUseBaseAlpha",
+    "uUseEnv",
+)
+
+
+def specialize_source(src: str, features: dict) -> str:
+    for name, value in sorted((features or {}).items()):
+        pattern = rf"\buniform\s+int\s+{re.escape(name)}\s*;"
+        src = re.sub(pattern, f"const int {name} = {int(value)};", src, count=1)
+    return src
+
+
+def _gl_string(name) -> str:
+    try:
+        raw = glGetString(name)
+    except Exception:
+        return ""
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="ignore")
+    return str(raw or "")
+
+
+class ShaderVariantCache:
+    # Programs compiled on demand per feature combination, with program binaries
+    # kept on disk (keyed by driver identity and source) when the driver allows it.
+    def __init__(self, vertex_src: str, fragment_src: str, cache_dir: str = _SHADER_CACHE_DIR, use_binary_cache: bool = True):
+        self.vertex_src = vertex_src
+        self.fragment_src = fragment_src
+        self.cache_dir = cache_dir
+        self.use_binary_cache = bool(use_binary_cache) and bool(glGetProgramBinary) and bool(glProgramBinary)
+        self.compiled = 0
+        self.binary_hits = 0
+        self._programs = {}
+        self._driver_key = ""
+
+    def __len__(self):
+        return len(self._programs)
+
+    def variant_key(self, features):
+        return tuple(sorted((str(k), int(v)) for k, v in (features or {}).items() if k in FEATURE_UNIFORMS))
+
+    def get(self, features=None) -> int:
+        key = self.variant_key(features)
+        program = self._programs.get(key)
+        if program is None:
+            program = self._build(dict(key))
+            self._programs[key] = program
+        return program
+
+    def programs(self):
+        return list(self._programs.values())
+
+    def release(self):
+        for program in self._programs.values():
+            try:
+                glDeleteProgram(program)
+            except Exception:
+                pass
+        self._programs = {}
+
+    def stats(self):
+        return {
+            "variants": len(self._programs),
+            "compiled": int(self.compiled),
+            "binary_hits": int(self.binary_hits),
+            "binary_cache": bool(self.use_binary_cache),
+        }
+
+    def _build(self, features: dict) -> int:
+        fragment_src = specialize_source(self.fragment_src, features)
+        cache_path = self._binary_path(fragment_src) if self.use_binary_cache else ""
+        if cache_path:
+            program = self._load_binary(cache_path)
+            if program:
+                self.binary_hits += 1
+                return program
+        program = self._compile(fragment_src)
+        self.compiled += 1
+        if cache_path:
+            self._save_binary(program, cache_path)
+        return program
+
+    def _compile(self, fragment_src: str) -> int:
+        vertex = compileShader(self.vertex_src, GL_VERTEX_SHADER)
+        fragment = compileShader(fragment_src, GL_FRAGMENT_SHADER)
+        program = glCreateProgram()
+        try:
+            glAttachShader(program, vertex)
+            glAttachShader(program, fragment)
+            if self.use_binary_cache:
+                try:
+                    glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+                except Exception:
+                    self.use_binary_cache = False
+            glLinkProgram(program)
+            if glGetProgramiv(program, GL_LINK_STATUS) == GL_FALSE:
+                log = glGetProgramInfoLog(program)
+                glDeleteProgram(program)
+                raise RuntimeError(f"Shader variant link failed: {log}")
+        finally:
+            glDeleteShader(vertex)
+            glDeleteShader(fragment)
+        return program
+
+    def _binary_path(self, fragment_src: str) -> str:
+        if not self._driver_key:
+            self._driver_key = "|".join(_gl_string(name) for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+        identity = f"{_SHADER_CACHE_VERSION}|{self._driver_key}|{self.vertex_src}|{fragment_src}"
+        key = hashlib.sha1(identity.encode("utf-8", errors="ignore")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _load_binary(self, path: str) -> int:
+        try:
+            with open(path, "rb") as fh:
+                raw = fh.read()
+        except OSError:
+            return 0
+        if len(raw) <= 4:
+            return 0
+        binary_format = int.from_bytes(raw[:4], "little")
+        blob = np.frombuffer(raw[4:], dtype=np.uint8)
+        program = glCreateProgram()
+        try:
+            glProgramBinary(program, binary_format, blob, int(blob.size))
+            if glGetProgramiv(program, GL_LINK_STATUS) != GL_FALSE:
+                return program
+        except Exception:
+            pass
+        # Driver update or foreign binary: drop it and fall back to compiling.
+        glDeleteProgram(program)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return 0
+
+    def _save_binary(self, program: int, path: str):
+        try:
+            length = int(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH))
+            if length <= 0:
+                return
+            blob = np.zeros(length, dtype=np.uint8)
+            written = ctypes.c_int(0)
+            binary_format = ctypes.c_uint(0)
+            glGetProgramBinary(program, length, ctypes.byref(written), ctypes.byref(binary_format), blob)
+            data = int(binary_format.value).to_bytes(4, "little") + blob[: int(written.value)].tobytes()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            # Binary retrieval is optional; keep the compiled program.
+            self.use_binary_cache = False
@@ -1,9 +1,13 @@
-import os
+import time
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
-from viewer.loaders.model_loader import load_model_payload
-from viewer.services.catalog_db import scan_and_index_directory
+from viewer.loaders.model_loader import invalidate_payload_cache, load_model_payload
+from viewer.services.catalog_db import compact_events, get_directory_cache, index_file_changes, scan_and_index_directory
+from viewer.services.fs_crawler import crawl_directory
+from viewer.services.fs_watch import FileChanges
+from viewer.services.preview_cache import invalidate_previews
+from viewer.utils.environment_map import load_environment
 
 
 class ModelLoadWorker(QObject):
@@ -42,21 +46,50 @@ class CatalogIndexWorker(QObject):
     finished = pyqtSignal(dict)
     failed = pyqtSignal(str)
 
-    def __init__(self, directory: str, model_extensions: tuple, db_path: str, scanned_paths=None):
+    def __init__(
+        self,
+        directory: str,
+        model_extensions: tuple,
+        db_path: str,
+        scanned_paths=None,
+        scanned_items=None,
+        event_retention=None,
+        crawl_result=None,
+    ):
         super().__init__()
         self.directory = directory
         self.model_extensions = model_extensions
         self.db_path = db_path
         self.scanned_paths = list(scanned_paths or [])
+        self.scanned_items = scanned_items
+        # CrawlResult of the directory listing; its cached file stats are refreshed here.
+        self.crawl_result = crawl_result
+        # {"retention_days", "export_path"}: the event log is compacted after the scan.
+        self.event_retention = event_retention or {}
 
     def run(self):
         try:
+            scanned_items = self.scanned_items
+            if self.crawl_result is not None:
+                scanned_items = self.crawl_result.fresh_items()
             summary = scan_and_index_directory(
                 self.directory,
                 self.model_extensions,
                 db_path=self.db_path,
                 scanned_paths=self.scanned_paths or None,
+                scanned_items=scanned_items,
             )
+            if self.event_retention.get("retention_days"):
+                try:
+                    compacted = compact_events(
+                        self.event_retention["retention_days"],
+                        db_path=self.db_path,
+                        export_path=self.event_retention.get("export_path") or None,
+                    )
+                    summary["events_compacted"] = compacted["removed"]
+                except Exception:
+                    # Retention is housekeeping; a failed pass is retried after the next scan.
+                    pass
             self.finished.emit(summary)
         except Exception as exc:
             self.failed.emit(str(exc))
@@ -65,22 +98,84 @@ class CatalogIndexWorker(QObject):
 class DirectoryScanWorker(QObject):
     finished = pyqtSignal(int, str, object)
     failed = pyqtSignal(int, str)
+    progress = pyqtSignal(int, str, int)
 
-    def __init__(self, request_id: int, directory: str, model_extensions: tuple):
+    def __init__(self, request_id: int, directory: str, model_extensions: tuple, db_path: str = None):
         super().__init__()
         self.request_id = int(request_id)
         self.directory = directory
         self.model_extensions = tuple(model_extensions or ())
+        self.db_path = db_path
+        self._last_progress = 0.0
 
     def run(self):
         try:
-            files = []
-            base_dir = self.directory
-            for root, _, names in os.walk(base_dir):
-                for name in names:
-                    if name.lower().endswith(self.model_extensions):
-                        files.append(os.path.join(root, name))
-            files.sort(key=lambda p: os.path.relpath(p, base_dir).lower())
-            self.finished.emit(self.request_id, self.directory, files)
+            # One incremental crawl feeds the model list; the indexer re-stats its reused entries.
+            result = crawl_directory(
+                self.directory,
+                self.model_extensions,
+                db_path=self.db_path,
+                incremental=True,
+                progress=self._emit_progress,
+            )
+            self.finished.emit(self.request_id, self.directory, result)
         except Exception as exc:
             self.failed.emit(self.request_id, str(exc))
+
+    def _emit_progress(self, count: int):
+        now = time.monotonic()
+        if now - self._last_progress < 0.25:
+            return
+        self._last_progress = now
+        self.progress.emit(self.request_id, self.directory, int(count))
+
+
+class EnvironmentLoadWorker(QObject):
+    loaded = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, request_id: int, file_path: str):
+        super().__init__()
+        self.request_id = int(request_id)
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            self.loaded.emit(self.request_id, load_environment(self.file_path))
+        except Exception as exc:
+            self.failed.emit(self.request_id, str(exc))
+
+
+class CatalogWatchWorker(QObject):
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, state, db_path: str, dir_paths=None, load: bool = False):
+        super().__init__()
+        self.state = state
+        self.db_path = db_path
+        self.dir_paths = list(dir_paths) if dir_paths is not None else None
+        self.load = bool(load)
+
+    def run(self):
+        try:
+            if self.load:
+                self.state.load(get_directory_cache(self.state.root, db_path=self.db_path))
+                changes = FileChanges()
+            elif self.dir_paths is None:
+                changes = self.state.poll()
+            else:
+                changes = self.state.rescan(self.dir_paths)
+            stats = {"new": 0, "updated": 0, "removed": 0}
+            if changes.has_files():
+                upserts = dict(changes.created)
+                upserts.update(changes.modified)
+                stats = index_file_changes(
+                    upserts, list(changes.deleted.values()), db_path=self.db_path, root=self.state.root
+                )
+                touched = changes.touched_paths()
+                invalidate_payload_cache(touched)
+                invalidate_previews(touched, db_path=self.db_path)
+            self.finished.emit(changes, stats)
+        except Exception as exc:
+            self.failed.emit(str(exc))
@@ -0,0 +1,312 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import Imath
+    import OpenEXR
+except ImportError:
+    Imath = None
+    OpenEXR = None
+
+
+_ENV_CACHE_VERSION = "v1"
+_ENV_CACHE_DIR = os.path.join(".cache", "environment_cache")
+# Sources are reduced to this before any filtering; lighting does not need more.
+_WORK_WIDTH = 512
+ENV_ATLAS_WIDTH = 256
+ENV_SPECULAR_LEVELS = 6
+# Must match the RGBM decode in the fragment shader.
+ENV_RGBM_RANGE = 16.0
+_PREFILTER_MIN_WIDTH = 32
+_PREFILTER_CHUNK_ELEMENTS = 1 << 22
+
+# Cosine-lobe convolution factors per SH band (Ramamoorthi & Hanrahan).
+_SH_BAND_FACTORS = np.array([np.pi] + [2.0 * np.pi / 3.0] * 3 + [np.pi / 4.0] * 5, dtype=np.float64)
+_SH_BASIS_CONSTANTS = np.array(
+    [0.282095, 0.488603, 0.488603, 0.488603, 1.092548, 1.092548, 0.315392, 1.092548, 0.546274],
+    dtype=np.float64,
+)
+
+
+class EnvironmentLighting:
+    # Precomputed lighting for one HDRI: irradiance SH baked for the shader polynomial
+    # and an RGBM atlas with one equirect band per specular roughness level.
+    __slots__ = ("path", "key", "sh", "atlas", "levels", "band_height")
+
+    def __init__(self, path: str, key: str, sh, atlas, levels: int):
+        self.path = str(path)
+        self.key = str(key)
+        self.sh = np.asarray(sh, dtype=np.float32).reshape(9, 3)
+        self.atlas = np.ascontiguousarray(atlas, dtype=np.uint8)
+        self.levels = int(levels)
+        self.band_height = int(self.atlas.shape[0]) // max(self.levels, 1)
+
+    def __repr__(self):
+        return f"EnvironmentLighting({os.path.basename(self.path)!r}, levels={self.levels})"
+
+
+def _source_identity(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    norm = os.path.normcase(os.path.normpath(os.path.abspath(str(path))))
+    return f"{norm}|{st.st_size}|{st.st_mtime_ns}|{_ENV_CACHE_VERSION}|{ENV_ATLAS_WIDTH}|{ENV_SPECULAR_LEVELS}"
+
+
+def environment_key(path: str):
+    # Key of the file's current version (path, size, mtime); EnvironmentLighting.key matches it.
+    identity = _source_identity(path)
+    if identity is None:
+        return None
+    return os.path.splitext(os.path.basename(_cache_file(identity)))[0]
+
+
+def _cache_file(identity: str) -> str:
+    key = hashlib.sha1(identity.encode("utf-8", errors="ignore")).hexdigest()
+    return os.path.join(_ENV_CACHE_DIR, f"{key}.npz")
+
+
+def read_radiance_hdr(path: str) -> np.ndarray:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    pos = 0
+    header_ok = False
+    while True:
+        end = data.find(b"\n", pos)
+        if end < 0:
+            raise RuntimeError("Radiance HDR header is truncated.")
+        line = data[pos:end].strip()
+        pos = end + 1
+        if line.startswith(b"#?"):
+            header_ok = True
+        elif line.startswith(b"FORMAT=") and line != b"FORMAT=32-bit_rle_rgbe":
+            raise RuntimeError(f"Unsupported HDR pixel format: {line.decode('ascii', errors='ignore')}")
+        elif not line:
+            break
+    if not header_ok:
+        raise RuntimeError("Not a Radiance HDR file.")
+    end = data.find(b"\n", pos)
+    match = re.match(rb"([-+])Y\s+(\d+)\s+([-+])X\s+(\d+)", data[pos:end].strip())
+    if not match:
+        raise RuntimeError("Unsupported HDR orientation.")
+    flip_y = match.group(1) == b"+"
+    flip_x = match.group(3) == b"-"
+    height, width = int(match.group(2)), int(match.group(4))
+    pos = end + 1
+
+    rgbe = np.empty((height, width, 4), dtype=np.uint8)
+    for row in range(height):
+        if width < 8 or width > 0x7FFF or data[pos : pos + 2] != b"\x02\x02" or data[pos + 2] & 0x80:
+            # Flat (non-RLE) file: the remaining pixels are stored as plain RGBE quads.
+            flat = np.frombuffer(data, dtype=np.uint8, count=(height - row) * width * 4, offset=pos)
+            rgbe[row:] = flat.reshape(height - row, width, 4)
+            break
+        pos += 4
+        for channel in range(4):
+            out = bytearray()
+            while len(out) < width:
+                count = data[pos]
+                pos += 1
+                if count > 128:
+                    out += bytes((data[pos],)) * (count - 128)
+                    pos += 1
+                else:
+                    out += data[pos : pos + count]
+                    pos += count
+            rgbe[row, :, channel] = np.frombuffer(bytes(out[:width]), dtype=np.uint8)
+
+    exponent = rgbe[..., 3].astype(np.int32)
+    rgb = np.ldexp(rgbe[..., :3].astype(np.float32) + 0.5, (exponent - 136)[..., None])
+    rgb[exponent == 0] = 0.0
+    if flip_y:
+        rgb = rgb[::-1]
+    if flip_x:
+        rgb = rgb[:, ::-1]
+    return np.ascontiguousarray(rgb, dtype=np.float32)
+
+
+def read_openexr(path: str) -> np.ndarray:
+    if OpenEXR is None:
+        raise RuntimeError("Reading .exr needs the OpenEXR package.")
+    exr = OpenEXR.InputFile(path)
+    try:
+        window = exr.header()["dataWindow"]
+        width = window.max.x - window.min.x + 1
+        height = window.max.y - window.min.y + 1
+        pixel_type = Imath.PixelType(Imath.PixelType.FLOAT)
+        channels = [np.frombuffer(exr.channel(name, pixel_type), dtype=np.float32) for name in ("R", "G", "B")]
+    finally:
+        exr.close()
+    return np.stack(channels, axis=-1).reshape(height, width, 3)
+
+
+def load_environment_image(path: str) -> np.ndarray:
+    # Linear float32 (H, W, 3), row 0 at the top of the panorama.
+    lower = str(path).lower()
+    if lower.endswith(".hdr"):
+        return read_radiance_hdr(path)
+    if lower.endswith(".exr"):
+        return read_openexr(path)
+    if Image is None:
+        raise RuntimeError("Pillow is required for LDR environment images.")
+    with Image.open(path) as img:
+        arr = np.asarray(img.convert("RGB"), dtype=np.float32) / 255.0
+    return np.power(arr, 2.2)
+
+
+def _resample_axis(arr: np.ndarray, size: int, axis: int) -> np.ndarray:
+    src = arr.shape[axis]
+    if size == src:
+        return arr
+    if size < src:
+        # Box filter: average whole source texels into each target bin.
+        starts = np.floor(np.arange(size) * (src / size)).astype(np.int64)
+        counts = np.diff(np.append(starts, src)).astype(np.float32)
+        sums = np.add.reduceat(arr, starts, axis=axis)
+        shape = [1] * arr.ndim
+        shape[axis] = size
+        return sums / counts.reshape(shape)
+    coords = (np.arange(size) + 0.5) * (src / size) - 0.5
+    lo = np.clip(np.floor(coords).astype(np.int64), 0, src - 1)
+    hi = np.clip(lo + 1, 0, src - 1)
+    frac = np.clip(coords - lo, 0.0, 1.0).astype(np.float32)
+    shape = [1] * arr.ndim
+    shape[axis] = size
+    frac = frac.reshape(shape)
+    return np.take(arr, lo, axis=axis) * (1.0 - frac) + np.take(arr, hi, axis=axis) * frac
+
+
+def resample_equirect(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    out = _resample_axis(np.asarray(image, dtype=np.float32), int(height), 0)
+    return _resample_axis(out, int(width), 1)
+
+
+def equirect_directions(width: int, height: int):
+    # World directions (Y up) and solid angles of texel centres; u=0.5 looks down -Z.
+    theta = (np.arange(height, dtype=np.float64) + 0.5) * (np.pi / height)
+    phi = (np.arange(width, dtype=np.float64) + 0.5) * (2.0 * np.pi / width) - np.pi
+    sin_t = np.sin(theta)[:, None]
+    dirs = np.stack(
+        np.broadcast_arrays(sin_t * np.sin(phi)[None, :], np.cos(theta)[:, None], -sin_t * np.cos(phi)[None, :]),
+        axis=-1,
+    )
+    solid_angle = np.broadcast_to(sin_t * (np.pi / height) * (2.0 * np.pi / width), (height, width))
+    return dirs, solid_angle
+
+
+def _sh_basis(dirs: np.ndarray) -> np.ndarray:
+    x, y, z = dirs[..., 0], dirs[..., 1], dirs[..., 2]
+    terms = (np.ones_like(x), y, z, x, x * y, y * z, 3.0 * z * z - 1.0, x * z, x * x - y * y)
+    return np.stack(terms, axis=-1) * _SH_BASIS_CONSTANTS
+
+
+def compute_irradiance_sh(image: np.ndarray) -> np.ndarray:
+    # Returns coefficients for the shader polynomial [1, y, z, x, xy, yz, 3z^2-1, xz, x^2-y^2]
+    # whose value is irradiance / pi, i.e. Lambert radiance for a white albedo.
+    height, width = image.shape[:2]
+    dirs, solid_angle = equirect_directions(width, height)
+    basis = _sh_basis(dirs).reshape(-1, 9)
+    weighted = np.asarray(image, dtype=np.float64).reshape(-1, 3) * solid_angle.reshape(-1, 1)
+    radiance_sh = basis.T @ weighted
+    return (radiance_sh * (_SH_BAND_FACTORS * _SH_BASIS_CONSTANTS / np.pi)[:, None]).astype(np.float32)
+
+
+def _prefilter_level(image: np.ndarray, roughness: float, width: int) -> np.ndarray:
+    # Brute-force convolution with a Phong lobe matched to GGX (N = V = R assumption).
+    height = max(1, width // 2)
+    src = resample_equirect(image, width, height)
+    src_dirs, src_solid = equirect_directions(width, height)
+    src_dirs = src_dirs.reshape(-1, 3).astype(np.float32)
+    src_solid = src_solid.reshape(-1).astype(np.float32)
+    src_rgb = src.reshape(-1, 3)
+    alpha = max(roughness * roughness, 1e-3)
+    power = np.float32(max(2.0 / (alpha * alpha) - 2.0, 0.0))
+    out = np.empty((src_dirs.shape[0], 3), dtype=np.float32)
+    chunk = max(1, _PREFILTER_CHUNK_ELEMENTS // src_dirs.shape[0])
+    for start in range(0, src_dirs.shape[0], chunk):
+        cos = np.clip(src_dirs[start : start + chunk] @ src_dirs.T, 0.0, 1.0)
+        weights = np.power(cos, power) * src_solid if power > 0.0 else (cos > 0.0) * src_solid
+        norm = np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+        out[start : start + chunk] = (weights @ src_rgb) / norm
+    return out.reshape(height, width, 3)
+
+
+def prefilter_specular(image: np.ndarray, levels: int = ENV_SPECULAR_LEVELS, width: int = ENV_ATLAS_WIDTH):
+    # Level k holds roughness k / (levels - 1); rougher lobes are computed at lower resolution.
+    out = [resample_equirect(image, width, max(1, width // 2))]
+    for level in range(1, int(levels)):
+        level_width = max(_PREFILTER_MIN_WIDTH, width >> level)
+        out.append(_prefilter_level(image, level / float(levels - 1), level_width))
+    return out
+
+
+def encode_rgbm(rgb: np.ndarray) -> np.ndarray:
+    scaled = np.clip(np.asarray(rgb, dtype=np.float32) / ENV_RGBM_RANGE, 0.0, 1.0)
+    m = np.ceil(np.clip(scaled.max(axis=-1, keepdims=True), 1e-6, 1.0) * 255.0) / 255.0
+    out = np.concatenate([scaled / m, m], axis=-1)
+    return np.round(out * 255.0).astype(np.uint8)
+
+
+def build_environment_atlas(levels, width: int = ENV_ATLAS_WIDTH) -> np.ndarray:
+    # Bands are stacked bottom-up in GL row order, each flipped so v=0 (zenith) is its top row.
+    height = max(1, width // 2)
+    bands = [np.flipud(resample_equirect(level, width, height)) for level in levels]
+    return np.ascontiguousarray(encode_rgbm(np.concatenate(bands, axis=0)))
+
+
+def compute_environment(path: str, key: str = "") -> EnvironmentLighting:
+    image = load_environment_image(path)
+    image = np.nan_to_num(np.maximum(image, 0.0), nan=0.0, posinf=0.0)
+    work_width = min(_WORK_WIDTH, int(image.shape[1]))
+    image = resample_equirect(image, work_width, max(1, work_width // 2))
+    sh = compute_irradiance_sh(resample_equirect(image, 128, 64))
+    atlas = build_environment_atlas(prefilter_specular(image))
+    return EnvironmentLighting(path, key or os.path.abspath(path), sh, atlas, ENV_SPECULAR_LEVELS)
+
+
+def load_environment(path: str, force_rebuild: bool = False) -> EnvironmentLighting:
+    identity = _source_identity(path)
+    if identity is None:
+        raise RuntimeError(f"Environment map not found: {path}")
+    cache_path = _cache_file(identity)
+    key = os.path.splitext(os.path.basename(cache_path))[0]
+    if not force_rebuild:
+        try:
+            with np.load(cache_path) as cached:
+                return EnvironmentLighting(path, key, cached["sh"], cached["atlas"], int(cached["levels"]))
+        except (OSError, KeyError, ValueError):
+            pass
+    lighting = compute_environment(path, key=key)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp_path, sh=lighting.sh, atlas=lighting.atlas, levels=np.int32(lighting.levels))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return lighting
+
+
+def clear_environment_cache() -> int:
+    removed = 0
+    cache_dir = os.path.abspath(_ENV_CACHE_DIR)
+    if not os.path.isdir(cache_dir):
+        return removed
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".npz"):
+            continue
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        except OSError:
+            continue
+    return removed
@@ -1,3 +1,5 @@
+from dataclasses import dataclass, field
+
 import numpy as np
 
 
@@ -119,6 +121,7 @@ def process_mesh_data(
     return_meta=False,
     texcoords=None,
     return_texcoords=False,
+    normalize=True,
 ):
     vertices = np.array(vertices, dtype=np.float32)
     indices = np.array(indices, dtype=np.uint32).reshape(-1)
@@ -136,7 +139,12 @@ def process_mesh_data(
             np.array([], dtype=np.float32),
         )
         if return_meta:
-            meta = {"normals_source": "empty", "normals_policy": str(normals_policy)}
+            meta = {
+                "normals_source": "empty",
+                "normals_policy": str(normals_policy),
+                "normalize_center": [0.0, 0.0, 0.0],
+                "normalize_scale": 1.0,
+            }
             if return_texcoords:
                 return result[0], result[1], result[2], np.array([], dtype=np.float32), meta
             return result[0], result[1], result[2], meta
@@ -207,14 +215,25 @@ def process_mesh_data(
             normals = _compute_smooth_normals(vertices, indices)
             normals_source = "recompute_smooth_auto"
 
-    centroid = vertices.mean(axis=0)
-    vertices -= centroid
-    max_extent = np.max(np.linalg.norm(vertices, axis=1))
-    if max_extent > 0:
-        vertices /= max_extent
+    centroid = np.zeros(3, dtype=np.float32)
+    max_extent = 1.0
+    if normalize:
+        centroid = vertices.mean(axis=0)
+        vertices -= centroid
+        max_extent = float(np.max(np.linalg.norm(vertices, axis=1)))
+        if max_extent > 0:
+            vertices /= max_extent
+        else:
+            max_extent = 1.0
 
     if return_meta:
-        meta = {"normals_source": normals_source, "normals_policy": policy}
+        meta = {
+            "normals_source": normals_source,
+            "normals_policy": policy,
+            # Viewer space = (source - normalize_center) / normalize_scale.
+            "normalize_center": [float(v) for v in centroid],
+            "normalize_scale": float(max_extent),
+        }
         if index_remap is not None:
             meta["index_remap"] = index_remap
             meta["index_remap_applied"] = True
@@ -226,3 +245,141 @@ def process_mesh_data(
     if return_texcoords:
         return vertices, indices, normals, (texcoords_arr if texcoords_arr is not None else np.array([], dtype=np.float32))
     return vertices, indices, normals
+
+
+@dataclass
+class MeshStats:
+    # Computed once by the loader in viewer (normalized) space; source_center/source_scale
+    # undo the normalization applied by process_mesh_data.
+    vertex_count: int = 0
+    triangle_count: int = 0
+    instanced_triangle_count: int = 0
+    instance_count: int = 0
+    uv_sets: int = 0
+    bbox_min: tuple = (0.0, 0.0, 0.0)
+    bbox_max: tuple = (0.0, 0.0, 0.0)
+    sphere_center: tuple = (0.0, 0.0, 0.0)
+    sphere_radius: float = 0.0
+    surface_area: float = 0.0
+    source_center: tuple = (0.0, 0.0, 0.0)
+    source_scale: float = 1.0
+    # [{"material_uid", "triangles", "bbox_min", "bbox_max", "centroid", "surface_area"}]
+    submeshes: list = field(default_factory=list)
+
+    @property
+    def total_triangles(self) -> int:
+        return int(self.triangle_count + self.instanced_triangle_count)
+
+    def source_bbox(self):
+        center = np.asarray(self.source_center, dtype=np.float64)
+        scale = float(self.source_scale or 1.0)
+        lo = np.asarray(self.bbox_min, dtype=np.float64) * scale + center
+        hi = np.asarray(self.bbox_max, dtype=np.float64) * scale + center
+        return lo, hi
+
+    def to_catalog_dict(self) -> dict:
+        lo, hi = self.source_bbox()
+        scale = float(self.source_scale or 1.0)
+        return {
+            "min": [round(float(v), 6) for v in lo],
+            "max": [round(float(v), 6) for v in hi],
+            "size": [round(float(v), 6) for v in (hi - lo)],
+            "sphere_radius": round(float(self.sphere_radius) * scale, 6),
+            "surface_area": round(float(self.surface_area) * scale * scale, 6),
+            "vertices": int(self.vertex_count),
+            "triangles": int(self.total_triangles),
+            "instances": int(self.instance_count),
+            "submeshes": len(self.submeshes),
+        }
+
+
+def _triangle_areas(vertices, indices):
+    tris = np.asarray(vertices, dtype=np.float64)[np.asarray(indices, dtype=np.int64).reshape(-1, 3)]
+    if tris.size == 0:
+        return np.zeros(0, dtype=np.float64)
+    return 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+
+
+def _usable_triangle_indices(indices):
+    flat = np.asarray(indices, dtype=np.int64).reshape(-1)
+    return flat[: flat.size - flat.size % 3]
+
+
+def compute_mesh_stats(
+    vertices,
+    indices,
+    texcoords=None,
+    submeshes=None,
+    instance_groups=None,
+    source_center=(0.0, 0.0, 0.0),
+    source_scale=1.0,
+) -> MeshStats:
+    verts = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+    flat = _usable_triangle_indices(indices)
+    stats = MeshStats(
+        vertex_count=int(verts.shape[0]),
+        triangle_count=int(flat.size // 3),
+        source_center=tuple(float(v) for v in source_center),
+        source_scale=float(source_scale or 1.0),
+    )
+    uv = np.asarray(texcoords if texcoords is not None else [], dtype=np.float32)
+    stats.uv_sets = 1 if (uv.ndim == 2 and uv.shape[0] == verts.shape[0] and uv.shape[0] > 0) else 0
+    stats.surface_area = float(_triangle_areas(verts, flat).sum()) if verts.size else 0.0
+
+    for submesh in submeshes or []:
+        sub = _usable_triangle_indices(submesh.get("indices"))
+        entry = {
+            "material_uid": str(submesh.get("material_uid") or ""),
+            "triangles": int(sub.size // 3),
+            "bbox_min": (0.0, 0.0, 0.0),
+            "bbox_max": (0.0, 0.0, 0.0),
+            "centroid": (0.0, 0.0, 0.0),
+            "surface_area": 0.0,
+        }
+        if sub.size and verts.size:
+            points = verts[sub]
+            entry["bbox_min"] = tuple(float(v) for v in points.min(axis=0))
+            entry["bbox_max"] = tuple(float(v) for v in points.max(axis=0))
+            entry["centroid"] = tuple(float(v) for v in points.mean(axis=0))
+            entry["surface_area"] = float(_triangle_areas(verts, sub).sum())
+        stats.submeshes.append(entry)
+
+    # Same point set the viewport frames: baked vertices plus transformed instance AABB corners.
+    parts = [verts] if verts.size else []
+    for group in instance_groups or []:
+        local = np.asarray(group.get("vertices"), dtype=np.float32).reshape(-1, 3)
+        transforms = np.asarray(group.get("transforms"), dtype=np.float32).reshape(-1, 4, 4)
+        if local.size == 0 or transforms.shape[0] == 0:
+            continue
+        group_tris = _usable_triangle_indices(group.get("indices"))
+        stats.instance_count += int(transforms.shape[0])
+        stats.instanced_triangle_count += int(group_tris.size // 3) * int(transforms.shape[0])
+        # Area scales with det^(2/3) for (near) uniform instance scale.
+        dets = np.abs(np.linalg.det(transforms[:, :3, :3].astype(np.float64)))
+        stats.surface_area += float(_triangle_areas(local, group_tris).sum() * np.sum(np.power(dets, 2.0 / 3.0)))
+        lo = local.min(axis=0)
+        hi = local.max(axis=0)
+        corners = np.ones((8, 4), dtype=np.float32)
+        for corner in range(8):
+            corners[corner, :3] = [hi[a] if (corner >> a) & 1 else lo[a] for a in range(3)]
+        world = np.einsum("kij,cj->kci", transforms, corners)
+        parts.append(world[..., :3].reshape(-1, 3))
+    if parts:
+        points = np.concatenate(parts, axis=0)
+        mins = points.min(axis=0)
+        maxs = points.max(axis=0)
+        center = (mins + maxs) * 0.5
+        stats.bbox_min = tuple(float(v) for v in mins)
+        stats.bbox_max = tuple(float(v) for v in maxs)
+        stats.sphere_center = tuple(float(v) for v in center)
+        stats.sphere_radius = float(np.max(np.linalg.norm(points - center, axis=1)))
+    return stats
+
+
+def normalization_matrix(center, scale) -> np.ndarray:
+    # Maps source space into viewer space the way process_mesh_data does for vertices.
+    scale = float(scale or 1.0)
+    out = np.identity(4, dtype=np.float64)
+    out[:3, :3] /= scale
+    out[:3, 3] = -np.asarray(center, dtype=np.float64).reshape(3) / scale
+    return out
@@ -0,0 +1,231 @@
+import numpy as np
+
+
+_LEAF_SIZE = 16
+_CORNER_MASK = np.array([[(corner >> axis) & 1 for axis in range(3)] for corner in range(8)], dtype=bool)
+
+
+class RayHit:
+    __slots__ = ("distance", "triangle", "point", "submesh", "instance_group", "instance")
+
+    def __init__(self, distance: float, triangle: int, point, submesh: int = -1, instance_group: int = -1, instance: int = -1):
+        self.distance = float(distance)
+        self.triangle = int(triangle)
+        self.point = np.asarray(point, dtype=np.float64)
+        self.submesh = int(submesh)
+        self.instance_group = int(instance_group)
+        self.instance = int(instance)
+
+    def __repr__(self):
+        return (
+            f"RayHit(distance={self.distance:.6g}, triangle={self.triangle}, submesh={self.submesh}, "
+            f"instance_group={self.instance_group}, instance={self.instance})"
+        )
+
+
+class MeshBVH:
+    # Median-split bounding volume hierarchy over triangles, built with numpy.
+    # Nodes are flat arrays; leaves reference a contiguous range of `order`.
+    def __init__(self, vertices, indices, triangle_submesh=None, leaf_size: int = _LEAF_SIZE):
+        verts = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        tris = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        self.triangles = verts[tris] if tris.size else np.zeros((0, 3, 3), dtype=np.float64)
+        if triangle_submesh is None:
+            self.triangle_submesh = np.full(self.triangles.shape[0], -1, dtype=np.int32)
+        else:
+            self.triangle_submesh = np.asarray(triangle_submesh, dtype=np.int32).reshape(-1)
+        self.leaf_size = max(1, int(leaf_size))
+        self._build()
+
+    @classmethod
+    def from_submeshes(cls, vertices, submeshes, fallback_indices=None):
+        parts = []
+        owners = []
+        for idx, submesh in enumerate(submeshes or []):
+            sub_indices = np.asarray(submesh.get("indices"), dtype=np.int64).reshape(-1)
+            sub_indices = sub_indices[: sub_indices.size - sub_indices.size % 3]
+            if sub_indices.size == 0:
+                continue
+            parts.append(sub_indices)
+            owners.append(np.full(sub_indices.size // 3, idx, dtype=np.int32))
+        if not parts:
+            indices = np.asarray(fallback_indices if fallback_indices is not None else [], dtype=np.int64).reshape(-1)
+            indices = indices[: indices.size - indices.size % 3]
+            return cls(vertices, indices)
+        return cls(vertices, np.concatenate(parts), np.concatenate(owners))
+
+    def __len__(self):
+        return int(self.triangles.shape[0])
+
+    def _build(self):
+        count = int(self.triangles.shape[0])
+        self.order = np.arange(count, dtype=np.int64)
+        node_min = []
+        node_max = []
+        # Interior nodes: (left, right, -1, 0); leaves: (-1, -1, start, count).
+        node_links = []
+        if count == 0:
+            self.node_min = np.zeros((0, 3))
+            self.node_max = np.zeros((0, 3))
+            self.node_links = np.zeros((0, 4), dtype=np.int64)
+            return
+        tri_min = self.triangles.min(axis=1)
+        tri_max = self.triangles.max(axis=1)
+        centroids = self.triangles.mean(axis=1)
+
+        node_min.append(None)
+        node_max.append(None)
+        node_links.append(None)
+        stack = [(0, 0, count)]
+        while stack:
+            node, start, end = stack.pop()
+            ids = self.order[start:end]
+            node_min[node] = tri_min[ids].min(axis=0)
+            node_max[node] = tri_max[ids].max(axis=0)
+            n = end - start
+            if n <= self.leaf_size:
+                node_links[node] = (-1, -1, start, n)
+                continue
+            extent = centroids[ids].max(axis=0) - centroids[ids].min(axis=0)
+            axis = int(np.argmax(extent))
+            if extent[axis] <= 0.0:
+                node_links[node] = (-1, -1, start, n)
+                continue
+            half = n // 2
+            split = np.argpartition(centroids[ids, axis], half)
+            self.order[start:end] = ids[split]
+            left = len(node_links)
+            right = left + 1
+            for _ in range(2):
+                node_min.append(None)
+                node_max.append(None)
+                node_links.append(None)
+            node_links[node] = (left, right, -1, 0)
+            stack.append((right, start + half, end))
+            stack.append((left, start, start + half))
+        self.node_min = np.asarray(node_min, dtype=np.float64)
+        self.node_max = np.asarray(node_max, dtype=np.float64)
+        self.node_links = np.asarray(node_links, dtype=np.int64)
+
+    def raycast(self, origin, direction, max_distance: float = np.inf):
+        if self.node_links.shape[0] == 0:
+            return None
+        origin = np.asarray(origin, dtype=np.float64).reshape(3)
+        direction = np.asarray(direction, dtype=np.float64).reshape(3)
+        length = float(np.linalg.norm(direction))
+        if length <= 1e-12:
+            return None
+        direction = direction / length
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_dir = np.where(np.abs(direction) > 1e-12, 1.0 / direction, np.inf)
+
+        best_t = float(max_distance)
+        best_tri = -1
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            t_near = self._slab(node, origin, inv_dir)
+            if t_near is None or t_near > best_t:
+                continue
+            left, right, start, count = (int(v) for v in self.node_links[node])
+            if left < 0:
+                tri_ids = self.order[start : start + count]
+                t_values = _intersect_triangles(self.triangles[tri_ids], origin, direction)
+                hit = int(np.argmin(t_values))
+                if t_values[hit] < best_t:
+                    best_t = float(t_values[hit])
+                    best_tri = int(tri_ids[hit])
+                continue
+            # Visit the nearer child first so far subtrees are pruned by best_t.
+            t_left = self._slab(left, origin, inv_dir)
+            t_right = self._slab(right, origin, inv_dir)
+            if t_left is not None and t_right is not None and t_right < t_left:
+                stack.extend((left, right))
+            else:
+                stack.extend((right, left))
+        if best_tri < 0:
+            return None
+        return RayHit(best_t, best_tri, origin + direction * best_t, int(self.triangle_submesh[best_tri]))
+
+    def _slab(self, node: int, origin, inv_dir):
+        with np.errstate(invalid="ignore"):
+            t1 = (self.node_min[node] - origin) * inv_dir
+            t2 = (self.node_max[node] - origin) * inv_dir
+        t1 = np.nan_to_num(t1, nan=-np.inf)
+        t2 = np.nan_to_num(t2, nan=np.inf)
+        t_near = float(np.max(np.minimum(t1, t2)))
+        t_far = float(np.min(np.maximum(t1, t2)))
+        if t_far < max(t_near, 0.0):
+            return None
+        return max(t_near, 0.0)
+
+
+def raycast_instances(bvh, transforms, origin, direction, max_distance: float = np.inf):
+    # One local-space BVH placed K times: a batched slab test on the transformed root box picks
+    # candidate instances, nearest first; the ray is then moved into each candidate's local space.
+    # Distance and point of the returned hit are in the space of origin/direction.
+    if bvh is None or len(bvh) == 0:
+        return None
+    transforms = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+    if transforms.shape[0] == 0:
+        return None
+    origin = np.asarray(origin, dtype=np.float64).reshape(3)
+    direction = np.asarray(direction, dtype=np.float64).reshape(3)
+    length = float(np.linalg.norm(direction))
+    if length <= 1e-12:
+        return None
+    direction = direction / length
+    corners = np.ones((8, 4), dtype=np.float64)
+    corners[:, :3] = np.where(_CORNER_MASK, bvh.node_max[0], bvh.node_min[0])
+    world = np.einsum("kij,cj->kci", transforms, corners)[..., :3]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_dir = np.where(np.abs(direction) > 1e-12, 1.0 / direction, np.inf)
+        t1 = (world.min(axis=1) - origin) * inv_dir
+        t2 = (world.max(axis=1) - origin) * inv_dir
+    t1 = np.nan_to_num(t1, nan=-np.inf)
+    t2 = np.nan_to_num(t2, nan=np.inf)
+    t_near = np.maximum(np.max(np.minimum(t1, t2), axis=1), 0.0)
+    t_far = np.min(np.maximum(t1, t2), axis=1)
+    candidates = np.nonzero(t_far >= t_near)[0]
+
+    best = None
+    best_t = float(max_distance)
+    for instance in candidates[np.argsort(t_near[candidates], kind="stable")].tolist():
+        if t_near[instance] > best_t:
+            break
+        transform = transforms[instance]
+        try:
+            inv = np.linalg.inv(transform)
+        except np.linalg.LinAlgError:
+            continue
+        hit = bvh.raycast(inv[:3, :3] @ origin + inv[:3, 3], inv[:3, :3] @ direction)
+        if hit is None:
+            continue
+        point = transform[:3, :3] @ hit.point + transform[:3, 3]
+        t = float(np.dot(point - origin, direction))
+        if t < best_t:
+            best_t = t
+            best = RayHit(t, hit.triangle, point, instance=instance)
+    return best
+
+
+def _intersect_triangles(triangles, origin, direction):
+    # Vectorized Moller-Trumbore; misses come back as +inf.
+    v0 = triangles[:, 0]
+    edge1 = triangles[:, 1] - v0
+    edge2 = triangles[:, 2] - v0
+    pvec = np.cross(direction, edge2)
+    det = np.einsum("ij,ij->i", edge1, pvec)
+    valid = np.abs(det) > 1e-12
+    inv_det = np.where(valid, 1.0 / np.where(valid, det, 1.0), 0.0)
+    tvec = origin - v0
+    u = np.einsum("ij,ij->i", tvec, pvec) * inv_det
+    qvec = np.cross(tvec, edge1)
+    v = (qvec @ direction) * inv_det
+    t = np.einsum("ij,ij->i", edge2, qvec) * inv_det
+    hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t > 1e-9)
+    return np.where(hit, t, np.inf)
+
+
+def measure_distance(point_a, point_b) -> float:
+    return float(np.linalg.norm(np.asarray(point_b, dtype=np.float64) - np.asarray(point_a, dtype=np.float64)))
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+_TEXTURE_CACHE_VERSION = "v1"
+_TEXTURE_CACHE_DIR = os.path.join(".cache", "texture_cache")
+_HEADER_STRUCT = struct.Struct("<I")
+_ZSTD_LEVEL = 3
+# Disk budget for decoded textures; least recently used files go first when it is exceeded.
+DEFAULT_TEXTURE_CACHE_BUDGET_BYTES = 2 * 1024 * 1024 * 1024
+_PRUNE_EVERY_SAVES = 32
+_budget_bytes = DEFAULT_TEXTURE_CACHE_BUDGET_BYTES
+_saves_since_prune = 0
+
+
+def _source_identity(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    norm = os.path.normcase(os.path.normpath(os.path.abspath(str(path))))
+    return f"{norm}|{st.st_size}|{st.st_mtime_ns}|{_TEXTURE_CACHE_VERSION}"
+
+
+def _cache_file(identity: str, suffix: str) -> str:
+    key = hashlib.sha1(identity.encode("utf-8", errors="ignore")).hexdigest()
+    return os.path.join(_TEXTURE_CACHE_DIR, key[:2], f"{key}{suffix}")
+
+
+def _write_atomic(path: str, data: bytes):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+
+
+def image_has_alpha_channel(image) -> bool:
+    if Image is None or image is None:
+        return False
+    try:
+        mode = str(getattr(image, "mode", "") or "").upper()
+        return ("A" in mode) or ("transparency" in (getattr(image, "info", {}) or {}))
+    except Exception:
+        return False
+
+
+def image_has_effective_alpha(image) -> bool:
+    if Image is None or image is None:
+        return False
+    try:
+        if image.mode in ("RGBA", "LA"):
+            alpha = image.getchannel("A")
+        elif "transparency" in image.info:
+            alpha = image.convert("RGBA").getchannel("A")
+        else:
+            return False
+        extrema = alpha.getextrema()
+        if isinstance(extrema, tuple) and len(extrema) == 2:
+            return int(extrema[0]) < 255
+        return True
+    except Exception:
+        return False
+
+
+def prepare_texture_image(image, max_dim: int = 0):
+    # GL-ready uint8 RGB/RGBA array: optionally downsized, converted and flipped bottom-up.
+    if max_dim and max(image.size) > max_dim:
+        image = image.copy()
+        image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    arr = np.array(image, dtype=np.uint8)
+    if arr.ndim != 3 or arr.shape[2] not in (3, 4):
+        raise RuntimeError("Texture must be RGB/RGBA.")
+    return np.ascontiguousarray(np.flipud(arr))
+
+
+def load_decoded_texture(path: str, max_dim: int = 0):
+    identity = _source_identity(path)
+    if identity is None:
+        return None, None
+    cache_path = _cache_file(f"{identity}|{int(max_dim)}", ".tex")
+    try:
+        with open(cache_path, "rb") as fh:
+            raw = fh.read()
+        (header_len,) = _HEADER_STRUCT.unpack_from(raw, 0)
+        offset = _HEADER_STRUCT.size
+        header = json.loads(raw[offset : offset + header_len].decode("utf-8"))
+        body = raw[offset + header_len :]
+        if header.get("codec") == "zstd":
+            if zstandard is None:
+                return None, None
+            body = zstandard.ZstdDecompressor().decompress(body)
+        shape = tuple(int(v) for v in header.get("shape") or ())
+        arr = np.frombuffer(body, dtype=np.uint8).reshape(shape)
+        _touch(cache_path)
+        return arr, dict(header.get("flags") or {})
+    except Exception:
+        return None, None
+
+
+def save_decoded_texture(path: str, arr: np.ndarray, flags: dict, max_dim: int = 0):
+    identity = _source_identity(path)
+    if identity is None or arr is None:
+        return
+    body = np.ascontiguousarray(arr, dtype=np.uint8).tobytes()
+    codec = "raw"
+    if zstandard is not None:
+        body = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(body)
+        codec = "zstd"
+    header = json.dumps(
+        {"shape": [int(v) for v in arr.shape], "codec": codec, "flags": dict(flags or {})},
+        ensure_ascii=True,
+    ).encode("utf-8")
+    _write_atomic(_cache_file(f"{identity}|{int(max_dim)}", ".tex"), _HEADER_STRUCT.pack(len(header)) + header + body)
+    _save_alpha_flags(identity, flags)
+    global _saves_since_prune
+    _saves_since_prune += 1
+    if _saves_since_prune >= _PRUNE_EVERY_SAVES:
+        _saves_since_prune = 0
+        prune_texture_cache()
+
+
+def decode_texture(path: str, max_dim: int = 0):
+    arr, flags = load_decoded_texture(path, max_dim=max_dim)
+    if arr is not None:
+        return arr, flags
+    if Image is None or not os.path.isfile(path):
+        return None, None
+    with Image.open(path) as img:
+        image_copy = img.copy()
+    flags = {
+        "has_effective_alpha": bool(image_has_effective_alpha(image_copy)),
+        "has_alpha_channel": bool(image_has_alpha_channel(image_copy)),
+    }
+    arr = prepare_texture_image(image_copy, max_dim=max_dim)
+    save_decoded_texture(path, arr, flags, max_dim=max_dim)
+    return arr, flags
+
+
+def get_texture_alpha_flags(path: str):
+    identity = _source_identity(path)
+    if identity is None:
+        return {}
+    flags_path = _cache_file(identity, ".json")
+    try:
+        with open(flags_path, "r", encoding="utf-8") as fh:
+            flags = json.load(fh)
+        if isinstance(flags, dict):
+            return flags
+    except (OSError, ValueError):
+        pass
+    if Image is None:
+        return {}
+    # Header-only probe: the alpha channel check does not need pixel data.
+    try:
+        with Image.open(path) as img:
+            flags = {"has_alpha_channel": bool(image_has_alpha_channel(img))}
+    except Exception:
+        flags = {"has_alpha_channel": False}
+    _save_alpha_flags(identity, flags)
+    return flags
+
+
+def _save_alpha_flags(identity: str, flags: dict):
+    data = json.dumps(dict(flags or {}), ensure_ascii=True).encode("utf-8")
+    _write_atomic(_cache_file(identity, ".json"), data)
+
+
+def _touch(path: str):
+    # The file mtime is the LRU key for prune_texture_cache.
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def set_texture_cache_budget_bytes(budget_bytes: int):
+    global _budget_bytes
+    _budget_bytes = int(max(0, budget_bytes))
+
+
+def prune_texture_cache(max_bytes: int = None) -> int:
+    # Removes the least recently used .tex files until the cache fits max_bytes
+    # (the module budget by default). Alpha flag files are tiny and kept.
+    limit = _budget_bytes if max_bytes is None else int(max(0, max_bytes))
+    cache_dir = os.path.abspath(_TEXTURE_CACHE_DIR)
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    total = 0
+    for root, _dirs, files in os.walk(cache_dir):
+        for name in files:
+            if not name.endswith(".tex"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+    if total <= limit:
+        return 0
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_texture_cache() -> int:
+    removed = 0
+    cache_dir = os.path.abspath(_TEXTURE_CACHE_DIR)
+    if not os.path.isdir(cache_dir):
+        return removed
+    for root, _dirs, files in os.walk(cache_dir):
+        for name in files:
+            if not name.endswith((".tex", ".json")):
+                continue
+            try:
+                os.remove(os.path.join(root, name))
+                removed += 1
+            except OSError:
+                continue
+    return removed